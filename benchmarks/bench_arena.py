@@ -0,0 +1,89 @@
+"""
+Benchmark: arena-backed syntax trees against trees of Node objects.
+
+Parses the generated program of bench_parser.py into a tree of Nodes
+(Parser(tokens, nary=True)) and into a NodeArena, and reports:
+
+    bytes/node   memory traced by tracemalloc while the tree is built,
+                 over the number of nodes
+    walk (s)     a preorder walk of the whole tree reading every value:
+                 Node objects, NodeArena.preorder, and ArenaCursor
+
+Usage:
+    python benchmarks/bench_arena.py
+"""
+
+import gc
+import time
+import tracemalloc
+
+from common import ROOT  # noqa: F401  (puts the repository on sys.path)
+from bench_parser import generated_program
+from src.lexer import Lexer
+from src.parser import Parser
+from src.standerizer.arena import NodeArena
+
+ITEMS = 20_000
+
+
+def walk_nodes(root):
+    count = 0
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        node.value
+        count += 1
+        stack.extend(reversed(node.children))
+    return count
+
+
+def walk_arena(cursor):
+    arena = cursor.arena
+    value = arena.value
+    count = 0
+    for node, _ in arena.preorder(cursor.index):
+        value(node)
+        count += 1
+    return count
+
+
+def walk_cursors(cursor):
+    # the same walk as walk_nodes, through the Node interface of the cursors
+    return walk_nodes(cursor)
+
+
+def traced(build):
+    """Return the tree built by build and the bytes allocated while building it."""
+    gc.collect()
+    tracemalloc.start()
+    tree = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return tree, size
+
+
+def timed(walk, tree, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        walk(tree)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    tokens = Lexer(generated_program(ITEMS)).tokenize()
+    root, node_bytes = traced(lambda: Parser(tokens, nary=True).parse())
+    cursor, arena_bytes = traced(lambda: Parser(tokens, arena=NodeArena()).parse())
+    nodes = walk_nodes(root)
+    assert walk_arena(cursor) == nodes
+
+    print(f"nodes: {nodes}")
+    print(f"{'tree':<14} {'bytes/node':>10} {'walk (s)':>9}")
+    print(f"{'Node objects':<14} {node_bytes / nodes:>10.1f} {timed(walk_nodes, root):>9.3f}")
+    print(f"{'NodeArena':<14} {arena_bytes / nodes:>10.1f} {timed(walk_arena, cursor):>9.3f}")
+    print(f"{'ArenaCursor':<14} {'':>10} {timed(walk_cursors, cursor):>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Benchmark: building the tree the standardizer works on.
+
+Parses the generated program of bench_parser.py into the n-ary Nodes of
+the standardizer, and reports the time and the peak memory traced by
+tracemalloc, for:
+
+    via LCRS   the parser builds LCRS ASTNodes, copied by lcrs_to_nary
+    direct     the parser builds the Nodes itself (Parser(tokens, nary=True))
+
+Both give the same tree; building it directly skips a copy of every
+node and a walk of the whole tree.
+
+Usage:
+    python benchmarks/bench_ast.py
+"""
+
+import gc
+import sys
+import time
+import tracemalloc
+
+from bench_parser import generated_program
+from src.lexer import Lexer
+from src.parser import Parser
+from src.lcrs_to_nary_convertor import lcrs_to_nary
+
+ITEMS = 20_000
+
+MODES = [
+    ("via LCRS", lambda tokens: lcrs_to_nary(Parser(tokens).parse())),
+    ("direct", lambda tokens: Parser(tokens, nary=True).parse()),
+]
+
+
+def timed(build, tokens, repeat=3):
+    """
+    Return the best time of building the tree.
+
+    The garbage of a run is collected before the next one instead of being scanned by
+    the collections of it.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        build(tokens)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    # lcrs_to_nary recurses once per level of the tree
+    sys.setrecursionlimit(10_000)
+    tokens = Lexer(generated_program(ITEMS)).tokenize()
+    print(f"tokens: {len(tokens)}")
+    print(f"{'mode':<10} {'time (s)':>9} {'peak (MB)':>10}")
+    for name, build in MODES:
+        seconds = timed(build, tokens)
+        gc.collect()
+        tracemalloc.start()
+        build(tokens)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{name:<10} {seconds:>9.3f} {peak / (1024 * 1024):>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
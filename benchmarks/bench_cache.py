@@ -0,0 +1,67 @@
+"""
+Benchmark: startup with the compiled program cache.
+
+Times how long a program takes to get from its source to the first CSE
+machine step, compiled from scratch (lexer, parser, standardizer,
+linearizer and resolver) and loaded from a warm .rpalc cache, and the
+same for a whole run of myrpal.py, with --no-cache and with a warm cache.
+
+Usage:
+    python benchmarks/bench_cache.py
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from common import ROOT, best_of, read_program, standardize
+from src.cse_machine.machine import CSEMachine
+from src.cse_machine.utils.program_cache import ProgramCache
+
+
+def many_definitions(count):
+    # one definition after another, each using the one before
+    lines = ["let f0 x = x + 1"]
+    lines += [f"in let f{i} x = f{i - 1} (x * 2 - x) + {i}" for i in range(1, count)]
+    lines.append(f"in Print (f{count - 1} 0)")
+    return "\n".join(lines)
+
+
+PROGRAMS = [
+    ("fibonacci (3-t1.rpal)", read_program("3-t1.rpal")),
+    ("trees.rpal", read_program("trees.rpal")),
+    ("200 definitions", many_definitions(200)),
+]
+
+
+def run_myrpal(path, *options):
+    start = time.perf_counter()
+    subprocess.run([sys.executable, os.path.join(ROOT, "myrpal.py"), path, *options],
+                   check=True, stdout=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ["RPAL_CACHE_DIR"] = directory
+        cache = ProgramCache(directory)
+        print(f"{'program':<24} {'compile (ms)':>13} {'cached (ms)':>12} {'myrpal --no-cache (ms)':>23} {'myrpal cached (ms)':>19}")
+        for name, source_code in PROGRAMS:
+            compile_time = best_of(lambda: CSEMachine().compile(standardize(source_code)))
+            cache.store(source_code, CSEMachine().compile(standardize(source_code)))
+            load_time = best_of(lambda: cache.load(source_code))
+
+            path = os.path.join(directory, "program.rpal")
+            with open(path, "w") as file:
+                file.write(source_code)
+            cold = min(run_myrpal(path, "--no-cache") for _ in range(5))
+            run_myrpal(path)
+            warm = min(run_myrpal(path) for _ in range(5))
+
+            print(f"{name:<24} {compile_time * 1000:>13.2f} {load_time * 1000:>12.2f} {cold * 1000:>23.1f} {warm * 1000:>19.1f}")
+
+
+if __name__ == "__main__":
+    main()
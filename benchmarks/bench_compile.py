@@ -0,0 +1,79 @@
+"""
+Benchmark: compiling a program to control structures.
+
+Times the front end from the parser's tree to resolved control
+structures, for:
+
+    standardize + linearize   AST.standardize rewrites the tree, then the
+                              Linearizer walks the standardized tree
+    fused                     the Compiler of CSEMachine.compile, which
+                              standardizes each node as it compiles it
+
+Both give the same control structures. The tree is parsed again for
+each run, outside the timed region, since standardizing rewrites it.
+
+Usage:
+    python benchmarks/bench_compile.py
+"""
+
+import gc
+import time
+
+from common import read_program
+from bench_cache import many_definitions
+from bench_standardize import functions_program
+from src.lexer import Lexer
+from src.parser import Parser
+from src.standerizer.ast import AST
+from src.cse_machine.utils.STlinearizer import Linearizer
+from src.cse_machine.utils.compiler import Compiler
+from src.cse_machine.utils.resolver import Resolver
+from src.cse_machine.utils.program_cache import dumps
+
+PROGRAMS = [
+    ("trees.rpal", read_program("trees.rpal")),
+    ("200 definitions", many_definitions(200)),
+    ("functions 5000", functions_program(5_000).replace("where h = q", "where h = x")),
+]
+
+
+def standardize_and_linearize(root):
+    ast_obj = AST(root)
+    ast_obj.standardize()
+    control_structures = Linearizer().linearize(ast_obj.root)
+    Resolver().resolve(control_structures)
+    return control_structures
+
+
+def fused(root):
+    control_structures = Compiler().compile(root)
+    Resolver().resolve(control_structures)
+    return control_structures
+
+
+MODES = [("standardize + linearize", standardize_and_linearize), ("fused", fused)]
+
+
+def timed(compile, source_code, repeat=5):
+    """Return the best time of compiling a fresh tree of the source."""
+    tokens = Lexer(source_code).tokenize()
+    best = float("inf")
+    for _ in range(repeat):
+        root = Parser(tokens, nary=True).parse()
+        gc.collect()
+        start = time.perf_counter()
+        compile(root)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    print(f"{'program':<18}" + "".join(f" {name + ' (ms)':>28}" for name, _ in MODES))
+    for name, source_code in PROGRAMS:
+        tokens = Lexer(source_code).tokenize()
+        assert len({dumps(compile(Parser(tokens, nary=True).parse())) for _, compile in MODES}) == 1
+        print(f"{name:<18}" + "".join(f" {timed(compile, source_code) * 1000:>28.2f}" for _, compile in MODES))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""
+Benchmark: CSE machine steps per second.
+
+Runs deep-recursion and arithmetic-heavy programs from test-programs/ and reports
+how many CSE rules the machine applies per second. The step count of each
+program is taken from one traced run; the timing runs are untraced.
+
+Usage:
+    python benchmarks/bench_dispatch.py
+"""
+
+from common import best_of, read_program, standardize
+from src.cse_machine.machine import CSEMachine
+
+PROGRAMS = [
+    "3-t1.rpal",       # naive recursive fibonacci
+    "6-t1.rpal",       # integer arithmetic in a tail-recursive loop
+    "Innerprod.rpal",  # tuple indexing and arithmetic
+    "towers.rpal",     # string building recursion
+]
+
+
+def run(st_tree, **options):
+    cse_machine = CSEMachine(**options)
+    cse_machine.execute(st_tree)
+    return cse_machine
+
+
+def main():
+    print(f"{'program':<16} {'steps':>8} {'time (s)':>10} {'steps/s':>12}")
+    for name in PROGRAMS:
+        st_tree = standardize(read_program(name))
+        steps = len(run(st_tree, trace=True).table_data)
+        seconds = best_of(lambda: run(st_tree), repeat=20)
+        print(f"{name:<16} {steps:>8} {seconds:>10.4f} {steps / seconds:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
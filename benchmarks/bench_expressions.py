@@ -0,0 +1,49 @@
+"""
+Benchmark: parsing expression-heavy programs.
+
+Parses generated programs made almost entirely of operator expressions
+with the layered recursive parser the repository started from
+(Archive/src/parser.py), one call per grammar layer from B down to Rn,
+and with the parser of src/, which parses those layers in one loop by
+operator precedence, and reports the time of each, for:
+
+    arithmetic   sums and products of identifiers and integers
+    boolean      comparisons joined by or, & and not
+    application  function applications and @ infix calls
+    atoms        a tuple of bare identifiers
+
+Usage:
+    python benchmarks/bench_expressions.py
+"""
+
+from common import best_of
+from bench_nesting import load_recursive_parser
+from src.lexer import Lexer
+from src.parser import Parser
+
+ITEMS = 5_000
+
+
+def program(item):
+    return "Print (" + ",\n".join(item(i) for i in range(ITEMS)) + ")"
+
+
+SOURCES = [
+    ("arithmetic", program(lambda i: f"x{i} * 2 + y{i} / {i} - z ** 2")),
+    ("boolean", program(lambda i: f"not x{i} gr {i} & y{i} le z or x{i} eq {i}")),
+    ("application", program(lambda i: f"f x{i} (g {i}) @h y{i} z")),
+    ("atoms", program(lambda i: f"x{i}")),
+]
+
+
+def main():
+    parsers = [("layered", load_recursive_parser()), ("precedence", Parser)]
+    print(f"{'source':<12} {'tokens':>8}" + "".join(f" {name + ' (s)':>16}" for name, _ in parsers))
+    for name, source_code in SOURCES:
+        tokens = list(Lexer(source_code).iter_tokens())
+        times = [best_of(lambda: parser(tokens).parse(), repeat=5) for _, parser in parsers]
+        print(f"{name:<12} {len(tokens):>8}" + "".join(f" {seconds:>16.3f}" for seconds in times))
+
+
+if __name__ == "__main__":
+    main()
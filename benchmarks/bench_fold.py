@@ -0,0 +1,88 @@
+"""
+Benchmark: constant folding.
+
+Compiles programs that work out constant expressions in hot recursive
+bodies at -O0 and at -O1, where the ConstantFolder replaces them by their
+values before the program is compiled, and reports the number of folds,
+the time of compiling (parser's tree to resolved control structures) and
+the best time of running the compiled program at each level.
+
+Both levels compile the AST with the fused Compiler; -O1 folds it first,
+so the compile times differ by one pass of the folder. Both levels print
+the same output.
+
+Usage:
+    python benchmarks/bench_fold.py
+"""
+
+import gc
+import time
+
+from common import best_of, read_program
+from bench_cache import many_definitions
+from src.lexer import Lexer
+from src.parser import Parser
+from src.cse_machine.machine import CSEMachine
+from src.cse_machine.utils.folder import ConstantFolder
+
+PROGRAMS = [
+    ("trees.rpal", read_program("trees.rpal")),
+    ("200 definitions", many_definitions(200)),
+    ("5000 definitions", many_definitions(5_000)),
+    ("arithmetic loop, 20000", """
+let rec loop n acc = n eq 0 -> acc | loop (n - 1) (acc + (60 * 60 * 24) / (2 ** 3) - 3 * 3600)
+in Print (loop 20000 0)
+"""),
+    ("string loop, 5000", """
+let rec loop n = n eq 0 -> 0 | (Order nil + Order nil) + (Conc 'ab' (ItoS (2 ** 10)) eq 'ab1024' -> loop (n - 1) | 0)
+in Print (loop 5000)
+"""),
+    ("constant branches, 20000", """
+let rec loop n = n eq 0 -> 'done' | (1 gr 2 -> 'never' | not (3 ls 2) -> loop (n - 1) | 'never')
+in Print (loop 20000)
+"""),
+]
+
+
+def compiled(source_code, optimize):
+    """Return the control structures of a program, and the best time of compiling it, at a level."""
+    tokens = Lexer(source_code).tokenize()
+    best = float("inf")
+    for _ in range(5):
+        root = Parser(tokens, nary=True).parse()
+        gc.collect()
+        start = time.perf_counter()
+        control_structures = CSEMachine(optimize=optimize).compile(root)
+        best = min(best, time.perf_counter() - start)
+    return control_structures, best
+
+
+def run(control_structures):
+    cse_machine = CSEMachine()
+    cse_machine.run(control_structures)
+    return cse_machine._generate_output()
+
+
+def folds(source_code):
+    """Return the number of nodes the folder replaces in the AST of a program."""
+    root = Parser(Lexer(source_code).tokenize(), nary=True).parse()
+    folder = ConstantFolder()
+    folder.fold(root)
+    return folder.folds
+
+
+def main():
+    print(f"{'program':<26} {'folds':>6} {'-O0 compile (ms)':>17} {'-O1 compile (ms)':>17} {'-O0 run (s)':>12} {'-O1 run (s)':>12}")
+    for name, source_code in PROGRAMS:
+        control_structures = {}
+        compile_times = {}
+        for level in (0, 1):
+            control_structures[level], compile_times[level] = compiled(source_code, level)
+        assert run(control_structures[0]) == run(control_structures[1])
+        run_times = {level: best_of(lambda: run(control_structures[level])) for level in (0, 1)}
+        print(f"{name:<26} {folds(source_code):>6} {compile_times[0] * 1000:>17.2f} {compile_times[1] * 1000:>17.2f}"
+              f" {run_times[0]:>12.4f} {run_times[1]:>12.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""
+Benchmark: cost of entering a function body.
+
+Calls a function whose body is a sum of a growing number of terms from a
+counting loop, and reports the time per call and per body term. Entering a
+body pushes one frame on the control rather than copying its elements, so the
+time per term stays flat as the body grows.
+
+Usage:
+    python benchmarks/bench_frames.py
+"""
+
+from common import best_of, standardize
+from src.cse_machine.machine import CSEMachine
+
+CALLS = 500
+BODY_SIZES = [1, 10, 100, 300]
+
+
+def program(terms):
+    body = " + ".join(["x"] * terms)
+    return (
+        f"let f x = {body} in "
+        f"let rec loop n = n eq 0 -> 0 | f 1 + loop (n - 1) in "
+        f"Print (loop {CALLS})"
+    )
+
+
+def run(st_tree):
+    CSEMachine().execute(st_tree)
+
+
+def main():
+    print(f"{'body terms':>10} {'time (s)':>10} {'us/call':>9} {'ns/term':>9}")
+    for terms in BODY_SIZES:
+        st_tree = standardize(program(terms))
+        seconds = best_of(lambda: run(st_tree), repeat=5)
+        per_call = seconds / CALLS
+        print(f"{terms:>10} {seconds:>10.4f} {per_call * 1e6:>9.1f} {per_call / terms * 1e9:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Benchmark: lexer throughput.
+
+Tokenizes multi-megabyte generated sources and reports the throughput in
+megabytes of source per second, for:
+
+    programs    the test programs repeated, short lines
+    long line   generated definitions all on one line
+
+The column of a token is counted from the offset of the last newline,
+kept as the scan goes, so the long line runs as fast as short ones.
+
+Usage:
+    python benchmarks/bench_lexer.py
+"""
+
+import glob
+import os
+
+from common import TEST_PROGRAMS, best_of
+from src.lexer import Lexer
+
+SIZE = 4 * 1024 * 1024
+
+
+def repeated_programs(size):
+    programs = []
+    for path in sorted(glob.glob(os.path.join(TEST_PROGRAMS, "*.rpal"))):
+        with open(path, "r") as file:
+            programs.append(file.read())
+    text = "\n".join(programs)
+    return (text * (size // len(text) + 1))[:size].rsplit("\n", 1)[0]
+
+
+def long_line(size):
+    parts = []
+    length = 0
+    i = 0
+    while length < size:
+        part = f"let f{i} x = x * {i} + 'str{i}' aug (f{i} (x - 1), nil) in "
+        parts.append(part)
+        length += len(part)
+        i += 1
+    return "".join(parts) + "0"
+
+
+SOURCES = [
+    ("programs", repeated_programs(SIZE)),
+    ("long line", long_line(SIZE)),
+]
+
+
+def main():
+    print(f"{'source':<12} {'size (MB)':>10} {'tokens':>10} {'time (s)':>9} {'MB/s':>8}")
+    for name, source_code in SOURCES:
+        megabytes = len(source_code.encode()) / (1024 * 1024)
+        tokens = len(Lexer(source_code).tokenize())
+        seconds = best_of(lambda: Lexer(source_code).tokenize(), repeat=3)
+        print(f"{name:<12} {megabytes:>10.2f} {tokens:>10} {seconds:>9.3f} {megabytes / seconds:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Benchmark: parsing deeply nested programs.
+
+Parses the same token lists with the recursive parser the repository
+started from (Archive/src/parser.py) and with the parser of src/, which
+runs its grammar rules on an explicit stack, and reports the time of
+each, for:
+
+    flat        the generated program of bench_parser.py, no nesting
+    parens N    an identifier inside N pairs of parentheses
+    where N     a chain of N where clauses
+
+The recursive parser takes about fifteen Python frames per level of
+parentheses, so it stops with RecursionError a few dozen levels deep;
+the explicit stack has no such limit.
+
+Usage:
+    python benchmarks/bench_nesting.py
+"""
+
+import importlib.util
+import os
+
+from common import ROOT, best_of
+from bench_parser import generated_program
+from src.lexer import Lexer
+from src.parser import Parser
+
+
+def load_recursive_parser():
+    path = os.path.join(ROOT, "Archive", "src", "parser.py")
+    spec = importlib.util.spec_from_file_location("recursive_parser", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.Parser
+
+
+SOURCES = [
+    ("flat", generated_program(10_000)),
+    ("parens 50", "(" * 50 + "x" + ")" * 50),
+    ("parens 1000", "(" * 1000 + "x" + ")" * 1000),
+    ("parens 100000", "(" * 100_000 + "x" + ")" * 100_000),
+    ("where 100000", "x" + " where x = y" * 100_000),
+]
+
+
+def timed(parser_class, tokens):
+    """Return the best time of parsing the tokens, or the name of the error the parser stopped with."""
+    try:
+        return f"{best_of(lambda: parser_class(tokens).parse(), repeat=3):.3f}"
+    except RecursionError as error:
+        return type(error).__name__
+
+
+def main():
+    parsers = [("recursive", load_recursive_parser()), ("explicit stack", Parser)]
+    print(f"{'source':<14} {'tokens':>8}" + "".join(f" {name + ' (s)':>19}" for name, _ in parsers))
+    for name, source_code in SOURCES:
+        tokens = list(Lexer(source_code).iter_tokens())
+        print(f"{name:<14} {len(tokens):>8}" + "".join(f" {timed(parser, tokens):>19}" for _, parser in parsers))
+
+
+if __name__ == "__main__":
+    main()
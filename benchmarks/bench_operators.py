@@ -0,0 +1,96 @@
+"""
+Benchmark: cost of each operator.
+
+Applies every binary operator through rule 6 and every unary operator
+through rule 7 on operands pushed straight onto the stack, and reports the
+time per application. Inbuilt functions are applied like they are in a
+program, with their gammas on the control.
+
+Usage:
+    python benchmarks/bench_operators.py
+"""
+
+import time
+
+from common import ROOT  # noqa: F401  (puts the repository on sys.path)
+from src.cse_machine.machine import CSEMachine
+from src.cse_machine.utils.control_structure_element import ControlStructureElement
+
+NUMBER = 20_000
+
+
+def value(type, value):
+    return ControlStructureElement(type, value)
+
+
+INT_A, INT_B = value("INT", 1234), value("INT", 56)
+TRUE, FALSE = value("bool", True), value("bool", False)
+STR_A, STR_B = value("STR", "hello"), value("STR", "world")
+
+# (label, operator, left operand, right operand, gammas on the control)
+BINARY = [
+    ("+ INT",       "+",    INT_A, INT_B, 0),
+    ("- INT",       "-",    INT_A, INT_B, 0),
+    ("* INT",       "*",    INT_A, INT_B, 0),
+    ("/ INT",       "/",    INT_A, INT_B, 0),
+    ("** INT",      "**",   INT_B, value("INT", 3), 0),
+    ("gr INT",      "gr",   INT_A, INT_B, 0),
+    ("ge INT",      "ge",   INT_A, INT_B, 0),
+    ("ls INT",      "ls",   INT_A, INT_B, 0),
+    ("le INT",      "le",   INT_A, INT_B, 0),
+    ("eq INT",      "eq",   INT_A, INT_B, 0),
+    ("ne INT",      "ne",   INT_A, INT_B, 0),
+    ("or bool",     "or",   TRUE, FALSE, 0),
+    ("& bool",      "&",    TRUE, FALSE, 0),
+    ("eq bool",     "eq",   TRUE, FALSE, 0),
+    ("ne bool",     "ne",   TRUE, FALSE, 0),
+    ("eq STR",      "eq",   STR_A, STR_B, 0),
+    ("ls STR",      "ls",   STR_A, STR_B, 0),
+    ("aug",         "aug",  INT_A, INT_B, 0),
+    ("Conc",        "Conc", STR_A, STR_B, 2),
+]
+
+# (label, operator, operand, gammas on the control)
+UNARY = [
+    ("neg INT",     "neg",          INT_A, 0),
+    ("not bool",    "not",          TRUE, 0),
+    ("Isinteger",   "Isinteger",    INT_A, 1),
+    ("Istruthvalue", "Istruthvalue", TRUE, 1),
+    ("Isstring",    "Isstring",     STR_A, 1),
+    ("ItoS",        "ItoS",         INT_A, 1),
+    ("Stem",        "Stem",         STR_A, 1),
+    ("Stern",       "Stern",        STR_A, 1),
+]
+
+
+def time_rule(rule, operator, operands, gammas):
+    cse_machine = CSEMachine()
+    rule = getattr(cse_machine, rule)
+    stack = cse_machine.stack.items
+    control = cse_machine.control
+    gamma = ControlStructureElement("gamma", "gamma")
+    start = time.perf_counter()
+    for _ in range(NUMBER):
+        for _ in range(gammas):
+            control.push(gamma)
+        stack.extend(operands)
+        rule(operator)
+        stack.pop()
+    return (time.perf_counter() - start) / NUMBER
+
+
+def main():
+    print(f"{'operator':<14} {'ns/op':>8}")
+    for label, name, left, right, gammas in BINARY:
+        operator = ControlStructureElement(name, name)
+        # rule 6 takes the left operand off the top of the stack
+        seconds = min(time_rule("CSErule6", operator, (right, left), gammas) for _ in range(3))
+        print(f"{label:<14} {seconds * 1e9:>8.0f}")
+    for label, name, operand, gammas in UNARY:
+        operator = ControlStructureElement(name, name)
+        seconds = min(time_rule("CSErule7", operator, (operand,), gammas) for _ in range(3))
+        print(f"{label:<14} {seconds * 1e9:>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
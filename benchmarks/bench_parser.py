@@ -0,0 +1,55 @@
+"""
+Benchmark: parsing large sources.
+
+Parses a generated multi-megabyte program (one long tuple of expressions)
+and reports the time and the peak memory traced by tracemalloc, for:
+
+    token list  Lexer.tokenize, then the parser reads the list
+    streaming   the parser pulls tokens from Lexer.iter_tokens as it goes
+
+Both build the same tree; streaming never holds the token list, so its
+peak is the tree alone.
+
+Usage:
+    python benchmarks/bench_parser.py
+"""
+
+import time
+import tracemalloc
+
+from common import ROOT  # noqa: F401  (puts the repository on sys.path)
+from src.lexer import Lexer
+from src.parser import Parser
+
+ITEMS = 40_000
+
+
+def generated_program(items):
+    parts = [f"f{i} (x{i} + {i}) * 2 - 'item{i}'" for i in range(items)]
+    return "let f x = x in Print (" + ",\n".join(parts) + ")"
+
+
+MODES = [
+    ("token list", lambda source_code: Parser(Lexer(source_code).tokenize()).parse()),
+    ("streaming", lambda source_code: Parser(Lexer(source_code).iter_tokens()).parse()),
+]
+
+
+def main():
+    source_code = generated_program(ITEMS)
+    print(f"source: {len(source_code) / (1024 * 1024):.2f} MB, {len(Lexer(source_code).tokenize())} tokens")
+    print(f"{'mode':<12} {'time (s)':>9} {'peak (MB)':>10}")
+    for name, parse in MODES:
+        start = time.perf_counter()
+        parse(source_code)
+        seconds = time.perf_counter() - start
+
+        tracemalloc.start()
+        parse(source_code)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{name:<12} {seconds:>9.3f} {peak / (1024 * 1024):>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Benchmark: recursive functions.
+
+Runs programs whose time goes into calls of functions defined with rec and
+reports the wall time of each. A function defined with rec is bound into
+its own environment once, so a recursive call is a single application
+instead of going through an eta, which took two.
+
+Usage:
+    python benchmarks/bench_recursion.py
+"""
+
+from common import best_of, read_program, standardize
+from src.cse_machine.machine import CSEMachine
+
+PROGRAMS = [
+    ("recurs1.rpal", read_program("recurs1.rpal")),
+    ("fibonacci (3-t1.rpal)", read_program("3-t1.rpal")),
+    ("naive fib 18", """
+let rec fib n = n ls 2 -> n | fib (n - 1) + fib (n - 2)
+in Print (fib 18)
+"""),
+    ("recursion, 5000", """
+let rec Sum N = N eq 0 -> 0 | N + Sum (N - 1)
+in Print (Sum 5000)
+"""),
+    ("tail loop, 20000", """
+let rec loop n acc = n eq 0 -> acc | loop (n - 1) (acc + n)
+in Print (loop 20000 0)
+"""),
+    ("tuple argument loop, 20000", """
+let rec loop (n, acc) = n eq 0 -> acc | loop (n - 1, acc + n)
+in Print (loop (20000, 0))
+"""),
+]
+
+
+def main():
+    print(f"{'program':<28} {'time (s)':>9}")
+    for name, source_code in PROGRAMS:
+        st_tree = standardize(source_code)
+        seconds = best_of(lambda: CSEMachine().execute(st_tree), repeat=5)
+        print(f"{name:<28} {seconds:>9.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Benchmark: cost of returning from a function against stack depth.
+
+Rule 5 leaves the environment of a function body and goes back to the
+environment of its caller. This puts 1k, 10k and 100k items on the stack
+below a call and times returns from it, for two shapes of stack:
+
+    nested   the env markers and values of that many pending calls
+    values   that many values of one caller, e.g. a long tuple being built
+
+The caller's environment is taken from the machine's environment stack
+instead of searching the stack for its env marker, so the time per return
+does not grow with the depth in either shape.
+
+Usage:
+    python benchmarks/bench_returns.py
+"""
+
+import time
+
+from common import ROOT  # noqa: F401  (puts the repository on sys.path)
+from src.cse_machine.data_structures.enviroment import Environment
+from src.cse_machine.machine import CSEMachine
+from src.cse_machine.utils.control_structure_element import ControlStructureElement
+from src.cse_machine.utils.opcodes import OP_ENV
+
+DEPTHS = [1_000, 10_000, 100_000]
+RETURNS = 10_000
+
+
+def new_environment(cse_machine):
+    env = Environment(cse_machine.env_count)
+    cse_machine.env_count += 1
+    return env
+
+
+def env_marker(env):
+    return ControlStructureElement("env_marker", "env_marker", None, None, env, op=OP_ENV)
+
+
+def fill_nested(cse_machine, depth):
+    # each pending call leaves its env marker and a value of its caller on the stack
+    stack = cse_machine.stack.items
+    for _ in range(depth):
+        env = new_environment(cse_machine)
+        cse_machine.env_stack.append(env)
+        stack.append(env_marker(env))
+        stack.append(ControlStructureElement("INT", 1))
+    cse_machine.current_enviroment = cse_machine.env_stack[-1]
+
+
+def fill_values(cse_machine, depth):
+    # one caller has pushed all the values above its env marker
+    env = new_environment(cse_machine)
+    cse_machine.env_stack.append(env)
+    cse_machine.current_enviroment = env
+    stack = cse_machine.stack.items
+    stack.append(env_marker(env))
+    stack.extend(ControlStructureElement("INT", 1) for _ in range(depth))
+
+
+def time_returns(fill, depth):
+    cse_machine = CSEMachine()
+    fill(cse_machine, depth)
+    stack = cse_machine.stack.items
+    callee = new_environment(cse_machine)
+    marker = env_marker(callee)
+    result = ControlStructureElement("INT", 2)
+    seconds = 0.0
+    for _ in range(RETURNS):
+        # enter the callee, then time leaving it
+        cse_machine.env_stack.append(callee)
+        cse_machine.current_enviroment = callee
+        stack.append(marker)
+        stack.append(result)
+        start = time.perf_counter()
+        cse_machine.CSErule5(marker)
+        seconds += time.perf_counter() - start
+        stack.pop()
+    return seconds / RETURNS
+
+
+def main():
+    print(f"{'stack depth':>11} {'nested ns/return':>17} {'values ns/return':>17}")
+    for depth in DEPTHS:
+        timings = []
+        for fill in (fill_nested, fill_values):
+            timings.append(time_returns(fill, depth) * 1e9)
+        print(f"{depth:>11,} {timings[0]:>17.0f} {timings[1]:>17.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+Benchmark: standardizing large trees.
+
+Parses generated programs into trees of Nodes and standardizes copies of
+them with the recursive Node.standardize the repository started from
+(Archive/src/standerizer/node.py) and with the worklist Standardizer of
+src/, and reports the bytes per node of the copies and the best time of
+each, for:
+
+    functions N   N function definitions joined by `and`, each with a
+                  where clause, a within and an infix @
+    where N       a chain of N where clauses
+
+The Nodes the repository started from hold their depth and parent, and
+the recursive standardizer keeps both up to date; the Nodes of src/ have
+__slots__ and hold neither. The recursive standardizer takes a Python
+frame per level of the tree, so it stops with RecursionError on the
+where chain; the worklist has no such limit. The rule counts of the
+Standardizer are printed under each program.
+
+Usage:
+    python benchmarks/bench_standardize.py
+"""
+
+import gc
+import importlib.util
+import os
+import time
+import tracemalloc
+
+from common import ROOT
+from src.lexer import Lexer
+from src.parser import Parser
+from src.standerizer.node import Node
+from src.standerizer.standardizer import Standardizer
+
+
+def load_recursive_node():
+    path = os.path.join(ROOT, "Archive", "src", "standerizer", "node.py")
+    spec = importlib.util.spec_from_file_location("recursive_node", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.Node
+
+
+def functions_program(items):
+    parts = [f"rec f{i} x y = (let q = {i} within g a b = a @h b in g x y) where h = q" for i in range(items)]
+    return "let " + " and ".join(parts) + " in Print (f0 1 2)"
+
+
+SOURCES = [
+    ("functions 2000", functions_program(2_000)),
+    ("functions 10000", functions_program(10_000)),
+    ("where 100000", "x" + " where x = y" * 100_000),
+]
+
+
+def copy_linked(root, node_class):
+    """Return a copy of a tree made of node_class objects that hold their depth and parent."""
+    copy = node_class()
+    copy.data = root.get_data()
+    stack = [(root, copy)]
+    while stack:
+        node, node_copy = stack.pop()
+        for child in node.children:
+            child_copy = node_class()
+            child_copy.data = child.get_data()
+            child_copy.depth = node_copy.depth + 1
+            child_copy.parent = node_copy
+            node_copy.children.append(child_copy)
+            stack.append((child, child_copy))
+    return copy
+
+
+def copy_lean(root):
+    """Return a copy of a tree made of the Nodes of src/, which hold neither."""
+    copy = Node(root.kind, root.value)
+    stack = [(root, copy)]
+    while stack:
+        node, node_copy = stack.pop()
+        for child in node.children:
+            child_copy = Node(child.kind, child.value)
+            node_copy.children.append(child_copy)
+            stack.append((child, child_copy))
+    return copy
+
+
+def copy_recursive(root):
+    return copy_linked(root, RecursiveNode)
+
+
+def standardize_recursive(root):
+    root.standardize()
+
+
+def standardize_worklist(root):
+    Standardizer().standardize(root)
+
+
+RecursiveNode = load_recursive_node()
+
+RUNS = [
+    ("recursive", copy_recursive, standardize_recursive),
+    ("worklist", copy_lean, standardize_worklist),
+]
+
+
+def measured(copy_tree, standardize, root, nodes, repeat=3):
+    """
+    Return the bytes per node of a copy of the tree, as traced by tracemalloc, and the best time
+    of standardizing a copy, or the name of the error it stopped with. The copies are made, and
+    the garbage of the last run collected, outside the timed region.
+    """
+    gc.collect()
+    tracemalloc.start()
+    copy = copy_tree(root)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del copy
+    best = float("inf")
+    for _ in range(repeat):
+        gc.disable()
+        copy = copy_tree(root)
+        gc.enable()
+        gc.collect()
+        start = time.perf_counter()
+        try:
+            standardize(copy)
+        except RecursionError as error:
+            return f"{size / nodes:.1f}", type(error).__name__
+        best = min(best, time.perf_counter() - start)
+    return f"{size / nodes:.1f}", f"{best:.3f}"
+
+
+def main():
+    print(f"{'source':<16} {'nodes':>8}" + "".join(f" {name + ' B/node':>17} {name + ' (s)':>14}" for name, _, _ in RUNS))
+    for name, source_code in SOURCES:
+        root = Parser(Lexer(source_code).tokenize(), nary=True).parse()
+        nodes = sum(1 for _ in iter_nodes(root))
+        row = f"{name:<16} {nodes:>8}"
+        for _, copy_tree, standardize in RUNS:
+            size, seconds = measured(copy_tree, standardize, root, nodes)
+            row += f" {size:>17} {seconds:>14}"
+        print(row)
+        standardizer = Standardizer()
+        standardizer.standardize(copy_lean(root))
+        print("    " + ", ".join(f"{rule} {count}" for rule, count in standardizer.rule_counts.items() if count))
+
+
+def iter_nodes(root):
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        yield node
+        stack.extend(node.children)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Benchmark: memory held by the tokens of a large source.
+
+Tokenizes the generated sources of bench_lexer.py and reports how many
+tokens fit in a megabyte of resident memory, for:
+
+    Token list   one Token object per token, as Lexer.iter_tokens gives them
+    TokenBuffer  Lexer.tokenize, kinds, lines and columns in arrays
+
+Each measurement runs in a fresh interpreter, and counts the growth of
+its peak resident set size (ru_maxrss) while the tokens are built and
+held, so the memory of the source and of the interpreter is left out.
+Linux only: ru_maxrss is read as kilobytes.
+
+Usage:
+    python benchmarks/bench_tokens.py
+"""
+
+import resource
+import subprocess
+import sys
+
+from common import ROOT  # noqa: F401  (puts the repository on sys.path)
+from bench_lexer import SOURCES
+from src.lexer import Lexer
+
+MODES = {
+    "Token list": lambda source_code: list(Lexer(source_code).iter_tokens()),
+    "TokenBuffer": lambda source_code: Lexer(source_code).tokenize(),
+}
+
+
+def max_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def measure(mode, source_name):
+    """Tokenize one source in this process and print the token count and the RSS growth in MB."""
+    source_code = dict(SOURCES)[source_name]
+    before = max_rss_mb()
+    tokens = MODES[mode](source_code)
+    print(len(tokens), max_rss_mb() - before)
+
+
+def main():
+    print(f"{'source':<12} {'mode':<12} {'tokens':>10} {'RSS (MB)':>9} {'tokens/MB':>10}")
+    for source_name, _ in SOURCES:
+        for mode in MODES:
+            output = subprocess.run([sys.executable, __file__, mode, source_name],
+                                    capture_output=True, text=True, check=True).stdout
+            count, megabytes = output.split()
+            count, megabytes = int(count), float(megabytes)
+            print(f"{source_name:<12} {mode:<12} {count:>10} {megabytes:>9.1f} {count / megabytes:>10.0f}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3:
+        measure(sys.argv[1], sys.argv[2])
+    else:
+        main()
@@ -0,0 +1,57 @@
+"""
+Benchmark: cost of CSE table tracing.
+
+Runs a recursive RPAL program untraced, with a bounded ring-buffer trace and with
+an unbounded trace, and reports wall time and peak traced memory for each mode.
+
+Usage:
+    python benchmarks/bench_trace.py [N]
+"""
+
+import sys
+import tracemalloc
+
+from common import best_of, standardize
+from src.cse_machine.machine import CSEMachine
+
+PROGRAM = """
+let rec Sum N = N eq 0 -> 0 | N + Sum (N - 1)
+in Print (Sum {n})
+"""
+
+MODES = [
+    ("untraced", dict()),
+    ("trace, last 1000 steps", dict(trace=True, trace_limit=1000)),
+    ("trace, every step", dict(trace=True)),
+]
+
+
+def run(source_code, options):
+    cse_machine = CSEMachine(**options)
+    cse_machine.execute(standardize(source_code))
+    return cse_machine
+
+
+def peak_memory(source_code, options):
+    """Peak bytes allocated while running the program, as seen by tracemalloc."""
+    tracemalloc.start()
+    run(source_code, options)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    source_code = PROGRAM.format(n=n)
+
+    print(f"Sum {n}")
+    print(f"{'mode':<24} {'time (s)':>10} {'peak memory (KiB)':>18}")
+    for name, options in MODES:
+        seconds = best_of(lambda: run(source_code, options), repeat=3)
+        peak = peak_memory(source_code, options)
+        print(f"{name:<24} {seconds:>10.3f} {peak / 1024:>18.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""
+Benchmark: building a tuple with aug.
+
+Builds tuples of 1k, 10k and 100k elements with repeated aug, the RPAL idiom
+for lists, then reads them back with Order and indexing. Tuples share their
+items, so each aug appends instead of copying the tuple, and the time per
+element stays flat as the tuple grows.
+
+Usage:
+    python benchmarks/bench_tuples.py
+"""
+
+from common import best_of, standardize
+from src.cse_machine.machine import CSEMachine
+
+SIZES = [1_000, 10_000, 100_000]
+
+PROGRAM = """
+let rec build n t = n eq 0 -> t | build (n - 1) (t aug n)
+in let rec sum t i acc = i eq 0 -> acc | sum t (i - 1) (acc + t i)
+in let t = build {} nil
+in Print (Order t, sum t (Order t) 0)
+"""
+
+
+def run(st_tree):
+    cse_machine = CSEMachine()
+    cse_machine.execute(st_tree)
+    return cse_machine
+
+
+def main():
+    print(f"{'elements':>9} {'time (s)':>10} {'us/element':>11}")
+    for size in SIZES:
+        st_tree = standardize(PROGRAM.format(size))
+        seconds = best_of(lambda: run(st_tree), repeat=3)
+        print(f"{size:>9,} {seconds:>10.4f} {seconds / size * 1e6:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Benchmark: allocation of intermediate values.
+
+Runs numeric programs and reports, for each, the wall time, the peak memory
+traced by tracemalloc and how many generation 0 garbage collections the run
+triggered. Generation 0 collections are triggered by allocating objects, so
+they track how much garbage the machine creates per step.
+
+Usage:
+    python benchmarks/bench_values.py
+"""
+
+import gc
+import tracemalloc
+
+from common import best_of, read_program, standardize
+from src.cse_machine.machine import CSEMachine
+
+PROGRAMS = [
+    ("fibonacci (3-t1.rpal)", read_program("3-t1.rpal")),
+    ("palindromes (6-t1.rpal)", read_program("6-t1.rpal")),
+    ("tail loop, 20000", """
+let rec loop n acc = n eq 0 -> acc | loop (n - 1) (acc + n * 2 - n)
+in Print (loop 20000 0)
+"""),
+    ("tuple of 10000 ints", """
+let rec build n t = n eq 0 -> t | build (n - 1) (t aug (n * 3))
+in Print (Order (build 10000 nil))
+"""),
+    ("recursion, 5000", """
+let rec Sum N = N eq 0 -> 0 | N + Sum (N - 1)
+in Print (Sum 5000)
+"""),
+]
+
+
+def run(st_tree):
+    CSEMachine().execute(st_tree)
+
+
+def gc_collections():
+    return gc.get_stats()[0]["collections"]
+
+
+def main():
+    print(f"{'program':<26} {'time (s)':>9} {'peak (KiB)':>11} {'gen 0 collections':>18}")
+    for name, source_code in PROGRAMS:
+        st_tree = standardize(source_code)
+        seconds = best_of(lambda: run(st_tree), repeat=5)
+
+        collections = gc_collections()
+        run(st_tree)
+        collections = gc_collections() - collections
+
+        tracemalloc.start()
+        run(st_tree)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        print(f"{name:<26} {seconds:>9.4f} {peak / 1024:>11.0f} {collections:>18}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Shared helpers for the interpreter benchmarks.
+Compiles RPAL source through the same pipeline as myrpal.py and times the result.
+"""
+
+import os
+import sys
+import time
+
+# Make the `src` package importable when a benchmark is run as a script
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from src.lexer import Lexer
+from src.parser import Parser
+from src.standerizer.ast import AST
+
+TEST_PROGRAMS = os.path.join(ROOT, "test-programs")
+
+
+def read_program(name):
+    """Read a program from the test-programs directory."""
+    with open(os.path.join(TEST_PROGRAMS, name), "r") as file:
+        return file.read()
+
+
+def standardize(source_code):
+    """
+    Run the front end on the given source.
+
+    Returns:
+        Node: Root of the standardized tree, ready for CSEMachine.execute.
+    """
+    tokens = Lexer(source_code).tokenize()
+    ast_obj = AST(Parser(tokens, nary=True).parse())
+    ast_obj.standardize()
+    return ast_obj.root
+
+
+def best_of(func, repeat=5):
+    """Call func `repeat` times and return the fastest wall-clock time in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
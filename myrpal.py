@@ -5,15 +5,8 @@ lexical analysis, parsing, standardization, and execution of RPAL programs.
 """
 
 import argparse
-from src.lexer import Lexer
-from src.parser import Parser
-from src.standerizer.ast import AST
-from src.standerizer.node import Node
-from src.standerizer import ast_factory
-from src.lcrs_to_nary_convertor import lcrs_to_nary
-from src.rpal_ast import print_ast
-from src.nary_to_lcrs_convertor import nary_to_lcrs
-from src.cse_machine.machine import CSEMachine
+from src.cse_machine.machine import CSEMachine, DEFAULT_MAX_DEPTH
+from src.cse_machine.utils.program_cache import ProgramCache
 
 def main():
     # Parse command line arguments
@@ -21,34 +14,58 @@ def main():
     parser.add_argument("filename", help="Input RPAL program file")
     parser.add_argument("-ast", action="store_true", help="Print original AST only")
     parser.add_argument("-st", action="store_true", help="Print standardized AST only")
+    parser.add_argument("--trace", action="store_true", help="Record CSE machine steps and print the CSE table")
+    parser.add_argument("--trace-limit", type=int, default=1000, metavar="N",
+                        help="Keep only the last N traced steps (0 keeps every step, default: 1000)")
+    parser.add_argument("--max-steps", type=int, default=0, metavar="N",
+                        help="Stop after N CSE machine steps (default: 0, no limit)")
+    parser.add_argument("--max-depth", type=int, default=DEFAULT_MAX_DEPTH, metavar="N",
+                        help=f"Stop once N calls are open at once (0 for no limit, default: {DEFAULT_MAX_DEPTH})")
+    parser.add_argument("--max-memory", type=int, default=0, metavar="MB",
+                        help="Stop once the interpreter uses more than MB megabytes (default: 0, no limit)")
+    parser.add_argument("-O", dest="optimize", type=int, choices=[0, 1], default=1, metavar="LEVEL",
+                        help="Optimization level: -O0 compiles the program as written, -O1 folds its constant "
+                             "expressions first (default: 1)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Compile the program even if it is in the compiled program cache, and do not cache it")
     args = parser.parse_args()
 
     # Read source code from file
     with open(args.filename, "r") as file:
         source_code = file.read()
 
-    # Lexical Analysis: Convert source code to tokens
+    cse_machine = CSEMachine(trace=args.trace, trace_limit=args.trace_limit or None,
+                             max_steps=args.max_steps or None, max_depth=args.max_depth or None,
+                             max_memory=args.max_memory or None, optimize=args.optimize)
+
+    # A program compiled by an earlier run is loaded from the cache instead of being compiled again
+    cache = None if args.no_cache or args.ast or args.st else ProgramCache(optimize=args.optimize)
+    control_structures = cache.load(source_code) if cache else None
+    if control_structures is not None:
+        run(cse_machine, control_structures, args)
+        return
+
+    # The front end is only imported when the program has to be compiled
+    from src.lexer import Lexer
+    from src.parser import Parser
+    from src.standerizer.ast import AST
+
+    # Lexical Analysis: Convert source code to tokens, as the parser asks for them
     lexer = Lexer(source_code)
-    tokens = lexer.tokenize()
+    tokens = lexer.iter_tokens()
 
-    # Syntax Analysis: Build Abstract Syntax Tree
-    parser = Parser(tokens)
-    ast_root = parser.parse()
+    # Syntax Analysis: Build Abstract Syntax Tree, of the n-ary nodes the standardizer works on
+    parser = Parser(tokens, nary=True)
+    ast_obj = AST(parser.parse())
 
     # Option 1: Print original AST and exit
     if args.ast:
-        print_ast(ast_root)
+        ast_obj.print_ast()
         return
 
-    # Convert LCRS AST to n-ary tree for standardization
-    nary_root = lcrs_to_nary(ast_root)
-    ast_obj = AST(nary_root)
-
-    # Standardize the AST according to RPAL rules
-    ast_obj.standardize()
-
-    # Option 2: Print standardized AST and exit
+    # Option 2: Standardize the AST according to RPAL rules, print the standardized AST and exit
     if args.st:
+        ast_obj.standardize()
         ast_obj.print_ast()
         return
 
@@ -58,13 +75,27 @@ def main():
     # Convert to n-ary format for CSE machine execution
     # st_nary_root = lcrs_to_nary(st_lcrs_root)
     
+    # Compile the program for the CSE machine, standardizing the AST as it goes (after folding
+    # its constant expressions at -O1), and cache it for the next run
+    control_structures = cse_machine.compile(ast_obj.root)
+    if cache:
+        cache.store(source_code, control_structures)
+
     # Execute the program using CSE machine
-    cse_machine = CSEMachine()
-    cse_machine.execute(ast_obj.root)
-    
+    run(cse_machine, control_structures, args)
+
+
+def run(cse_machine, control_structures, args):
+    """Run compiled control structures and print the output, and the CSE table if traced."""
+    cse_machine.run(control_structures)
+
     # Print the program output
     print(cse_machine._generate_output())
 
+    # Option 3: Print the CSE table of the traced run
+    if args.trace:
+        cse_machine._print_cse_table()
+
 
 if __name__ == "__main__":
     main()
@@ -5,7 +5,11 @@
 # This module can be imported and used to apply binary operations to operands in the CSE machine.
 
 # This file contains functions to apply unary and binary operations to operands in the CSE machine.
+import operator
+
 from src.cse_machine.utils.control_structure_element import ControlStructureElement
+from src.cse_machine.data_structures.persistent_tuple import PersistentTuple
+from src.cse_machine.utils.value import int_value, bool_value
 
 def apply_binary(cse_machine, rator, rand, binop):
     """
@@ -33,27 +37,8 @@ def apply_binary(cse_machine, rator, rand, binop):
         If the binary operator is not recognized.
     """
 
-    # Dictionary mapping binary operators to their corresponding functions
-    binary_operators = {
-            "aug" : lambda cse_machine, rator, rand : apply_aug(cse_machine, rator, rand),
-            "or"  : lambda cse_machine, rator, rand : apply_or(cse_machine, rator, rand),
-            "&"   : lambda cse_machine, rator, rand : apply_and(cse_machine, rator, rand),
-            "+"   : lambda cse_machine, rator, rand : apply_arithmetic(cse_machine, rator, rand, lambda a, b: a + b),
-            "-"   : lambda cse_machine, rator, rand : apply_arithmetic(cse_machine, rator, rand, lambda a, b: a - b),
-            "*"   : lambda cse_machine, rator, rand : apply_arithmetic(cse_machine, rator, rand, lambda a, b: a * b),
-            "/"   : lambda cse_machine, rator, rand : apply_arithmetic(cse_machine, rator, rand, lambda a, b: a // b),
-            "**"  : lambda cse_machine, rator, rand : apply_arithmetic(cse_machine, rator, rand, lambda a, b: a ** b),
-            "gr"  : lambda cse_machine, rator, rand : apply_comparison(cse_machine, rator, rand, lambda a, b: a > b),
-            "ge"  : lambda cse_machine, rator, rand : apply_comparison(cse_machine, rator, rand, lambda a, b: a >= b),
-            "ls"  : lambda cse_machine, rator, rand : apply_comparison(cse_machine, rator, rand, lambda a, b: a < b),
-            "le"  : lambda cse_machine, rator, rand : apply_comparison(cse_machine, rator, rand, lambda a, b: a <= b),
-            "eq"  : lambda cse_machine, rator, rand : apply_eq(cse_machine, rator, rand),
-            "ne"  : lambda cse_machine, rator, rand : apply_ne(cse_machine, rator, rand),
-            "Conc": lambda cse_machine, rator, rand : apply_conc(cse_machine, rator, rand)
-                    }
-
     # Get the operation function corresponding to the binary operator
-    operation_function = binary_operators.get(binop)
+    operation_function = BINARY_OPERATIONS.get(binop)
     if operation_function:
         # Apply the operation function with the provided operands
         return operation_function(cse_machine, rator, rand)
@@ -87,20 +72,17 @@ def apply_aug(cse_machine, rator, rand):
     """
     
     if rator.type == "nil" :
-        return ControlStructureElement("tuple", [rand])
+        return ControlStructureElement("tuple", PersistentTuple([rand]))
     elif rand.type == "nil":
         if rator.type == "tuple":
-            # If the right operand is "nil", return the left operand
-            rator.value.append(rand)
-            return rator
+            # If the right operand is "nil", append it to the left operand
+            return ControlStructureElement("tuple", rator.value.aug(rand))
         return rator
     elif rator.type in ["tuple","ID","INT","STR","bool"] and rand.type in ["tuple","ID","INT","STR","bool"]:
-        if isinstance(rator.value, list) :
-            ls = rator.value.copy()
-            ls.append(rand)
-            res = ControlStructureElement("tuple", ls)
-            return res
-        return ControlStructureElement("tuple", [rator, rand])
+        if isinstance(rator.value, PersistentTuple) :
+            # tuples share their items, so appending does not copy the left operand
+            return ControlStructureElement("tuple", rator.value.aug(rand))
+        return ControlStructureElement("tuple", PersistentTuple([rator, rand]))
     else:
         return cse_machine._error_handling.handle_error("Cannot augment a non tuple (2).")
 
@@ -316,3 +298,49 @@ def apply_comparison(cse_machine, rator, rand, operation):
     else:
         # Otherwise, raise an error
         raise cse_machine._error_handler.handle_error("Illegal Operands for 'gr'")
+
+################################################################################################
+# operator tables, built once when the module is imported
+################################################################################################
+
+# Dictionary mapping binary operators to their corresponding functions
+BINARY_OPERATIONS = {
+        "aug" : apply_aug,
+        "or"  : apply_or,
+        "&"   : apply_and,
+        "+"   : lambda cse_machine, rator, rand : apply_arithmetic(cse_machine, rator, rand, operator.add),
+        "-"   : lambda cse_machine, rator, rand : apply_arithmetic(cse_machine, rator, rand, operator.sub),
+        "*"   : lambda cse_machine, rator, rand : apply_arithmetic(cse_machine, rator, rand, operator.mul),
+        "/"   : lambda cse_machine, rator, rand : apply_arithmetic(cse_machine, rator, rand, operator.floordiv),
+        "**"  : lambda cse_machine, rator, rand : apply_arithmetic(cse_machine, rator, rand, operator.pow),
+        "gr"  : lambda cse_machine, rator, rand : apply_comparison(cse_machine, rator, rand, operator.gt),
+        "ge"  : lambda cse_machine, rator, rand : apply_comparison(cse_machine, rator, rand, operator.ge),
+        "ls"  : lambda cse_machine, rator, rand : apply_comparison(cse_machine, rator, rand, operator.lt),
+        "le"  : lambda cse_machine, rator, rand : apply_comparison(cse_machine, rator, rand, operator.le),
+        "eq"  : apply_eq,
+        "ne"  : apply_ne,
+        "Conc": apply_conc,
+            }
+
+# Fast paths for operands of one type, which need no type checks: the function applied
+# to the two values and the function making the value of its result, by operator
+INT_BINARY_OPERATIONS = {
+        "+"   : (operator.add, int_value),
+        "-"   : (operator.sub, int_value),
+        "*"   : (operator.mul, int_value),
+        "/"   : (operator.floordiv, int_value),
+        "**"  : (operator.pow, int_value),
+        "gr"  : (operator.gt, bool_value),
+        "ge"  : (operator.ge, bool_value),
+        "ls"  : (operator.lt, bool_value),
+        "le"  : (operator.le, bool_value),
+        "eq"  : (operator.eq, bool_value),
+        "ne"  : (operator.ne, bool_value),
+            }
+
+BOOL_BINARY_OPERATIONS = {
+        "or"  : (operator.or_, bool_value),
+        "&"   : (operator.and_, bool_value),
+        "eq"  : (operator.eq, bool_value),
+        "ne"  : (operator.ne, bool_value),
+            }
@@ -4,7 +4,11 @@
 # Usage
 # This module can be imported and used to apply uninary operations to operands in the CSE machine.
 
+import operator
+
 from src.cse_machine.utils.control_structure_element import ControlStructureElement
+from src.cse_machine.data_structures.persistent_tuple import PersistentTuple
+from src.cse_machine.utils.value import int_value, bool_value, str_value
 
 def apply_unary(cse_machine, rator, unop):
     """
@@ -22,28 +26,8 @@ def apply_unary(cse_machine, rator, unop):
         ValueError: If the unary operation is not recognized.
     """
 
-    # Extract the operator from the RatorExpr
-    rator_value = rator.value
-
-    # Dictionary mapping binary operators to their corresponding functions
-    unary_operators = {
-            "Print"       : lambda cse_machine, operand: apply_print(cse_machine, operand),
-            "Isstring"    : lambda cse_machine, operand: operand.type == "STR",
-            "Isinteger"   : lambda cse_machine, operand: operand.type == "INT" ,
-            "Istruthvalue": lambda cse_machine, operand: operand.type == "bool",
-            "Isfunction"  : lambda cse_machine, operand: operand.type == "lambda",
-            "Null"        : lambda cse_machine, operand: operand.type == "nil",
-            "Istuple"     : lambda cse_machine, operand: isinstance(operand.value, list) or operand.type == "nil",
-            "Order"       : lambda cse_machine, operand: apply_order(cse_machine, operand),
-            "Stern"       : lambda cse_machine, operand: apply_stern(cse_machine, operand.value),
-            "Stem"        : lambda cse_machine, operand: apply_stem(cse_machine, operand.value),
-            "ItoS"        : lambda cse_machine, operand: str(operand.value) if isinstance(operand.value, int) and not isinstance(operand.value, bool) else cse_machine._error_handler.handle_error("CSE : Invalid unary operation"),
-            "neg"         : lambda cse_machine, operand: -operand.value if isinstance(operand.value, int) else cse_machine._error_handler.handle_error("CSE : Invalid unary operation"),
-            "not"         : lambda cse_machine, operand: not operand.value if isinstance(operand.value, bool) else cse_machine._error_handler.handle_error("CSE : Invalid unary operation"),
-        }
-    
     # Get the operation function corresponding to the binary operator
-    operation_function = unary_operators.get(unop)
+    operation_function = UNARY_OPERATIONS.get(unop)
 
     if operation_function:
         # Apply the operation function with the provided operands
@@ -69,13 +53,12 @@ def apply_print(cse_machine, operand):
     element = operand.value
     
     # Define the covertToString function
-    def covert_to_string(element):
-        if isinstance(element, list):
-            out = ""
-            return convert_list(element,out)
+    def covert_to_string(element, closure=operand):
+        if isinstance(element, PersistentTuple):
+            return convert_list(element)
         elif element == "lambda":
-            x = "".join(x for x in operand.bounded_variable)
-            k = str(operand.control_structure)
+            x = "".join(x for x in closure.bounded_variable)
+            k = str(closure.control_structure)
             return "[lambda closure: " + x + ": " + k + "]"
         elif isinstance(element, bool):
             return "true" if element else "false"
@@ -88,21 +71,9 @@ def apply_print(cse_machine, operand):
         else:
             raise TypeError("Unknown element type.")
         
-    def convert_list(element,out):
-        if isinstance(element, list):
-            out += "("
-            for el in element:
-                out = convert_list(el,out)
-            out = out[:-2] +  ")"
-        else:
-            if isinstance(element.value, list):
-                out += "("
-                for el in element.value:
-                    out = convert_list(el,out)
-                out = out[:-2] +  "), "
-            else:
-                out += covert_to_string(element.value) + ", "
-        return out
+    def convert_list(element):
+        # join the items once instead of growing a string, which would copy it for every item
+        return "(" + ", ".join([covert_to_string(el.value, el) for el in element]) + ")"
     
     # convert the element to a string
     cse_machine._print_queue.append(covert_to_string(element).replace("\\n", "\n").replace("\\t", "\t"))
@@ -127,7 +98,7 @@ def apply_order(cse_machine, operand):
         ValueError: If the operand is not a string.
     """
     
-    if isinstance(operand.value, list):
+    if isinstance(operand.value, PersistentTuple):
         return len(operand.value)
     elif operand.type == "nil":
         return 0
@@ -175,4 +146,36 @@ def apply_stem(cse_machine, operand):
         return operand[0]
     else:
         cse_machine._error_handler.handle_error("CSE : Invalid unary operation")
-        
\ No newline at end of file
+        
+
+################################################################################################
+# operator tables, built once when the module is imported
+################################################################################################
+
+# Dictionary mapping unary operators to their corresponding functions
+UNARY_OPERATIONS = {
+        "Print"       : lambda cse_machine, operand: apply_print(cse_machine, operand),
+        "Isstring"    : lambda cse_machine, operand: operand.type == "STR",
+        "Isinteger"   : lambda cse_machine, operand: operand.type == "INT" ,
+        "Istruthvalue": lambda cse_machine, operand: operand.type == "bool",
+        "Isfunction"  : lambda cse_machine, operand: operand.type == "lambda",
+        "Null"        : lambda cse_machine, operand: operand.type == "nil",
+        "Istuple"     : lambda cse_machine, operand: isinstance(operand.value, PersistentTuple) or operand.type == "nil",
+        "Order"       : lambda cse_machine, operand: apply_order(cse_machine, operand),
+        "Stern"       : lambda cse_machine, operand: apply_stern(cse_machine, operand.value),
+        "Stem"        : lambda cse_machine, operand: apply_stem(cse_machine, operand.value),
+        "ItoS"        : lambda cse_machine, operand: str(operand.value) if isinstance(operand.value, int) and not isinstance(operand.value, bool) else cse_machine._error_handler.handle_error("CSE : Invalid unary operation"),
+        "neg"         : lambda cse_machine, operand: -operand.value if isinstance(operand.value, int) else cse_machine._error_handler.handle_error("CSE : Invalid unary operation"),
+        "not"         : lambda cse_machine, operand: not operand.value if isinstance(operand.value, bool) else cse_machine._error_handler.handle_error("CSE : Invalid unary operation"),
+    }
+
+# Fast paths for operands of one type, which need no type checks: the function applied
+# to the value and the function making the value of its result, by operator
+INT_UNARY_OPERATIONS = {
+        "neg"         : (operator.neg, int_value),
+        "ItoS"        : (str, str_value),
+    }
+
+BOOL_UNARY_OPERATIONS = {
+        "not"         : (operator.not_, bool_value),
+    }
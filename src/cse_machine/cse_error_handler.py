@@ -16,5 +16,6 @@ class CseErrorHandler:
         Args:
             message (str): The error message.
         """
-        self.cse_machine._print_cse_table()
+        if self.cse_machine.tracing:
+            self.cse_machine._print_cse_table()
         raise Exception(message)
@@ -0,0 +1,160 @@
+# Description
+# This module defines the control of the CSE (Compiler, Symbolic, Expression) machine.
+
+# Usage
+# The CSE machine pushes whole control structures onto the Control as frames and pops elements off its top.
+
+from operator import length_hint
+
+class Control:
+    """
+    The control of the CSE machine, held as a stack of frames instead of a stack of elements.
+
+    A frame walks the element list of a control structure in place, from its last element
+    (the first one to run) down to its first, so entering a control structure costs the same
+    whatever the size of its body, and the element lists are shared by every activation
+    instead of being copied onto the control. Frames are reversed list iterators, which lets
+    the machine loop over a frame at C speed; a frame that has run out is dropped lazily,
+    the next time an element is taken from the control.
+
+    The element list of each frame is kept next to it, in lists, so the elements a frame has
+    not run yet can be read without advancing it. Whoever pushes or drops a frame does the
+    same to its list.
+
+    Attributes:
+        frames (list): The frames of the control, the innermost last.
+        lists (list): The element list each frame walks, in the same order as frames.
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty control.
+        """
+        self.frames = []
+        self.lists = []
+        # elements of the frames below the top, kept between calls to whole_stack
+        self._below = []
+        self._below_frames = []
+        self._below_sizes = []
+
+    def is_empty(self):
+        """
+        Return whether the control has no elements left.
+        """
+        return not any(map(length_hint, self.frames))
+
+    def push(self, element):
+        """
+        Push a single element onto the control.
+        """
+        elements = [element]
+        self.frames.append(reversed(elements))
+        self.lists.append(elements)
+
+    def push_structure(self, elements):
+        """
+        Push the elements of a control structure onto the control, last element on top.
+
+        Args:
+            elements (list): The elements of the control structure. The list is shared, not copied.
+        """
+        self.frames.append(reversed(elements))
+        self.lists.append(elements)
+
+    def push_call(self, env_marker, elements):
+        """
+        Push the environment marker of a call followed by the body of the function called.
+
+        Args:
+            env_marker (ControlStructureElement): The marker of the environment the body runs in.
+            elements (list): The elements of the control structure of the body.
+        """
+        marker = [env_marker]
+        self.frames.extend((reversed(marker), reversed(elements)))
+        self.lists.extend((marker, elements))
+
+    def pop(self):
+        """
+        Remove and return the element on top of the control.
+        """
+        frames = self.frames
+        while True:
+            frame = frames[-1]
+            element = next(frame, None)
+            if element is not None:
+                if not length_hint(frame):
+                    # drop a frame as soon as it runs out, a tail call would otherwise leave it behind
+                    self._pop_frame()
+                return element
+            self._pop_frame()
+
+    def _pop_frame(self):
+        """
+        Remove the frame on top of the control.
+        """
+        frames = self.frames
+        frames.pop()
+        self.lists.pop()
+        # the frame below, if any, is on top again, and about to be advanced
+        if frames and len(self._below_frames) >= len(frames):
+            self._forget(len(frames) - 1)
+
+    def peek(self):
+        """
+        Return the element on top of the control without removing it.
+        """
+        element = self.pop()
+        self.push(element)
+        return element
+
+    def size(self):
+        """
+        Return the number of elements left on the control.
+        """
+        return sum(map(length_hint, self.frames))
+
+    def whole_stack(self):
+        """
+        Return the elements left on the control, bottom first.
+
+        This runs on every traced step, so the elements of the frames below the top are
+        kept from one call to the next: a frame only advances while it is on top, so they
+        stay valid for as long as those frames stay where they are.
+        """
+        frames = self.frames
+        if not frames:
+            return []
+        top = len(frames) - 1
+        below_frames = self._below_frames
+        keep = min(len(below_frames), top)
+        while keep and below_frames[keep - 1] is not frames[keep - 1]:
+            keep -= 1
+        if keep < len(below_frames):
+            self._forget(keep)
+        below = self._below
+        lists = self.lists
+        for index in range(keep, top):
+            below_frames.append(frames[index])
+            self._below_sizes.append(len(below))
+            below.extend(remaining(frames[index], lists[index]))
+        items = below[:]
+        items.extend(remaining(frames[top], lists[top]))
+        return items
+
+    def _forget(self, count):
+        """
+        Drop the kept elements of all but the bottom count frames.
+        """
+        del self._below[self._below_sizes[count]:]
+        del self._below_frames[count:]
+        del self._below_sizes[count:]
+
+
+def remaining(frame, elements):
+    """
+    Return the elements a frame has not run yet, bottom first, without advancing it.
+
+    A frame runs its element list from the end, so what it has left is the front of the
+    list, as long as the number of elements it has left.
+    """
+    return elements[:length_hint(frame)]
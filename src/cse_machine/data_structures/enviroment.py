@@ -1,65 +1,54 @@
 # Description
-# This module defines an enumeration class for the CSE (Compiler, Symbolic, Expression) machine. 
-# The enumeration class is used to represent different types of data and operations within the machine.
+# This module defines the environment class for the CSE (Compiler, Symbolic, Expression) machine.
+# An environment holds the values of the variables bound by one function call.
 
 # Usage
-# This module can be imported and used to define and handle enumerations in the CSE machine.
+# This module can be imported and used to create and chain environments in the CSE machine.
 
 
-from collections import defaultdict
-
 class Environment:
-    index = -1
-
-    # List of initial variables
-    INITIAL_VARIABLES = [
-                            "Print", "Isstring", "Isinteger", "Istruthvalue",
-                            "Istuple", "Isfunction", "Null", "Order", "Stern",
-                            "Stem", "ItoS", "neg", "not", "Conc"
-                         ]
 
-    def __init__(self, parent=None):
+    def __init__(self, index, parent=None, size=0):
         """
         Initialize a new environment.
 
+        Variables are stored in slots rather than by name: the resolver gives every
+        name a (depth, slot) address, so a lookup follows `depth` parents and reads
+        one slot. A slot holds the value bound itself, a Value or a ControlStructureElement,
+        which rule 1 pushes as it is. The primitive environment (e0) binds no names, as the inbuilt
+        functions are control elements of their own.
+
         Args:
+            index (int): The number of the environment, counted per machine from e0.
             parent (Environment, optional): The parent environment. Defaults to None.
+            size (int, optional): The number of variables bound. Defaults to 0.
         """
-        Environment.index += 1
-        self.index = Environment.index
-        self._environment = defaultdict(lambda: [None, None])  # name: [type, value]
+        self.index = index
+        self.slots = [None] * size  # slot: value
         self.parent = parent
 
-        # Initialize initial variables if this is the root environment
-        if self.index == 0:
-            self._initialize_initial_vars()
-
-    def _initialize_initial_vars(self):
-        """
-        Initialize initial variables.
-        """
-        initial_vars = {var: ["inbuilt-functions",None] for var in self.INITIAL_VARIABLES}
-        self._environment.update(initial_vars)
-
-    def add_var(self, name, type, value):
+    def add_var(self, slot, value):
         """
-        Add a variable to the environment.
+        Bind a variable of the environment.
 
         Args:
-            name (str): The name of the variable.
-            type (str): The type of the variable.
-            value (any): The value of the variable.
+            slot (int): The slot of the variable.
+            value (Value | ControlStructureElement): The value of the variable.
         """
-        self._environment[name] = [type, value]
+        self.slots[slot] = value
 
-    def add_child(self, branch):
+    def lookup(self, depth, slot):
         """
-        Add a child branch to the environment.
+        Return the value of the variable at the given address.
 
         Args:
-            branch (Environment): The child branch environment.
+            depth (int): The number of parents to follow from this environment.
+            slot (int): The slot of the variable in that environment.
         """
-        self.children.append(branch)
+        env = self
+        for _ in range(depth):
+            env = env.parent
+        return env.slots[slot]
 
     def set_parent(self, parent):
         """
@@ -69,11 +58,3 @@ class Environment:
             parent (Environment): The parent environment.
         """
         self.parent = parent
-        # Update the parent reference in the _environment dictionary
-        self._environment['__parent__'] = parent._environment if parent else None
-
-    def reset_index(self):
-        """
-        Reset the index of the environment.
-        """
-        Environment.index = -1
\ No newline at end of file
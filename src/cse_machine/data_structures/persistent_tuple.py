@@ -0,0 +1,77 @@
+# Description
+# This module defines the tuple values of the CSE (Compiler, Symbolic, Expression) machine.
+
+# Usage
+# The CSE machine stores the items of every tuple value in a PersistentTuple and extends it with aug.
+
+from itertools import islice
+
+class PersistentTuple:
+    """
+    An immutable tuple of CSE machine values that can be extended without copying.
+
+    A tuple is a length over a buffer that may be shared with other tuples. Extending a
+    tuple with aug appends to the shared buffer when the tuple ends where the buffer ends,
+    so building a tuple with repeated aug, the RPAL idiom for lists, is linear. Items past
+    the length of a tuple are never visible through it, and a tuple that no longer ends
+    the buffer (because another tuple was built from it) copies its items before extending.
+
+    Attributes:
+        _items (list): The buffer holding the items, possibly shared with other tuples.
+        _length (int): The number of items of the buffer that belong to this tuple.
+    """
+
+    __slots__ = ("_items", "_length")
+
+    def __init__(self, items=(), length=None):
+        """
+        Initialize a tuple.
+
+        Args:
+            items (iterable): The items of the tuple. A list is taken as the buffer, not copied.
+            length (int, optional): The number of items of the buffer in the tuple. Defaults to all of them.
+        """
+        self._items = items if isinstance(items, list) else list(items)
+        self._length = len(self._items) if length is None else length
+
+    def aug(self, item):
+        """
+        Return a new tuple with the given item appended to this one.
+
+        Args:
+            item (ControlStructureElement): The item to append.
+        """
+        items = self._items
+        length = self._length
+        if len(items) != length:
+            # the buffer has grown past this tuple, copy before writing
+            items = items[:length]
+        items.append(item)
+        return PersistentTuple(items, length + 1)
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, index):
+        """
+        Return the item at the given index, counting from the end for negative indices.
+        """
+        length = self._length
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError("tuple index out of range")
+        return self._items[index]
+
+    def __iter__(self):
+        return islice(self._items, self._length)
+
+    def __eq__(self, other):
+        if not isinstance(other, PersistentTuple):
+            return NotImplemented
+        return self._length == other._length and all(a == b for a, b in zip(self, other))
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"PersistentTuple({list(self)!r})"
@@ -25,14 +25,35 @@ Example Usage:
 """
 
 
+import sys
+from collections import deque
+
 from src.cse_machine.cse_error_handler import CseErrorHandler
 from src.cse_machine.data_structures.enviroment import Environment
+from src.cse_machine.data_structures.control import Control
+from src.cse_machine.data_structures.persistent_tuple import PersistentTuple
 from src.cse_machine.data_structures.stack import Stack
-from src.cse_machine.utils.STlinearizer import Linearizer
-from src.cse_machine.utils.util import add_table_data, print_cse_table , var_lookup , raw , add_table_data_decorator 
-from src.cse_machine.apply_operations.apply_binary_operations import apply_binary
-from src.cse_machine.apply_operations.apply_unary_operations import apply_unary
+from src.cse_machine.utils.compiler import Compiler
+from src.cse_machine.utils.folder import ConstantFolder
+from src.cse_machine.utils.resolver import Resolver
+from src.cse_machine.utils.value import Value, int_value, bool_value
+from src.cse_machine.utils.util import add_table_data, print_cse_table , var_lookup , raw , table_entry
+from src.cse_machine.apply_operations.apply_binary_operations import apply_binary, INT_BINARY_OPERATIONS, BOOL_BINARY_OPERATIONS
+from src.cse_machine.apply_operations.apply_unary_operations import apply_unary, INT_UNARY_OPERATIONS, BOOL_UNARY_OPERATIONS
 from src.cse_machine.utils.control_structure_element import ControlStructureElement
+from src.cse_machine.utils.opcodes import (OPCODE_COUNT, OP_CONSTANT, OP_NAME, OP_LAMBDA, OP_ENV, OP_BINARY, OP_UNARY,
+                                           OP_BETA, OP_TAU, OP_GAMMA, OP_CALL, BINARY_OPERATORS, UNARY_OPERATORS)
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+# Most calls a run may have open at once unless the machine is told otherwise
+DEFAULT_MAX_DEPTH = 1_000_000
+
+# Steps between two checks of the step and memory limits
+LIMIT_CHECK_INTERVAL = 1024
 
 class CSEMachine:
     """
@@ -43,65 +64,84 @@ class CSEMachine:
         control_structures (list): List of control structures extracted from the Standardized Tree (ST).
         environment_tree (Environment): Environment tree representing the current execution environment.
         current_enviroment (Environment): Reference to the current environment in the environment tree.
+        env_stack (list): Environments of the env markers on the stack, the innermost last.
         stack (Stack): Stack for managing the execution stack.
-        control (Stack): Stack for managing the control structures during execution.
-        _linearizer (Linearizer): Linearizer instance for converting the ST to linear form.
+        control (Control): Frames of the control structures being executed.
+        _linearizer (Compiler): Compiler instance for converting the AST or ST to linear form.
+        _resolver (Resolver): Resolver instance for giving the names of the control structures their addresses.
+        _rules (list): CSE rule for each opcode, indexed by the opcode of the control element.
+        _gamma_rules (dict): CSE rule applied by a gamma, keyed by the type of the top of the stack.
         binary_operator (set): Set of binary operators supported by the RPAL language.
         unary_operators (set): Set of unary operators supported by the RPAL language.
         _print_queue (list): List to store the print data as queue generated during execution.
-        table_data (list): List to store data for generating the execution table.
+        tracing (bool): Whether execution steps are recorded for the CSE table.
+        table_data (deque): Ring buffer holding the most recent execution steps when tracing.
+        env_count (int): Number of environments created so far; environments are numbered from e0 per machine.
+        steps (int): Number of steps run, counted when a step or memory limit is set.
+        max_steps (int): Most steps a run may take, or None for no limit.
+        max_depth (int): Most nested calls a run may have open at once, or None for no limit.
+        max_memory (int): Most memory, in megabytes, the process may peak at while running, or None for no limit.
+        optimize (int): Optimization level of compile: 0 compiles the program as written, 1 folds its constant expressions first.
     """
 
-    def __init__(self):
+    def __init__(self, trace=False, trace_limit=None, max_steps=None, max_depth=DEFAULT_MAX_DEPTH, max_memory=None, optimize=0):
         """
         Initialize the CSEMachine with necessary components.
+
+        Args:
+            trace (bool): Record every execution step for the CSE table. Untraced runs
+                skip the per-step snapshots entirely.
+            trace_limit (int, optional): Keep only the last `trace_limit` steps of the
+                trace. Defaults to None (keep every step).
+            max_steps (int, optional): Stop a run after this many steps. Defaults to None (no limit).
+            max_depth (int, optional): Stop a run once this many calls are open at once,
+                which catches runaway recursion. Defaults to DEFAULT_MAX_DEPTH; None for no limit.
+            max_memory (int, optional): Stop a run once the peak memory of the process passes
+                this many megabytes. Defaults to None (no limit).
+            optimize (int, optional): Optimization level of compile. At 1 the constant expressions of the
+                program are folded before it is compiled. Defaults to 0 (no optimization).
         """
         # Initialize the error handler
         self._error_handler = CseErrorHandler(self)
 
-        # Initialize the linearizer for converting the ST to linear form
-        self._linearizer = Linearizer()
+        # Initialize the compiler for converting the AST or ST to linear form
+        self._linearizer = Compiler()
+
+        # Initialize the resolver for the lexical addresses of the names
+        self._resolver = Resolver()
+
+        # Initialize the optimization level of compile
+        self.optimize = optimize
 
         # Initialize the primitive environment (e0) for the machine
-        self.primitive_environment = Environment()
+        self.env_count = 1
+        self.primitive_environment = Environment(0)
 
         # Initialize the control structures, environment, and stacks
         self.control_structures = None
         self.current_enviroment = self.primitive_environment
+        self.env_stack = []
         self.stack = Stack()
-        self.control = Stack()
+        self.control = Control()
         
         # Initialize print queue and table data
         self._print_queue = list()
-        self.table_data = list()
+        self.tracing = trace
+        self.table_data = deque(maxlen=trace_limit)
 
-        # binary operators supported by RPAL and inbuilt functions(Conc)
+        # Initialize the limits of a run
+        self.steps = 0
+        self.max_steps = max_steps
+        self.max_depth = max_depth
+        self.max_memory = max_memory
+        if max_memory is not None and resource is None:
+            self._error_handler.handle_error("CSE : Memory limit is not supported on this platform")
 
-        self.binary_operator = {
-                                # Arithmetic operators
-                                "+", "-", "/", "*", "**", 
-                                # Operators for comparison and logical operations
-                                "eq", "ne", "gr", "ge", "le","ls",
-                                # Relational operators 
-                                ">", "<", ">=", "<=", 
-                                # Logical operators 
-                                "or", "&", "aug",  
-                                # Operators for string concatenation (RPAL inbuilt function)
-                                "Conc"
-                                }
+        # binary operators supported by RPAL and inbuilt functions(Conc)
+        self.binary_operator = BINARY_OPERATORS
         
         # unary operators supported by RPAL and inbuilt functions
-
-        self.unary_operators =  {
-                                # Unary operators
-                                "neg", "not",
-                                # print inbuilt functions
-                                "Print", 
-                                # type checking inbuilt functions
-                                "Isstring", "Isinteger", "Istruthvalue", "Isfunction", "Null","Istuple",
-                                # String manipulation inbuilt functions
-                                "Order", "Stern", "Stem", "ItoS", "$ConcPartial"
-                                }
+        self.unary_operators = UNARY_OPERATORS
         
         # inbuilt functions support by RPAL 
 
@@ -121,158 +161,305 @@ class CSEMachine:
         """
     
         # Create the primitive environment as element
-        primitive_enviroment = ControlStructureElement("env_marker", "env_marker", None, None, self.current_enviroment)
+        primitive_enviroment = ControlStructureElement("env_marker", "env_marker", None, None, self.current_enviroment, op=OP_ENV)
 
         # Push the primitive environment onto both the stack and control stack
         self.stack.push(primitive_enviroment)
         self.control.push(primitive_enviroment)
+        self.env_stack.append(self.current_enviroment)
 
-        # Push elements from the first control structure onto the control stack
+        # Push the first control structure onto the control stack
         if self.control_structures:
-            elements = self.control_structures[0].elements
-            for element in elements:
-                self.control.push(element)
+            self.control.push_structure(self.control_structures[0].elements)
         else:
             # Handle the case when control_structures is empty
             self._error_handler.handle_error("Control structures are empty")
 
     def execute(self, st_tree):
         """
-        Execute the given Standardized Tree (ST).
+        Execute the given Standardized Tree (ST), or the AST it is standardized from.
 
         Args:
             st_tree (Node): The root node of the Standardized Tree (ST) to execute.
         """
-        
-        # Get the linearized control structures from the ST
-        self.control_structures = self._linearizer.linearize(st_tree)
-        
+        self.run(self.compile(st_tree))
+
+    def compile(self, st_tree):
+        """
+        Compile the given Standardized Tree (ST) to the control structures the machine runs.
+        The AST can be given instead, and is standardized as it is compiled. At optimization
+        level 1 the constant expressions of the tree are folded first, in place.
+
+        Args:
+            st_tree (Node): The root node of the Standardized Tree (ST) to compile.
+
+        Returns:
+            list[ControlStructure]: The control structures, with every name resolved to its address.
+        """
+        # Fold the constant expressions, which the folder finds in the AST as in the ST
+        if self.optimize:
+            ConstantFolder().fold(st_tree)
+
+        # Get the linearized control structures from the tree
+        control_structures = self._linearizer.compile(st_tree)
+
+        # Resolve every name to its address, failing on unbound names before anything runs
+        self._resolver.resolve(control_structures)
+        return control_structures
+
+    def run(self, control_structures):
+        """
+        Run compiled control structures, as built by compile or loaded from the program cache.
+
+        Args:
+            control_structures (list[ControlStructure]): The resolved control structures to run.
+        """
+        self.control_structures = control_structures
+        self._linearizer.control_structures = control_structures
+
         # Initialize the CSE machine
         self.initialize()
         
-        # Execute the ST
-        while not self.control.is_empty():
-
-            # get the top of the control stack
-            control_top = self.control.peek()
-            # get the top of the stack
-            stack_top = self.stack.peek()
-
-            # check the type of the control structure and apply the corresponding rule
-
-            if control_top.type in ['ID','STR','INT','bool','tuple','Y*','nil','dummy']:
-                self.CSErule1()
-            elif control_top.type == "lambda":
-                self.CSErule2()
-            elif control_top.type == "env_marker":
-                self.CSErule5()
-            elif control_top.value in self.binary_operator and self.stack.size() >= 2:
-                self.CSErule6()
-            elif control_top.value in self.unary_operators and self.stack.size() >= 1:
-                self.CSErule7()
-            elif control_top.type == "beta" and self.stack.size() >= 1:
-                self.CSErule8()
-            elif control_top.type == "tau":
-                self.CSErule9()
-            elif control_top.type == "gamma" and stack_top.type == "tuple":
-                self.CSErule10()
-            elif control_top.type == "gamma" and stack_top.type == "Y*":
-                self.CSErule12()
-            elif control_top.type == "gamma" and stack_top.type == "eta":
-                self.CSErule13()
-            elif control_top.type == "gamma"  and stack_top.type == "lambda":
-                    if len(stack_top.bounded_variable) > 1:
-                        self.CSErule11()
-                    else:
-                        self.CSErule4()
-            elif control_top.type == "gamma" and stack_top.type == "ConcPartial":
-                self.Concpartial()
+        # Build the rule tables the machine dispatches on
+        self._build_rule_tables()
+        rules = self._rules
+        frames = self.control.frames
+        lists = self.control.lists
+
+        # Execute the ST, counting steps only when a limit needs them
+        if self.max_steps is not None or self.max_memory is not None:
+            self._execute_limited(rules, frames, lists)
+            return
+
+        while frames:
+            # run the innermost frame until it is done or a rule changes the frames
+            frame = frames[-1]
+            for element in frame:
+                rules[element.op](element)
+                if frames[-1] is not frame:
+                    break
             else:
-                self._error_handler.handle_error("CSE : Invalid control structure")
-
-    @add_table_data_decorator("1")
-    def CSErule1(self):
-        """
-        CSE rule 1: If the top of the control stack is a variable, constant, or tuple,
-        push it onto the stack. If the top of the control stack is a control structure,
-        check whether it is a variable or a lambda expression. If it is a variable,
-        look up its value in the environment and push it onto the stack. If it is a
-        lambda expression, push it onto the stack.
-        """
-        control_top = self.control.peek()
-        if control_top.type in ['STR','INT','bool','tuple','Y*','nil','dummy']:
-            self.stack.push(self.control.pop())
-        else :
-            item = self.control.pop()
-            var_name = item.value
-            var = self._var_lookup(var_name)
-            if var[0] == "eta" or var[0] == "lambda":
-                self.stack.push(var[1])
-            else :
-                self.stack.push(ControlStructureElement(var[0],var[1]))
+                frames.pop()
+                lists.pop()
+
+    def _execute_limited(self, rules, frames, lists):
+        """
+        Run the control like execute, counting steps and checking the step and memory
+        limits every LIMIT_CHECK_INTERVAL steps, or exactly at the step limit.
+
+        Args:
+            rules (list): The CSE rule for each opcode.
+            frames (list): The frames of the control.
+            lists (list): The element lists of the frames.
+        """
+        max_steps = self.max_steps
+        steps = 0
+        next_check = 0
+        budget = 0
+        while frames:
+            frame = frames[-1]
+            for element in frame:
+                if not budget:
+                    steps = next_check
+                    self.steps = steps
+                    if max_steps is not None and steps >= max_steps:
+                        self._error_handler.handle_error(f"CSE : Step limit exceeded ({max_steps} steps)")
+                    self._check_memory()
+                    next_check = steps + LIMIT_CHECK_INTERVAL
+                    if max_steps is not None and next_check > max_steps:
+                        next_check = max_steps
+                    budget = next_check - steps
+                rules[element.op](element)
+                budget -= 1
+                if frames[-1] is not frame:
+                    break
+            else:
+                frames.pop()
+                lists.pop()
+        self.steps = next_check - budget
+
+    def _check_memory(self):
+        """
+        Raise an error if the peak memory of the process has passed the memory limit.
+        """
+        if self.max_memory is None:
+            return
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+        megabytes = peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+        if megabytes > self.max_memory:
+            self._error_handler.handle_error(f"CSE : Memory limit exceeded ({self.max_memory} MB)")
+
+    def _build_rule_tables(self):
+        """
+        Build the tables the machine dispatches on: one rule per opcode of the control
+        elements, and one rule per type of the value a gamma is applied to. When tracing,
+        every rule is wrapped so it records a CSE table row before it runs.
+        """
+        rule = self._traced if self.tracing else lambda rule: rule
+
+        rules = [self._invalid_control_structure] * OPCODE_COUNT
+        rules[OP_CONSTANT] = rule(self.CSErule1_constant)
+        rules[OP_NAME] = rule(self.CSErule1)
+        rules[OP_LAMBDA] = rule(self.CSErule2)
+        rules[OP_ENV] = rule(self.CSErule5)
+        rules[OP_BINARY] = rule(self.CSErule6)
+        rules[OP_UNARY] = rule(self.CSErule7)
+        rules[OP_BETA] = rule(self.CSErule8)
+        rules[OP_TAU] = rule(self.CSErule9)
+        rules[OP_GAMMA] = self._apply_gamma
+        rules[OP_CALL] = self._apply_call
+        self._rules = rules
+
+        self._gamma_rules = {
+                            "tuple"      : rule(self.CSErule10),
+                            "Y*"         : rule(self.CSErule12),
+                            "eta"        : rule(self.CSErule13),
+                            "ConcPartial": rule(self.Concpartial),
+                            }
+        self._apply_lambda = rule(self.CSErule4)
+        self._apply_lambda_n = rule(self.CSErule11)
+        self._call_lambda_n = rule(self.CSErule11_call)
+        self._call_with_tuple = rule(self.CSErule9_call)
+
+    def _traced(self, rule):
+        """
+        Wrap a CSE rule so it adds a row to the CSE table before it is applied.
+
+        Args:
+            rule (method): The CSE rule to wrap.
+        """
+        def traced_rule(element):
+            self._add_table_data(rule.table_entry, element)
+            rule(element)
+        return traced_rule
+
+    def _apply_gamma(self, gamma):
+        """
+        Apply a gamma, picking the rule from the type of the top of the stack.
+
+        Args:
+            gamma (ControlStructureElement): The gamma popped off the control.
+        """
+        stack_top = self.stack.items[-1]
+        if stack_top.type == "lambda":
+            if len(stack_top.bounded_variable) > 1:
+                self._apply_lambda_n(gamma)
+            else:
+                self._apply_lambda(gamma)
+        else:
+            rule = self._gamma_rules.get(stack_top.type)
+            if rule is None:
+                self._invalid_control_structure(gamma)
+            rule(gamma)
+
+    def _apply_call(self, call):
+        """
+        Apply a call: the top of the stack is applied to the n values below it. A lambda of
+        n variables binds them straight from the stack, anything else gets them as a tuple.
+
+        Args:
+            call (ControlStructureElement): The call popped off the control.
+        """
+        stack_top = self.stack.items[-1]
+        if stack_top.type == "lambda" and len(stack_top.bounded_variable) == call.value:
+            self._call_lambda_n(call)
+        else:
+            self._call_with_tuple(call)
+
+    def _invalid_control_structure(self, element):
+        self._error_handler.handle_error("CSE : Invalid control structure")
+
+    @table_entry("1")
+    def CSErule1_constant(self, constant):
+        """
+        CSE rule 1 for constants: If the top of the control stack is a constant or tuple,
+        push it onto the stack.
+        """
+        self.stack.items.append(constant)
+
+    @table_entry("1")
+    def CSErule1(self, name):
+        """
+        CSE rule 1 for names: If the top of the control stack is a variable,
+        push the value bound at its address in the environment onto the stack. Environments
+        hold the values themselves, so nothing is allocated.
+        """
+        stack = self.stack.items
+        depth, slot = name.address
+        env = self.current_enviroment
+        for _ in range(depth):
+            env = env.parent
+        stack.append(env.slots[slot])
         
-    @add_table_data_decorator("2") 
-    def CSErule2(self):
+    @table_entry("2") 
+    def CSErule2(self, lambda_):
         """
         CSE rule 2: If the top of the control stack is a lambda expression,
-        push it onto the stack. Set the environment of the lambda expression to the current environment.
+        push a closure of it onto the stack. The closure is a new element holding the current
+        environment; the lambda itself belongs to a shared control structure and is left untouched.
         """
-        lambda_ = self.control.pop()
-        lambda_.env = self.current_enviroment
-        self.stack.push(lambda_)
+        closure = ControlStructureElement("lambda","lambda",lambda_.bounded_variable,lambda_.control_structure,self.current_enviroment)
+        self.stack.items.append(closure)
         
-    @add_table_data_decorator("3")
-    def CSErule3(self):
+    @table_entry("3")
+    def CSErule3(self, element):
         pass
     
-    @add_table_data_decorator("4")
-    def CSErule4(self):
+    @table_entry("4")
+    def CSErule4(self, gamma):
         """
-        CSE rule 4: If the top of the control stack is a lambda expression,
-        push it onto the stack. Set the environment of the lambda expression to the current environment.
+        CSE rule 4: If the top of the control stack is a gamma and the top of the stack is a lambda,
+        bind the bounded variable to the value below it in a new environment and enter the body
+        of the lambda. A tail call first leaves the call it ends, so loops run in constant space.
         """
-
-        # for avoiding infinite loop 
-        if self.current_enviroment.index >= 10000:
-            self._error_handler.handle_error("CSE : Environment limit exceeded")
-            return
-
-        self.control.pop()
-        lambda_ = self.stack.pop()
-        rand = self.stack.pop()
-        new_enviroment = Environment()
-        if rand.type  == "eta" or rand.type == "lambda":
-            new_enviroment.add_var(lambda_.bounded_variable[0],rand.type,rand)
-        elif rand.type in ["tuple","INT","bool","STR","nil"]:
-            new_enviroment.add_var(lambda_.bounded_variable[0],rand.type,rand.value)
+        stack = self.stack.items
+
+        # for avoiding runaway recursion
+        if self.max_depth is not None and len(self.env_stack) > self.max_depth:
+            self._error_handler.handle_error(f"CSE : Depth limit exceeded ({self.max_depth} calls)")
+
+        lambda_ = stack.pop()
+        rand = stack.pop()
+        if gamma.tail:
+            self._leave_call()
+        new_enviroment = Environment(self.env_count, lambda_.env)
+        self.env_count += 1
+        if rand.type in ["eta","lambda","tuple","INT","bool","STR","nil"]:
+            new_enviroment.slots = [rand]
         else:
             self._error_handler.handle_error("CSE : Invalid type")
-        new_enviroment.parent = lambda_.env
 
         self.current_enviroment = new_enviroment
+        self.env_stack.append(new_enviroment)
         
-        new_enviroment_element = ControlStructureElement("env_marker","env_marker",None,None,new_enviroment)
-        
-        self.control.push(new_enviroment_element) 
+        new_enviroment_element = ControlStructureElement("env_marker","env_marker",None,None,new_enviroment,op=OP_ENV)
         
-        for element in self.control_structures[lambda_.control_structure].elements:
-            self.control.push(element)
+        self.control.push_call(new_enviroment_element, self.control_structures[lambda_.control_structure].elements)
             
-        self.stack.push(new_enviroment_element)
+        stack.append(new_enviroment_element)
         
-    @add_table_data_decorator("5")
-    def CSErule5(self):
+    def _leave_call(self):
+        """
+        Leave the call a tail call ends, as rule 5 would once the callee returned: its env marker
+        is next on the control and on the stack, once the operator and operand are popped.
+        """
+        marker = self.stack.items.pop()
+        if marker.type != "env_marker" or self.control.pop() is not marker:
+            self._error_handler.handle_error("CSE : Invalid environment")
+        self.env_stack.pop()
+
+    @table_entry("5")
+    def CSErule5(self, env_marker):
         """
         CSE rule 5: If the top of the control stack is an environment marker,
-        pop it off the stack and set the current environment to the environment
-        it represents. Then, pop the value off the stack and push it back on.
-        Finally, iterate over the entire stack, starting from the bottom, and
-        check if the current element is an environment marker. If it is, set the
-        current environment to the environment it represents and break out of the loop.
+        remove the matching marker from under the value on top of the stack and
+        go back to the environment of the enclosing marker, which is the top of
+        the environment stack once this one is popped off it.
         If the environments do not match, raise an error.
 
         Parameters:
-            None
+            env_marker (ControlStructureElement): The environment marker popped off the control.
 
         Returns:
             None
@@ -280,19 +467,20 @@ class CSEMachine:
         Raises:
             CseError: If the environments do not match
         """
-        env = self.control.pop().env
-        value = self.stack.pop()
-        if env == self.stack.pop().env:
-            self.stack.push(value)
-            for element in reversed(self.stack.whole_stack()):
-                if element.type == "env_marker":
-                    self.current_enviroment = element.env
-                    break
+        stack = self.stack.items
+        env = env_marker.env
+        value = stack.pop()
+        if env == stack.pop().env:
+            stack.append(value)
+            env_stack = self.env_stack
+            env_stack.pop()
+            if env_stack:
+                self.current_enviroment = env_stack[-1]
         else:
             self._error_handler.handle_error("CSE : Invalid environment")
                 
-    @add_table_data_decorator("6")
-    def CSErule6(self):
+    @table_entry("6")
+    def CSErule6(self, operator):
         """
         CSE rule 6: If the top of the control stack is a binary operation,
         pop two elements from the stack, apply the binary operation to the
@@ -301,24 +489,35 @@ class CSEMachine:
         apply the addition operator to the two popped elements, and push the result back onto the stack.
         If the top of the control stack is "Conc", pop two elements from the stack,
         check if both elements are of type "STR", and if so, concatenate the two strings and push the result back onto the stack.
-        If one of the two elements is not of type "STR", replace the element with type "ConcPartial" and push the other element back onto the stack.
+        If only the first element is of type "STR", push the other element back onto the stack followed by a "ConcPartial" holding the first string.
         If both elements are not of type "STR", raise an error.
+        Two integers or two truth values go straight to the operator, without the generic checks.
         """
-        binop = self.control.pop().value
-        rator = self.stack.pop()
-        rand = self.stack.pop()
-        if binop == "aug":
-            self.stack.push(self._apply_binary(rator,rand,binop))
+        stack = self.stack.items
+        binop = operator.value
+        rator = stack.pop()
+        rand = stack.pop()
+        rator_type = rator.type
+        if rator_type == "INT" and rand.type == "INT":
+            fast_path = INT_BINARY_OPERATIONS.get(binop)
+        elif rator_type == "bool" and rand.type == "bool":
+            fast_path = BOOL_BINARY_OPERATIONS.get(binop)
+        else:
+            fast_path = None
+        if fast_path is not None:
+            function, make = fast_path
+            stack.append(make(function(rator.value, rand.value)))
+        elif binop == "aug":
+            stack.append(self._apply_binary(rator,rand,binop))
         elif binop == "Conc":
             if rator.type == "STR" and rand.type == "STR":
                 result =self._apply_binary(rator.value,rand.value,binop)
-                self.stack.push(ControlStructureElement("STR",result))
+                stack.append(Value("STR",result))
                 self.remove_gamma()
                 self.remove_gamma()
             elif rator.type == "STR":
-                rator.type = "ConcPartial"
-                self.stack.push(rand)
-                self.stack.push(rator)
+                stack.append(rand)
+                stack.append(ControlStructureElement("ConcPartial",rator.value))
                 self.remove_gamma()
             else:
                 self._error_handler.handle_error("CSE : Invalid type for concatenation")
@@ -326,15 +525,13 @@ class CSEMachine:
             rator = rator.value
             rand = rand.value
             result = self._apply_binary(rator,rand,binop)
-            typ  = None
             if type(result) == bool:
-                typ = "bool"
+                stack.append(bool_value(result))
             else:
-                typ = "INT"
-            self.stack.push(ControlStructureElement(typ,result))
+                stack.append(int_value(result))
         
-    @add_table_data_decorator("7")    
-    def CSErule7(self):
+    @table_entry("7")    
+    def CSErule7(self, operator):
         """
         CSE rule 7: If the top of the control stack is a unary operation,
         pop one element from the stack, apply the unary operation to the
@@ -342,152 +539,213 @@ class CSEMachine:
         If the top of the control stack is "neg", pop one element from the stack,
         apply the negation operator to the popped element, and push the result back onto the stack.
         If the top of the control stack is "not", pop one element from the stack,
+        An integer or truth value goes straight to the operator when it has a fast path.
         """
-        unop = self.control.pop().value
-        rator_e = self.stack.pop()
-        result = self._apply_unary(rator_e,unop)
-        res_type = None
-        if type(result) == bool:
-            res_type = "bool"
-        elif type(result) == str:
-            res_type = "STR"
-        else :
-            res_type = "INT"
+        stack = self.stack.items
+        unop = operator.value
+        rator_e = stack.pop()
+        if rator_e.type == "INT":
+            fast_path = INT_UNARY_OPERATIONS.get(unop)
+        elif rator_e.type == "bool":
+            fast_path = BOOL_UNARY_OPERATIONS.get(unop)
+        else:
+            fast_path = None
+        if fast_path is not None:
+            function, make = fast_path
+            value = make(function(rator_e.value))
+        else:
+            result = self._apply_unary(rator_e,unop)
+            if type(result) == bool:
+                value = bool_value(result)
+            elif type(result) == str:
+                value = Value("STR",result)
+            else :
+                value = int_value(result)
         if unop in self.inbuilt_functions:
             self.remove_gamma()
-        self.stack.push(ControlStructureElement(res_type,result))
+        stack.append(value)
                     
-    @add_table_data_decorator("8")
-    def CSErule8(self):
-        """
-        CSE rule 8: If the top of the control stack is a boolean value,
-        pop it off the stack and check if it is True or False. If it is True,
-        pop two elements from the stack, check if the second element is a control structure,
-        and if so, replace the second element with the elements from the control structure.
-        Then, pop the first element off the stack and push it back on.
-        If the second element is not a control structure, raise an error.
-        If the boolean value is False, pop two elements from the stack,
-        check if the first element is a control structure, and if so, replace the first element
-        with the elements from the control structure. Then, pop the second element off the stack
-        and push it back on. If the first element is not a control structure, raise an error.
-        """
-        val = self.stack.pop().value
+    @table_entry("8")
+    def CSErule8(self, beta):
+        """
+        CSE rule 8: If the top of the control stack is a beta, pop the condition off the stack
+        and check if it is True or False. If it is True, pop the two deltas below the beta off the
+        control and enter the control structure of the first (then) delta. If it is False, enter
+        the control structure of the second (else) delta instead. If the condition is not a
+        truth value, raise an error.
+        """
+        # the two deltas always sit right below the beta, in the same frame
+        frame = self.control.frames[-1]
+        else_delta = next(frame)
+        then_delta = next(frame)
+        val = self.stack.items.pop().value
         if val == True :
-            self.control.pop()
-            self.control.pop()
-            delta = self.control.pop()
-            for element in self.control_structures[delta.control_structure].elements:
-                self.control.push(element)
+            self.control.push_structure(self.control_structures[then_delta.control_structure].elements)
         elif val == False:
-            self.control.pop()
-            delta = self.control.pop()
-            self.control.pop()
-            for element in self.control_structures[delta.control_structure].elements:
-                self.control.push(element)
+            self.control.push_structure(self.control_structures[else_delta.control_structure].elements)
         else:
             self._error_handler.handle_error("CSE : Invalid type for condition")
 
-    @add_table_data_decorator("9")
-    def CSErule9(self):
+    @table_entry("9")
+    def CSErule9(self, tau):
         """
         CSE rule 9: If the top of the control stack is a "tau" node,
         pop it off the stack and create a new tuple with the next "n" elements
         on the stack. Push the tuple back onto the stack.
         """
-        tau = self.control.pop()
+        stack = self.stack.items
         n = tau.value
         tup = []
         for i in range(n):
-            tup.append(self.stack.pop())
-        self.stack.push(ControlStructureElement("tuple",tup))
+            tup.append(stack.pop())
+        stack.append(ControlStructureElement("tuple",PersistentTuple(tup)))
 
-    @add_table_data_decorator("10")   
-    def CSErule10(self):
+    @table_entry("9")
+    def CSErule9_call(self, call):
+        """
+        CSE rule 9 for calls: build the tuple of the n values below the top of the stack,
+        as their tau would have, and push a gamma onto the control to apply the top to it.
+        """
+        stack = self.stack.items
+        rator = stack.pop()
+        self.CSErule9(call)
+        stack.append(rator)
+        self.control.push(ControlStructureElement("gamma","gamma",op=OP_GAMMA,tail=call.tail))
+
+    @table_entry("10")   
+    def CSErule10(self, gamma):
         """
         CSE rule 10: If the top of the control stack is a tuple, pop it off the stack,
         retrieve the index from the stack, and retrieve the element at the given index from the tuple.
         If the index is out of bounds, raise an error. Push the retrieved element back onto the stack.
         """
-        self.control.pop()
-        l = self.stack.pop()
-        index = self.stack.pop()
+        stack = self.stack.items
+        l = stack.pop()
+        index = stack.pop()
         if index.type != "INT":
             self._error_handler.handle_error("CSE : Invalid index")
         index  = index.value-1
-        self.stack.push(l.value[index])
+        stack.append(l.value[index])
                 
-    @add_table_data_decorator("11")
-    def CSErule11(self):
+    @table_entry("11")
+    def CSErule11(self, gamma):
         """
         CSE rule 11: If the top of the control stack is a lambda expression,
         pop it off the stack and retrieve the bounded variables, control structure, and environment from the lambda expression.
         Create a new environment with the same parent as the environment of the lambda expression.
         Pop the next "n" elements from the stack, where "n" is the number of arguments of the lambda expression.
-        For each element popped from the stack, add it to the new environment with the same type as the element.
+        The items of the tuple popped from the stack become the slots of the variables, in order.
         Set the current environment to the new environment.
         Push an environment marker onto the stack with the new environment as its environment.
-        Push the elements from the control structure associated with the lambda expression onto the control stack.
+        Push the control structure associated with the lambda expression onto the control stack.
+        A tail call first leaves the call it ends, as in rule 4.
         """
-        self.control.pop()
-        lambda_ = self.stack.pop()
+        stack = self.stack.items
+        lambda_ = stack.pop()
         var_list = lambda_.bounded_variable
         k = lambda_.control_structure
         c = lambda_.env
         
-        new_env = Environment()
-        rand = self.stack.pop()
+        # for avoiding runaway recursion
+        if self.max_depth is not None and len(self.env_stack) > self.max_depth:
+            self._error_handler.handle_error(f"CSE : Depth limit exceeded ({self.max_depth} calls)")
+
+        new_env = Environment(self.env_count, c)
+        self.env_count += 1
+        rand = stack.pop()
+        if gamma.tail:
+            self._leave_call()
         
         if len(var_list) != len(rand.value):
             self._error_handler.handle_error("CSE : Invalid number of arguments")
             
-        for i in range(len(var_list)):
-            if rand.value[i].type == "eta" or rand.value[i].type == "lambda":
-                new_env.add_var(var_list[i],rand.value[i].type,rand.value[i])
-            else:
-                new_env.add_var(var_list[i],rand.value[i].type,rand.value[i].value)
+        new_env.slots = list(rand.value)
         
-        new_env.parent = c
         self.current_enviroment = new_env
-        env_marker = ControlStructureElement("env_marker","env_marker",None,None,new_env)
-        self.stack.push(env_marker)
-        self.control.push(env_marker)
-        
-        for element in self.control_structures[k].elements:
-            self.control.push(element)
+        self.env_stack.append(new_env)
+        env_marker = ControlStructureElement("env_marker","env_marker",None,None,new_env,op=OP_ENV)
+        stack.append(env_marker)
+        self.control.push_call(env_marker, self.control_structures[k].elements)
 
-    @add_table_data_decorator("12")       
-    def CSErule12(self):
+    @table_entry("11")
+    def CSErule11_call(self, call):
         """
-        CSE rule 12: If the top of the control stack is a "tau" node,
-        pop it off the stack and create a new tuple with the next "n" elements
-        on the stack. Push the tuple back onto the stack.
+        CSE rule 11 for calls: If the top of the stack is a lambda of n variables and the call
+        has the n values of a tuple below it, bind them in a new environment as rule 11 binds the
+        items of the tuple, popping them straight off the stack, and enter the body of the lambda.
         """
-        self.control.pop()
-        self.stack.pop()
-        lambda_ = self.stack.pop()
+        stack = self.stack.items
+        lambda_ = stack.pop()
+
+        # for avoiding runaway recursion
+        if self.max_depth is not None and len(self.env_stack) > self.max_depth:
+            self._error_handler.handle_error(f"CSE : Depth limit exceeded ({self.max_depth} calls)")
+
+        new_env = Environment(self.env_count, lambda_.env)
+        self.env_count += 1
+        # the first item is on top, as tau would have popped it first
+        n = call.value
+        new_env.slots = stack[:-n - 1:-1]
+        del stack[-n:]
+        if call.tail:
+            self._leave_call()
+
+        self.current_enviroment = new_env
+        self.env_stack.append(new_env)
+        env_marker = ControlStructureElement("env_marker","env_marker",None,None,new_env,op=OP_ENV)
+        stack.append(env_marker)
+        self.control.push_call(env_marker, self.control_structures[lambda_.control_structure].elements)
+
+    @table_entry("12")       
+    def CSErule12(self, gamma):
+        """
+        CSE rule 12: If the top of the control stack is a gamma and the top of the stack is Y*,
+        pop Y* and the lambda below it off the stack and push the recursive function it defines.
+
+        When the body of the lambda is itself a lambda, as for every `rec f x = ...`, the function
+        is bound directly: a closure of the inner lambda is made in a new environment that binds
+        the name of the function to that same closure, which is what applying the lambda to its
+        own eta would build. Recursive calls are then ordinary applications under rule 4, instead
+        of two applications each under rule 13. Any other body gets an eta built from the lambda.
+        """
+        stack = self.stack.items
+        stack.pop()
+        lambda_ = stack.pop()
         if lambda_.type != "lambda":
             self._error_handler.handle_error("CSE : expected lambda")
+        body = self.control_structures[lambda_.control_structure].elements
+        if len(lambda_.bounded_variable) == 1 and len(body) == 1 and body[0].type == "lambda":
+            inner = body[0]
+            rec_env = Environment(self.env_count, lambda_.env, 1)
+            self.env_count += 1
+            closure = ControlStructureElement("lambda","lambda",inner.bounded_variable,inner.control_structure,rec_env)
+            rec_env.add_var(0, closure)
+            stack.append(closure)
+            return
         eta = ControlStructureElement("eta","eta",lambda_.bounded_variable,lambda_.control_structure,lambda_.env)
-        self.stack.push(eta)
+        stack.append(eta)
         
-    @add_table_data_decorator("13")
-    def CSErule13(self):
+    @table_entry("13")
+    def CSErule13(self, gamma):
         """
-        CSE rule 13: If the top of the control stack is a "tau" node,
-        pop it off the stack and create a new tuple with the next "n" elements
-        on the stack. Push the tuple back onto the stack.
+        CSE rule 13: If the top of the control stack is a gamma and the top of the stack is an eta,
+        push the gamma back followed by a second gamma, and push the lambda of the eta onto the stack,
+        so the lambda is applied to the eta before the result is applied to the argument.
+        Only that second application can be a tail call, so the gamma pushed back keeps its tail mark.
         """
-        self.control.push(ControlStructureElement("gamma","gamma"))
-        eta = self.stack.peek()
-        self.stack.push(ControlStructureElement("lambda","lambda",eta.bounded_variable,eta.control_structure,eta.env))
+        stack = self.stack.items
+        self.control.push_structure([gamma, ControlStructureElement("gamma","gamma",op=OP_GAMMA)])
+        eta = stack[-1]
+        stack.append(ControlStructureElement("lambda","lambda",eta.bounded_variable,eta.control_structure,eta.env))
     
-    def Concpartial(self):
-        rator = self.stack.pop()
-        rand = self.stack.pop()
+    @table_entry("C")
+    def Concpartial(self, gamma):
+        stack = self.stack.items
+        rator = stack.pop()
+        rand = stack.pop()
         if rand.type == "STR":
             result = self._apply_binary(rator.value,rand.value,"Conc")
-            self.stack.push(ControlStructureElement("STR",result))
-            self.remove_gamma()
+            stack.append(Value("STR",result))
         else:
             self._error_handler.handle_error("CSE : Invalid type for concatenation")
 
@@ -496,8 +754,8 @@ class CSEMachine:
     # helper functions
     ##############################################################################################################
     
-    def _var_lookup(self , var_name):
-        return var_lookup(self, var_name)
+    def _var_lookup(self , address):
+        return var_lookup(self, address)
             
     def _apply_binary(self , rator , rand , binop):
         return apply_binary(self, rator, rand, binop)
@@ -505,8 +763,8 @@ class CSEMachine:
     def _apply_unary(self , rator , unop):
         return apply_unary(self, rator, unop)     
 
-    def _add_table_data(self, rule):
-        add_table_data(self, rule)
+    def _add_table_data(self, rule, element=None):
+        add_table_data(self, rule, element)
 
     def _print_cse_table(self):
         self._linearizer.print_control_structures()
@@ -519,8 +777,9 @@ class CSEMachine:
         return raw(self._generate_output()) 
     
     def remove_gamma(self):
-        if self.control.peek().type == "gamma":
-            self.control.pop()    
+        element = self.control.pop()
+        if element.type != "gamma":
+            self.control.push(element)    
     
 
 
@@ -9,6 +9,15 @@
 
 from src.cse_machine.data_structures.control_structure import ControlStructure
 from src.cse_machine.utils.control_structure_element import ControlStructureElement
+from src.cse_machine.utils.opcodes import opcode
+from src.standerizer.node import LABEL, ID, INT, STR
+
+# Identifiers of the inbuilt functions, whose elements are typed by their name
+BUILTIN_FUNCTIONS = frozenset(["Conc", "Print", "Stern", "Stem", "Isstring", "Isinteger", "Istruthvalue",
+                               "Isfunction", "Null", "Istuple", "Order", "ItoS", "not", "neg"])
+
+# Type and value of the element of each constant with a label of its own
+CONSTANTS = {"<true>": ("bool", True), "<false>": ("bool", False), "<nil>": ("nil", None), "<Y*>": ("Y*", "Y*")}
 
 
 class Linearizer:
@@ -39,6 +48,7 @@ class Linearizer:
             list[ControlStructure]: The linearized control structures.
         """
         self.preorder_traversal(st_tree, 0)
+        self.mark_tail_calls()
         
         return self.control_structures
     
@@ -55,76 +65,132 @@ class Linearizer:
             self.control_structures.append(ControlStructure(index))
             
         if not root.children:	
-            self.control_structures[index].push(ControlStructureElement(self.filter(root.data)[0], self.filter(root.data)[1]))
+            self.control_structures[index].push(self.element(*self.token(root)))
             return
         
-        if root.data == "lambda":
+        if root.value == "lambda":
             
-            if root.children[0].data == ",": 
+            if root.children[0].kind == LABEL and root.children[0].value == ",": 
                 var_list = []
                 for child in root.children[0].children:
-                    var_list.append(self.filter(child.data)[1])
-                self.control_structures[index].push(ControlStructureElement("lambda", "lambda", var_list, len(self.control_structures)))
+                    var_list.append(self.token(child)[1])
+                self.control_structures[index].push(self.element("lambda", "lambda", var_list, len(self.control_structures)))
             else:
-                self.control_structures[index].push(ControlStructureElement("lambda", "lambda", [self.filter(root.children[0].data)[1]], len(self.control_structures)))
+                self.control_structures[index].push(self.element("lambda", "lambda", [self.token(root.children[0])[1]], len(self.control_structures)))
             self.preorder_traversal(root.children[1], len(self.control_structures))
             
-        elif root.data == "tau":
-            self.control_structures[index].push(ControlStructureElement("tau", len(root.children)))
+        elif root.value == "tau":
+            self.control_structures[index].push(self.element("tau", len(root.children)))
             for child in root.children:
                 self.preorder_traversal(child, index)
 
-        elif root.data == "->":
-            self.control_structures[index].push(ControlStructureElement("delta", "delta",None, len(self.control_structures)))
+        elif root.value == "gamma" and self.is_label(root.children[1], "tau") and self.is_applied_value(root.children[0]):
+            # a function applied to a tuple written out at the call: the items are left on the
+            # stack and bound from there, instead of being built into a tuple and unpacked
+            tau = root.children[1]
+            self.control_structures[index].push(self.element("call", len(tau.children)))
+            self.preorder_traversal(root.children[0], index)
+            for child in tau.children:
+                self.preorder_traversal(child, index)
+
+        elif root.value == "->":
+            self.control_structures[index].push(self.element("delta", "delta",None, len(self.control_structures)))
             self.preorder_traversal(root.children[1], len(self.control_structures))
-            self.control_structures[index].push(ControlStructureElement("delta", "delta",None, len(self.control_structures)))
+            self.control_structures[index].push(self.element("delta", "delta",None, len(self.control_structures)))
             self.preorder_traversal(root.children[2], len(self.control_structures))
-            self.control_structures[index].push(ControlStructureElement("beta", "beta"))
+            self.control_structures[index].push(self.element("beta", "beta"))
             self.preorder_traversal(root.children[0], index)
         
         else:
-            self.control_structures[index].push(ControlStructureElement(self.filter(root.data)[0], self.filter(root.data)[1]))
+            self.control_structures[index].push(self.element(root.value, root.value))
                 
             self.preorder_traversal(root.children[0], index)
             if len(root.children) > 1:
                 self.preorder_traversal(root.children[1], index)
     
+    def mark_tail_calls(self):
+        """
+        Mark the gammas in tail position, the last thing the body of a lambda does.
+
+        A control structure runs from its last element to its first, so a lambda body ends
+        with its first element. If that is a gamma or call, the call it makes is a tail call. If it
+        is a conditional (delta, delta, beta), the body ends with whichever branch is taken,
+        and the branches are looked at the same way.
+        """
+        tail_structures = [element.control_structure
+                           for structure in self.control_structures
+                           for element in structure.elements if element.type == "lambda"]
+        while tail_structures:
+            elements = self.control_structures[tail_structures.pop()].elements
+            if elements[0].type == "gamma" or elements[0].type == "call":
+                elements[0].tail = True
+            elif len(elements) > 2 and elements[0].type == "delta" and elements[2].type == "beta":
+                tail_structures.append(elements[0].control_structure)
+                tail_structures.append(elements[1].control_structure)
+
     ################################################################################################
     # helper functions
     ################################################################################################
 
-    def filter(self,token):
+    def element(self, type, value, bounded_variable=None, control_structure=None):
         """
-        Filter the input tokens.
+        Create a control structure element tagged with its opcode.
 
         Args:
-            token (str): The input token.
+            type (str): The type of the element.
+            value (any): The value of the element.
+            bounded_variable (list[str], optional): The variables bound by a lambda.
+            control_structure (int, optional): The index of the control structure a lambda or delta refers to.
 
         Returns:
-            list[str]: The filtered tokens.
-        """
-        output = list()
-        if token[0] == "<":
-                if len(token)>3 and token[1:3] == "ID":
-                    if token[4:-1] in ["Conc","Print","Stern","Stem","Isstring","Isinteger","Istruthvalue","Isfunction","Null","Istuple","Order","ItoS","not","neg"	]:
-                        output = [token[4:-1], token[4:-1]]
-                    else:
-                        output = ["ID", token[4:-1]]
-                elif len(token)>4 and token[1:4] == "INT":
-                    output = ["INT", int(token[5:-1])]
-                elif len(token)>4 and token[1:4] == "STR":
-                    output = ["STR", token[6:-2]]
-                elif token[1:-1] == "true":
-                    output = ["bool",True]
-                elif token[1:-1] == "false":
-                    output = ["bool",False]
-                elif token[1:-1] == "nil":
-                    output = ["nil",None]
-                else:
-                    output = [token[1:-1], token[1:-1]]
-        else:
-            output = [token, token]
-        return output
+            ControlStructureElement: The new element.
+        """
+        return ControlStructureElement(type, value, bounded_variable, control_structure, op=opcode(type, value))
+
+    def is_applied_value(self, rator):
+        """
+        Return whether the operator of an application is evaluated onto the stack before it is
+        applied, as a name, a lambda, or an application of one is. An inbuilt function is applied
+        as soon as it is run instead, to the values on top of the stack, so it needs its tuple.
+
+        Args:
+            rator (SyntaxTreeNode): The operator of the application.
+        """
+        while self.is_label(rator, "gamma"):
+            rator = rator.children[0]
+        return self.is_label(rator, "lambda") or self.token(rator)[0] == "ID"
+
+    def is_label(self, node, label):
+        """
+        Return whether a node is the construct or operator with the given label, and not, say,
+        an identifier of the same name.
+        """
+        return node.kind == LABEL and node.value == label
+
+    def token(self, node):
+        """
+        Return the type and value of the element of a leaf, from its kind and value.
+
+        Args:
+            node (Node): The leaf.
+
+        Returns:
+            tuple: The type and the value of the element.
+        """
+        kind = node.kind
+        value = node.value
+        if kind == ID:
+            return (value, value) if value in BUILTIN_FUNCTIONS else ("ID", value)
+        if kind == INT:
+            return "INT", value
+        if kind == STR:
+            return "STR", value
+        constant = CONSTANTS.get(value)
+        if constant is not None:
+            return constant
+        if value[0] == "<":
+            return value[1:-1], value[1:-1]
+        return value, value
     
     ################################################################################################
     # helper functions for debugging purposes (print control structures)
@@ -147,6 +213,8 @@ class Linearizer:
                     print(f"{element.type}[{element.value}]",end=" ")
                 elif element.type == "gamma":
                     print("γ",end=" ")
+                elif element.type == "call":
+                    print(f"γ[{element.value}]",end=" ")
                 else:
                     print(element.value,end=" ")
             print("\n")
@@ -0,0 +1,272 @@
+#cse_machine/utils/compiler.py
+
+# Description
+# This module defines the compiler of the CSE (Compiler, Symbolic, Expression) machine, which builds the
+# control structures of a program straight from its AST, standardizing each node as it is reached instead
+# of rewriting the whole tree first.
+
+# Usage
+# This module can be imported and used to compile the AST (or the ST) of a program to control structures.
+
+
+from src.cse_machine.data_structures.control_structure import ControlStructure
+from src.cse_machine.utils.STlinearizer import Linearizer
+from src.standerizer.node import LABEL
+
+# The steps of the compiler: visit a node, or finish a conditional once its then branch is done
+VISIT, ELSE = range(2)
+
+
+class Compiler(Linearizer):
+    """
+    This class compiles an AST to the control structures of the CSE machine in one pass.
+
+    The standardization rules (let, where, function_form, lambda, within, @, and, rec) are
+    applied to a node when the compiler reaches it, and give its standardized form without
+    changing the tree: a few new nodes for the gammas and lambdas the rule adds, and the
+    original nodes below them. The control structures are then built from that form as the
+    Linearizer builds them from the ST, so compiling the AST gives what linearizing its ST
+    does, with no standardized tree in between. A tree that is already standardized has
+    nothing for the rules to do, so an ST compiles too.
+
+    The nodes are visited from an explicit stack, so a tree of any depth compiles without
+    recursion.
+
+    Usage:
+    >>> compiler = Compiler()
+    >>> control_structures = compiler.compile(ast_obj.root)
+    """
+    def __init__(self):
+        """
+        Initialize the compiler.
+        """
+        super().__init__()
+        self.rules = {
+            "let": self.rule_let,
+            "where": self.rule_where,
+            "function_form": self.rule_definition,
+            "within": self.rule_definition,
+            "and": self.rule_definition,
+            "rec": self.rule_definition,
+            "lambda": self.rule_lambda,
+            "@": self.rule_at,
+        }
+
+    def compile(self, tree):
+        """
+        Compile an AST, or an ST, to control structures.
+
+        Args:
+            tree (Node): The root of the tree.
+
+        Returns:
+            list[ControlStructure]: The control structures.
+        """
+        self.control_structures = [ControlStructure(0)]
+        self.emit(tree)
+        self.mark_tail_calls()
+
+        return self.control_structures
+
+    def emit(self, tree):
+        """
+        Push the elements of a tree onto the control structures, in the order, and into the
+        control structures, that Linearizer.preorder_traversal does for its standardized form.
+
+        Args:
+            tree (Node): The root of the tree, compiled into the first control structure.
+        """
+        structures = self.control_structures
+        element = self.element
+        token = self.token
+        is_label = self.is_label
+        shape = self.shape
+        rules = self.rules
+
+        steps = [(VISIT, tree, 0)]
+        while steps:
+            step, node, index = steps.pop()
+            if type(node) is Part or node.kind == LABEL and node.value in rules:
+                node = shape(node)
+            push = structures[index].push
+
+            if step == ELSE:
+                # the then branch of the conditional is done, so its else branch comes next
+                branch = self.new_structure()
+                push(element("delta", "delta", None, branch))
+                push(element("beta", "beta"))
+                steps.append((VISIT, node.children[0], index))
+                steps.append((VISIT, node.children[2], branch))
+                continue
+
+            children = node.children
+            if not children:
+                push(element(*token(node)))
+                continue
+
+            label = node.value
+            if label == "lambda":
+                variables = shape(children[0])
+                if is_label(variables, ","):
+                    var_list = [token(shape(child))[1] for child in variables.children]
+                else:
+                    var_list = [token(variables)[1]]
+                body = self.new_structure()
+                push(element("lambda", "lambda", var_list, body))
+                steps.append((VISIT, children[1], body))
+
+            elif label == "tau":
+                push(element("tau", len(children)))
+                steps.extend((VISIT, child, index) for child in reversed(children))
+
+            elif label == "->":
+                branch = self.new_structure()
+                push(element("delta", "delta", None, branch))
+                steps.append((ELSE, node, index))
+                steps.append((VISIT, children[1], branch))
+
+            elif label == "gamma" and is_label(shape(children[1]), "tau") and self.is_applied_value(children[0]):
+                # a function applied to a tuple written out at the call: the items are left on the
+                # stack and bound from there, instead of being built into a tuple and unpacked
+                tau = shape(children[1])
+                push(element("call", len(tau.children)))
+                steps.extend((VISIT, child, index) for child in reversed(tau.children))
+                steps.append((VISIT, children[0], index))
+
+            else:
+                push(element(label, label))
+                if len(children) > 1:
+                    steps.append((VISIT, children[1], index))
+                steps.append((VISIT, children[0], index))
+
+    def new_structure(self):
+        """
+        Add an empty control structure and return its index.
+        """
+        index = len(self.control_structures)
+        self.control_structures.append(ControlStructure(index))
+        return index
+
+    def is_applied_value(self, rator):
+        """
+        Return whether the operator of an application is evaluated onto the stack before it is
+        applied, as Linearizer.is_applied_value does, on the standardized form of the operator.
+
+        Args:
+            rator (Node): The operator of the application.
+        """
+        rator = self.shape(rator)
+        while self.is_label(rator, "gamma"):
+            rator = self.shape(rator.children[0])
+        return self.is_label(rator, "lambda") or self.token(rator)[0] == "ID"
+
+    ################################################################################################
+    # standardized forms
+    ################################################################################################
+
+    def shape(self, node):
+        """
+        Return the standardized form of a node: the node itself if no rule applies to it, or
+        else a new node whose children are left for the compiler to standardize in turn.
+
+        Args:
+            node (Node | View | Part): The node.
+        """
+        while type(node) is Part:
+            node = node.resolve()
+        rule = self.rules.get(node.value) if node.kind == LABEL else None
+        return node if rule is None else rule(node)
+
+    def rule_let(self, node):
+        # LET(EQUAL(X,E), P) -> GAMMA(LAMBDA(X,P), E)
+        definition, P = node.children
+        return View("gamma", [View("lambda", [Part(X, definition), P]), Part(E, definition)])
+
+    def rule_where(self, node):
+        # WHERE(P, EQUAL(X,E)) -> GAMMA(LAMBDA(X,P), E)
+        P, definition = node.children
+        return View("gamma", [View("lambda", [Part(X, definition), P]), Part(E, definition)])
+
+    def rule_definition(self, node):
+        # FCN_FORM, WITHIN, AND and REC all stand for EQUAL(X,E)
+        return View("=", [Part(X, node), Part(E, node)])
+
+    def rule_lambda(self, node):
+        # LAMBDA(V++,E) -> LAMBDA(V,LAMBDA(...))
+        if len(node.children) <= 2:
+            return node
+        return View("lambda", [node.children[0], nest_lambdas(node.children[1:])])
+
+    def rule_at(self, node):
+        # @(E1,N,E2) -> GAMMA(GAMMA(N,E1),E2)
+        E1, N, E2 = node.children
+        return View("gamma", [View("gamma", [N, E1]), E2])
+
+
+class View:
+    """
+    A node added by a standardization rule, with the interface the compiler reads of a Node.
+    Every such node is a construct, so its kind is LABEL and its value is its label.
+    """
+    __slots__ = ("value", "children")
+
+    kind = LABEL
+
+    def __init__(self, value, children):
+        self.value = value
+        self.children = children
+
+
+# The two halves of a definition EQUAL(X,E)
+X, E = range(2)
+
+
+class Part:
+    """
+    The bound name (X) or the value (E) of a definition, standardized to EQUAL(X,E):
+
+        EQUAL(X,E)                         X, E
+        FCN_FORM(P,V+,E)                   P, LAMBDA(V,...LAMBDA(V,E))
+        WITHIN(EQUAL(X1,E1),EQUAL(X2,E2))  X2, GAMMA(LAMBDA(X1,E2),E1)
+        AND(EQUAL(X,E)++)                  COMMA(X++), TAU(E++)
+        REC(EQUAL(X,E))                    X, GAMMA(<Y*>,LAMBDA(X,E))
+
+    Each part is worked out one definition at a time when the compiler reaches it, so a
+    chain of definitions, such as a long within, is not followed by recursion.
+    """
+    __slots__ = ("half", "definition")
+
+    def __init__(self, half, definition):
+        self.half = half
+        self.definition = definition
+
+    def resolve(self):
+        """
+        Return the part one step closer to a node: a node, a View, or the part of a nested definition.
+        """
+        half, definition = self.half, self.definition
+        children = definition.children
+        label = definition.value
+        if label == "function_form":
+            return children[0] if half == X else nest_lambdas(children[1:])
+        if label == "within":
+            if half == X:
+                return Part(X, children[1])
+            return View("gamma", [View("lambda", [Part(X, children[0]), Part(E, children[1])]), Part(E, children[0])])
+        if label == "and":
+            return View("," if half == X else "tau", [Part(half, child) for child in children])
+        if label == "rec":
+            if half == X:
+                return Part(X, children[0])
+            return View("gamma", [View("<Y*>", []), View("lambda", [Part(X, children[0]), Part(E, children[0])])])
+        return children[half]
+
+
+def nest_lambdas(nodes):
+    """
+    Return LAMBDA(V1,LAMBDA(V2,...LAMBDA(Vn,E))) for the nodes V1, ..., Vn, E.
+    """
+    body = nodes[-1]
+    for V in reversed(nodes[:-1]):
+        body = View("lambda", [V, body])
+    return body
@@ -1,8 +1,11 @@
 class ControlStructureElement:
-    def __init__(self, type, value, bounded_variable=None,control_structure=None, env=None , operator=None):
+    def __init__(self, type, value, bounded_variable=None,control_structure=None, env=None , operator=None, op=None, address=None, tail=False):
         self.type = type
         self.value = value
         self.bounded_variable = bounded_variable
         self.control_structure = control_structure
         self.env = env
         self.operator = operator
+        self.op = op
+        self.address = address
+        self.tail = tail
@@ -0,0 +1,257 @@
+#cse_machine/utils/folder.py
+
+# Description
+# This module defines the constant folder of the CSE (Compiler, Symbolic, Expression) machine, an
+# optimization pass over the AST (or the ST) that works out, before the program is compiled, the
+# operations and inbuilt function applications whose operands are all literals.
+
+# Usage
+# This module can be imported and used to fold the constant expressions of a tree before it is compiled.
+
+
+from src.cse_machine.apply_operations.apply_binary_operations import apply_binary, INT_BINARY_OPERATIONS, BOOL_BINARY_OPERATIONS
+from src.cse_machine.apply_operations.apply_unary_operations import apply_unary, INT_UNARY_OPERATIONS, BOOL_UNARY_OPERATIONS
+from src.cse_machine.error_handler import ErrorHandler
+from src.cse_machine.utils.value import Value, NIL, int_value, bool_value
+from src.standerizer.node import LABEL, ID, INT, STR, Node
+
+# Operators folded when both of their operands are literals; aug builds a tuple, which has no literal
+BINARY_OPERATORS = frozenset(["or", "&", "+", "-", "*", "/", "**", "gr", "ge", "ls", "le", "eq", "ne"])
+
+# Operators folded when their operand is a literal
+UNARY_OPERATORS = frozenset(["neg", "not"])
+
+# Inbuilt functions folded when applied to a literal; Print is left alone, as printing is what it is for
+UNARY_FUNCTIONS = frozenset(["Order", "ItoS", "Stem", "Stern", "Isstring", "Isinteger", "Istruthvalue",
+                             "Isfunction", "Null", "Istuple"])
+
+# Labels of the nodes that can fold
+FOLDABLE = BINARY_OPERATORS | UNARY_OPERATORS | frozenset(["gamma", "@", "->"])
+
+# Constructs that bind names: all but the last child of a lambda or function_form, and the
+# first child of an =, each an identifier, a comma of identifiers or ()
+BINDERS = frozenset(["lambda", "function_form", "="])
+
+# Most bits the result of a folded ** may have, so a huge power in a branch the program never
+# takes does not hold up compiling it
+MAX_POWER_BITS = 4096
+
+# Values of the literals with a label of their own. true and false are read by the machine only as
+# the <true> and <false> the folder itself writes, so they are the only truth values folded
+LITERALS = {"<true>": bool_value(True), "<false>": bool_value(False), "<nil>": NIL}
+
+
+class ConstantFolder:
+    """
+    This class folds the constant expressions of an AST, or of an ST, in place.
+
+    An operator whose operands are literals (integers, strings, truth values and nil), an
+    inbuilt function (Conc, ItoS, Order, ...) applied to literals, and a conditional whose
+    condition is a literal truth value are replaced by their result, so the CSE machine does
+    not work them out again every time it runs them. The result is worked out by the functions
+    the machine applies, so it is the one the machine would get; an operation the machine would
+    fail on, such as 1 / 0 or Stem '', is left in the tree to fail when it is run.
+    A folded conditional takes the control structures of its branches with it, so the number
+    Print shows for a closure compiled after it may be lower than at -O0.
+
+    The operators, applications and conditionals it folds are the same nodes in the AST as in
+    the ST, and an infix application 'a' @Conc 'b' folds as the GAMMA(GAMMA(Conc,'a'),'b') it
+    is standardized to, so the AST can be folded and handed to the Compiler as it is, without
+    a standardized tree being built. An inbuilt function that the program binds anywhere, in
+    a definition or as a variable of a lambda, is not folded at all, since a name of that
+    function may then stand for something else.
+
+    The nodes are visited in post-order from a worklist, as the Standardizer visits them, so
+    an expression of literals folds all the way up and a tree of any depth is folded without
+    recursion. The number of nodes replaced is counted in folds.
+
+    Usage:
+    >>> folder = ConstantFolder()
+    >>> folder.fold(ast_obj.root)
+    >>> control_structures = Compiler().compile(ast_obj.root)
+    """
+    def __init__(self):
+        """
+        Initialize the constant folder.
+        """
+        # The operations report an invalid operand through the error handler of the machine they
+        # are applied for, which raises; the folder catches that and leaves the operation alone
+        self._error_handler = ErrorHandler()
+        self.folds = 0
+
+    def fold(self, root):
+        """
+        Fold the constant expressions of a tree, an AST or an ST.
+
+        Args:
+            root (Node): The root of the tree.
+        """
+        # Every node that can fold, each before the ones below it, and the inbuilt functions the
+        # program binds
+        nodes = []
+        bound = set()
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            children = node.children
+            if not children:
+                continue
+            if node.kind == LABEL:
+                label = node.value
+                if label in FOLDABLE:
+                    nodes.append(node)
+                elif label in BINDERS:
+                    for variable in (children[:1] if label == "=" else children[:-1]):
+                        bound.add(variable.value)
+                        bound.update(child.value for child in variable.children)
+            stack.extend(children)
+        self.functions = UNARY_FUNCTIONS.difference(bound)
+        self.conc = "Conc" not in bound
+
+        # Every node comes after the nodes below it, so they are folded first
+        fold_node = self.fold_node
+        for node in reversed(nodes):
+            # the argument of a gamma, and the first operand of anything else, must be a literal
+            operand = node.children[1] if node.value == "gamma" else node.children[0]
+            if operand.children or operand.kind == ID:
+                continue
+            result = fold_node(node)
+            if result is not None:
+                node.kind, node.value, node.children = result.kind, result.value, result.children
+                self.folds += 1
+
+    def fold_node(self, node):
+        """
+        Return the node that an operator, application or conditional folds to, or None if it
+        does not fold.
+
+        Args:
+            node (Node): The node, whose children are folded.
+        """
+        label = node.value
+        children = node.children
+        if label in BINARY_OPERATORS:
+            rator, rand = literal(children[0]), literal(children[1])
+            if rator is None or rand is None:
+                return None
+            return self.result(self.binary(label, rator, rand))
+
+        if label in UNARY_OPERATORS:
+            rand = literal(children[0])
+            return None if rand is None else self.result(self.unary(label, rand))
+
+        if label == "gamma":
+            rator, rand = children
+            if rator.kind == ID and rator.value in self.functions:
+                rand = literal(rand)
+                return None if rand is None else self.result(self.unary(rator.value, rand))
+            # Conc 'a' 'b' is GAMMA(GAMMA(Conc,'a'),'b')
+            if rator.kind == LABEL and rator.value == "gamma":
+                return self.concatenation(*rator.children, rand)
+            return None
+
+        if label == "@":
+            # 'a' @Conc 'b' is @('a',Conc,'b') in the AST
+            first, function, second = children
+            return self.concatenation(function, first, second)
+
+        if label == "->":
+            condition = literal(children[0])
+            if condition is None or condition.type != "bool":
+                return None
+            return children[1] if condition.value else children[2]
+
+        return None
+
+    def concatenation(self, function, first, second):
+        """
+        Return the string leaf of Conc applied to two strings, or None if the application is
+        not one of the inbuilt Conc to two string literals.
+        """
+        if self.conc and function.kind == ID and function.value == "Conc" and first.kind == STR and second.kind == STR:
+            return Node(STR, first.value + second.value, [], True)
+        return None
+
+    def binary(self, operator, rator, rand):
+        """
+        Return the value of a binary operation on two values, as CSE rule 6 works it out, or
+        None if the machine would fail on it.
+        """
+        if rator.type == "INT" and rand.type == "INT":
+            fast_path = INT_BINARY_OPERATIONS.get(operator)
+        elif rator.type == "bool" and rand.type == "bool":
+            fast_path = BOOL_BINARY_OPERATIONS.get(operator)
+        else:
+            fast_path = None
+        if operator == "**" and not self.small_power(rator.value, rand.value):
+            return None
+        try:
+            if fast_path is not None:
+                function, make = fast_path
+                return make(function(rator.value, rand.value))
+            result = apply_binary(self, rator.value, rand.value, operator)
+        except Exception:
+            # the operands are not valid for the operator: left for the machine to report
+            return None
+        return bool_value(result) if type(result) == bool else int_value(result)
+
+    def unary(self, operator, rand):
+        """
+        Return the value of a unary operation or inbuilt function on a value, as CSE rule 7
+        works it out, or None if the machine would fail on it.
+        """
+        if rand.type == "INT":
+            fast_path = INT_UNARY_OPERATIONS.get(operator)
+        elif rand.type == "bool":
+            fast_path = BOOL_UNARY_OPERATIONS.get(operator)
+        else:
+            fast_path = None
+        try:
+            if fast_path is not None:
+                function, make = fast_path
+                return make(function(rand.value))
+            result = apply_unary(self, rand, operator)
+        except Exception:
+            # the operand is not valid for the operator: left for the machine to report
+            return None
+        if type(result) == bool:
+            return bool_value(result)
+        if type(result) == str:
+            return Value("STR", result)
+        return int_value(result)
+
+    def small_power(self, base, exponent):
+        """
+        Return whether base ** exponent is an integer of at most MAX_POWER_BITS bits.
+        """
+        if type(base) not in (int, bool) or type(exponent) not in (int, bool) or exponent < 0:
+            return False
+        return abs(base) <= 1 or abs(base).bit_length() * exponent <= MAX_POWER_BITS
+
+    def result(self, value):
+        """
+        Return the leaf of the value of a folded operation, or None if there is none.
+        """
+        if value is None:
+            return None
+        if value.type == "bool":
+            return Node(LABEL, "<true>" if value.value else "<false>", [], True)
+        if value.type == "STR":
+            return Node(STR, value.value, [], True)
+        # ** gives a float for a negative exponent, which is left to the machine
+        if value.type == "INT" and type(value.value) is int:
+            return Node(INT, value.value, [], True)
+        return None
+
+
+def literal(node):
+    """
+    Return the value of a leaf that is a literal, or None if the node is not one.
+    """
+    if node.kind == INT:
+        return int_value(node.value)
+    if node.kind == STR:
+        return Value("STR", node.value)
+    if node.kind == LABEL and not node.children:
+        return LITERALS.get(node.value)
+    return None
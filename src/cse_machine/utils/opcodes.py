@@ -0,0 +1,86 @@
+# cse_machine/utils/opcodes.py
+
+# Description
+# This module defines the opcodes of control structure elements for the CSE (Compiler, Symbolic, Expression) machine.
+# Every element gets its opcode once, when the Linearizer builds the control structures, so the machine
+# can jump straight to the rule that handles it instead of re-testing the element's type on every step.
+
+# Usage
+# The Linearizer tags elements with opcode(type, value); CSEMachine indexes its rule table with element.op.
+
+# Opcodes of control structure elements
+OP_CONSTANT = 0   # STR, INT, bool, tuple, Y*, nil, dummy : pushed onto the stack as they are (rule 1)
+OP_NAME     = 1   # ID : looked up in the current environment (rule 1)
+OP_LAMBDA   = 2   # lambda : closed over the current environment (rule 2)
+OP_ENV      = 3   # env_marker : leaves an environment (rule 5)
+OP_BINARY   = 4   # binary operators and Conc (rule 6)
+OP_UNARY    = 5   # unary operators and inbuilt functions (rule 7)
+OP_BETA     = 6   # beta : selects a branch of a conditional (rule 8)
+OP_TAU      = 7   # tau : builds a tuple (rule 9)
+OP_GAMMA    = 8   # gamma : applies the top of the stack (rules 4, 10-13)
+OP_INVALID  = 9   # anything else, e.g. a stray delta
+OP_CALL     = 10  # call : applies the top of the stack to the n values below it (rule 11)
+
+OPCODE_COUNT = 11
+
+# Element types that are pushed onto the stack unchanged
+CONSTANT_TYPES = {'STR','INT','bool','tuple','Y*','nil','dummy'}
+
+# binary operators supported by RPAL and inbuilt functions(Conc)
+BINARY_OPERATORS = {
+                    # Arithmetic operators
+                    "+", "-", "/", "*", "**", 
+                    # Operators for comparison and logical operations
+                    "eq", "ne", "gr", "ge", "le","ls",
+                    # Relational operators 
+                    ">", "<", ">=", "<=", 
+                    # Logical operators 
+                    "or", "&", "aug",  
+                    # Operators for string concatenation (RPAL inbuilt function)
+                    "Conc"
+                    }
+
+# unary operators supported by RPAL and inbuilt functions
+UNARY_OPERATORS = {
+                    # Unary operators
+                    "neg", "not",
+                    # print inbuilt functions
+                    "Print", 
+                    # type checking inbuilt functions
+                    "Isstring", "Isinteger", "Istruthvalue", "Isfunction", "Null","Istuple",
+                    # String manipulation inbuilt functions
+                    "Order", "Stern", "Stem", "ItoS", "$ConcPartial"
+                    }
+
+def opcode(type, value):
+    """
+    Get the opcode of a control structure element.
+
+    Args:
+        type (str): The type of the element.
+        value (any): The value of the element.
+
+    Returns:
+        int: The opcode the CSE machine dispatches on.
+    """
+    if type == "ID":
+        return OP_NAME
+    elif type in CONSTANT_TYPES:
+        return OP_CONSTANT
+    elif type == "lambda":
+        return OP_LAMBDA
+    elif type == "env_marker":
+        return OP_ENV
+    elif type == "beta":
+        return OP_BETA
+    elif type == "tau":
+        return OP_TAU
+    elif type == "gamma":
+        return OP_GAMMA
+    elif type == "call":
+        return OP_CALL
+    elif value in BINARY_OPERATORS:
+        return OP_BINARY
+    elif value in UNARY_OPERATORS:
+        return OP_UNARY
+    return OP_INVALID
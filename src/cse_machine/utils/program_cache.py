@@ -0,0 +1,200 @@
+#cse_machine/utils/program_cache.py
+
+# Description
+# This module defines the compiled program cache of the CSE (Compiler, Symbolic, Expression) machine.
+# A program is compiled once to its resolved control structures, which are saved to a .rpalc file
+# keyed by the source code, so later runs of the same program skip the lexer, parser, standardizer,
+# linearizer and resolver.
+
+# Usage
+# This module can be imported and used to load and store the compiled control structures of a program.
+
+import hashlib
+import marshal
+import os
+import sys
+
+from src.cse_machine.data_structures.control_structure import ControlStructure
+from src.cse_machine.utils.control_structure_element import ControlStructureElement
+
+# Bump whenever the control structures built for a program change, so older .rpalc files are not used
+INTERPRETER_VERSION = "2"
+
+# Layout of a .rpalc file: MAGIC, one byte of FORMAT_VERSION, then the marshalled control structures
+MAGIC = b"RPALC"
+FORMAT_VERSION = 1
+SUFFIX = ".rpalc"
+
+DEFAULT_MAX_BYTES = 16 * 1024 * 1024
+
+
+def default_cache_dir():
+    """
+    Return the cache directory: $RPAL_CACHE_DIR, or rpal under the user's cache directory.
+    """
+    directory = os.environ.get("RPAL_CACHE_DIR")
+    if directory:
+        return directory
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "rpal")
+
+
+class ProgramCache:
+    """
+    This class keeps the compiled control structures of programs in a directory of .rpalc files.
+
+    A file is named after the SHA-256 of the source code, the interpreter version, the
+    optimization level the program is compiled at and the Python version (marshal data is
+    only read back by the version that wrote it). Every hit
+    touches its file, and once the files of the directory add up to more than max_bytes the
+    least recently used ones are removed. The cache only ever speeds a run up: a file that is
+    missing, stale or unreadable is a miss, and a directory that cannot be written is skipped.
+
+    Usage:
+    >>> cache = ProgramCache(optimize=cse_machine.optimize)
+    >>> control_structures = cache.load(source_code)
+    >>> if control_structures is None:
+    ...     control_structures = cse_machine.compile(st_tree)
+    ...     cache.store(source_code, control_structures)
+    >>> cse_machine.run(control_structures)
+    """
+    def __init__(self, directory=None, max_bytes=DEFAULT_MAX_BYTES, optimize=0):
+        """
+        Initialize the cache.
+
+        Args:
+            directory (str, optional): The cache directory. Defaults to default_cache_dir().
+            max_bytes (int, optional): The most the .rpalc files of the directory may add up to.
+            optimize (int, optional): The optimization level the programs are compiled at.
+        """
+        self.directory = directory or default_cache_dir()
+        self.max_bytes = max_bytes
+        self.optimize = optimize
+
+    def path(self, source_code):
+        """
+        Return the path of the .rpalc file of a program.
+
+        Args:
+            source_code (str): The source code of the program.
+        """
+        digest = hashlib.sha256()
+        digest.update(f"{INTERPRETER_VERSION}/O{self.optimize}/{sys.implementation.cache_tag}\0".encode())
+        digest.update(source_code.encode())
+        return os.path.join(self.directory, digest.hexdigest() + SUFFIX)
+
+    def load(self, source_code):
+        """
+        Return the cached control structures of a program, or None if it is not cached.
+
+        Args:
+            source_code (str): The source code of the program.
+        """
+        path = self.path(source_code)
+        try:
+            with open(path, "rb") as file:
+                data = file.read()
+        except OSError:
+            return None
+        try:
+            control_structures = loads(data)
+        except (ValueError, EOFError, TypeError, IndexError):
+            # written by another format, or cut short: drop it and compile again
+            self._remove(path)
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return control_structures
+
+    def store(self, source_code, control_structures):
+        """
+        Save the compiled control structures of a program, then evict the least recently used files.
+
+        Args:
+            source_code (str): The source code of the program.
+            control_structures (list[ControlStructure]): The resolved control structures.
+        """
+        path = self.path(source_code)
+        temporary = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(temporary, "wb") as file:
+                file.write(dumps(control_structures))
+            # a reader sees the old file or the whole new one, never half of it
+            os.replace(temporary, path)
+        except OSError:
+            self._remove(temporary)
+            return
+        self.evict()
+
+    def evict(self):
+        """
+        Remove the least recently used .rpalc files until the rest fit in max_bytes.
+        """
+        files = []
+        try:
+            with os.scandir(self.directory) as entries:
+                for entry in entries:
+                    if entry.name.endswith(SUFFIX):
+                        stat = entry.stat()
+                        files.append((stat.st_mtime, stat.st_size, entry.path))
+        except OSError:
+            return
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+####################################################################################################
+# serialization of control structures
+####################################################################################################
+
+def dumps(control_structures):
+    """
+    Serialize resolved control structures to the bytes of a .rpalc file.
+
+    Only what the linearizer and resolver set is kept: every element is saved as
+    (type, value, bounded_variable, control_structure, op, address, tail).
+
+    Args:
+        control_structures (list[ControlStructure]): The control structures to serialize.
+    """
+    payload = [[(element.type, element.value, element.bounded_variable, element.control_structure,
+                 element.op, element.address, element.tail)
+                for element in structure.elements]
+               for structure in control_structures]
+    return MAGIC + bytes([FORMAT_VERSION]) + marshal.dumps(payload)
+
+
+def loads(data):
+    """
+    Rebuild the control structures saved by dumps.
+
+    Args:
+        data (bytes): The bytes of a .rpalc file.
+
+    Raises:
+        ValueError: If the data is not a .rpalc file of this format.
+    """
+    header = len(MAGIC) + 1
+    if data[:len(MAGIC)] != MAGIC or data[len(MAGIC):header] != bytes([FORMAT_VERSION]):
+        raise ValueError("not a compiled RPAL program of this version")
+    control_structures = []
+    for index, elements in enumerate(marshal.loads(data[header:])):
+        structure = ControlStructure(index)
+        structure.elements.extend(
+            ControlStructureElement(type, value, bounded_variable, control_structure, op=op, address=address, tail=tail)
+            for type, value, bounded_variable, control_structure, op, address, tail in elements)
+        control_structures.append(structure)
+    return control_structures
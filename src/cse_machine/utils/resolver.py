@@ -0,0 +1,90 @@
+#cse_machine/utils/resolver.py
+
+# Description
+# This module defines a resolver class for the CSE (Compiler, Symbolic, Expression) machine.
+# The resolver gives every name in the control structures a lexical address before execution.
+
+# Usage
+# This module can be imported and used to resolve the control structures built by the linearizer.
+
+
+from src.cse_machine.error_handler import ErrorHandler
+
+
+class Resolver:
+    """
+    This class resolves the names of the control structures to lexical addresses.
+
+    Every lambda body runs in a new environment holding one slot per bounded variable,
+    whose parent is the environment the lambda was closed in; the branches of a
+    conditional run in the environment of the structure they appear in. So the environment
+    a name is bound in is known from the control structures alone, and each ID element is
+    tagged with its address: the number of parents to follow from the current environment
+    (depth) and the index of the variable in that environment (slot).
+
+    Usage:
+    >>> linearizer = Linearizer()
+    >>> control_structures = linearizer.linearize(st_tree)
+    >>> Resolver().resolve(control_structures)
+    """
+    def __init__(self):
+        """
+        Initialize the resolver.
+        """
+        self._error_handler = ErrorHandler()
+
+    def resolve(self, control_structures):
+        """
+        Tag every ID element of the control structures with its (depth, slot) address.
+
+        Args:
+            control_structures (list[ControlStructure]): The linearized control structures.
+
+        Raises:
+            Exception: If a name is not bound by any enclosing lambda.
+        """
+        # the program runs in the primitive environment, which binds no names
+        pending = [(0, None)]
+        while pending:
+            index, scope = pending.pop()
+            for element in control_structures[index].elements:
+                if element.type == "ID":
+                    element.address = self.lookup(scope, element.value)
+                elif element.type == "lambda":
+                    pending.append((element.control_structure, self.new_scope(element.bounded_variable, scope)))
+                elif element.type == "delta":
+                    pending.append((element.control_structure, scope))
+
+    def new_scope(self, variables, parent):
+        """
+        Create the scope of a lambda body.
+
+        Args:
+            variables (list[str]): The bounded variables of the lambda, in slot order.
+            parent (tuple): The scope the lambda is closed in, or None for the primitive environment.
+
+        Returns:
+            tuple: The slots of the variables by name, and the parent scope.
+        """
+        # a name bound twice refers to its last slot, as when it was added to a dict
+        return ({name: slot for slot, name in enumerate(variables)}, parent)
+
+    def lookup(self, scope, name):
+        """
+        Find the address of a name from a scope.
+
+        Args:
+            scope (tuple): The scope the name is used in.
+            name (str): The name to resolve.
+
+        Returns:
+            tuple[int, int]: The depth and slot of the variable.
+        """
+        depth = 0
+        while scope is not None:
+            slots, parent = scope
+            if name in slots:
+                return depth, slots[name]
+            scope = parent
+            depth += 1
+        self._error_handler.handle_error(f"CSE : Variable [{name}] not found in the environment")
@@ -1,57 +1,38 @@
+from src.cse_machine.data_structures.persistent_tuple import PersistentTuple
+
 ####################################################################################################
 # cse machine helpers functions
 ####################################################################################################
-def var_lookup(cse_machine , var_name):
+def var_lookup(cse_machine , address):
     """
-    Searches the current environment for a variable with the given name.
+    Looks up the variable at the given address from the current environment.
 
     Args:
         cse_machine (CSE_Machine): The CSE machine that is currently running.
-        var_name (str): The name of the variable to search for.
+        address (tuple[int, int]): The (depth, slot) address the resolver gave the name.
 
     Returns:
-        Any: The value of the variable, or None if the variable was not found.
-
-    Raises:
-        CSEError: If the variable was not found and no default value was provided.
+        Value | ControlStructureElement: The value of the variable.
     """
-    env_pointer = cse_machine.current_enviroment
-    while env_pointer:
-        if var_name in env_pointer._environment:
-            out = env_pointer._environment[var_name]
-            return out
-        env_pointer = env_pointer.parent
-    else:
-        cse_machine._error_handler.handle_error(f"CSE : Variable [{var_name}] not found in the environment")
+    depth, slot = address
+    return cse_machine.current_enviroment.lookup(depth, slot)
 
 ####################################################################################################
 # Printer helper functions
 ################################################################################################
     
 def convert_list(element,out):
-    """Convert a list to a string.
+    """Convert a tuple to a string.
 
     Args:
-        element (list): The list to convert.
-        out (str): The string to append the converted list to.
+        element (PersistentTuple): The tuple to convert.
+        out (str): The string to append the converted tuple to.
 
     Returns:
-        str: The string with the converted list appended to it.
+        str: The string with the converted tuple appended to it.
     """
-    if isinstance(element, list):
-        out += "("
-        for el in element:
-            out = convert_list(el,out)
-        out = out[:-1] +  ")"
-    else:
-        if isinstance(element.value, list):
-            out += "("
-            for el in element.value:
-                out = convert_list(el,out)
-            out = out[:-1] +  "),"
-        else:
-            out += str(element.value) + ","
-    return out
+    items = [convert_list(el.value, "") if isinstance(el.value, PersistentTuple) else str(el.value) for el in element]
+    return out + "(" + ",".join(items) + ")"
 
 def raw(string):
     return string.encode('unicode_escape').decode()
@@ -60,25 +41,34 @@ def raw(string):
 # cse table functions
 ################################################################################################
 
-import functools
-
-def add_table_data(cse_machine,rule):
+def add_table_data(cse_machine,rule,element=None):
     """Add the given rule to the CSE table.
 
+    The control and stack are snapshotted as tuples, so this is only called
+    while the machine is tracing. Old rows fall off the front of the table
+    once the machine's trace limit is reached.
+
     Args:
         cse_machine (CSE_Machine): The CSE machine that is currently running.
         rule (Rule): The rule to add to the table.
+        element (ControlStructureElement, optional): The element the rule was popped for,
+            shown on top of the control.
     """
     table_data = cse_machine.table_data
-    table_data.append((rule,cse_machine.control.whole_stack()[:],cse_machine.stack.whole_stack()[:],[cse_machine.current_enviroment.index][:]))
+    control = cse_machine.control.whole_stack()
+    if element is not None:
+        control.append(element)
+    table_data.append((rule,tuple(control),tuple(cse_machine.stack.whole_stack()),cse_machine.current_enviroment.index))
+
+def table_entry(entry):
+    """Tag a CSE rule with the label it gets in the CSE table.
 
-def add_table_data_decorator(table_entry):
+    Args:
+        entry (str): The rule label shown in the RULE column.
+    """
     def decorator(func):
-        @functools.wraps(func)
-        def wrapper(self, *args, **kwargs):
-            self._add_table_data(table_entry)
-            return func(self, *args, **kwargs)
-        return wrapper
+        func.table_entry = entry
+        return func
     return decorator
 
 def print_cse_table(cse_machine):
@@ -93,13 +83,15 @@ def print_cse_table(cse_machine):
     stack_width = 60
     total_width = control_width + stack_width + 16
     print("\nCSE TABLE")
+    if table_data.maxlen is not None:
+        print(f"\n(last {len(table_data)} steps)")
     print("\nRULE | CONTROL" +  " " * (control_width-6) + "|"+" "*(stack_width-5)+" STACK " + "| ENV")
     print("-" * total_width)
     for data in table_data:
         rule = f"{data[0]:<2} |"
         control = " ".join(str(element_val(element)) for element in data[1])
         stack = " ".join(str(element_val(element)) for element in data[2][::-1])
-        env = f" {data[-1][0]}"
+        env = f" {data[3]}"
         l = len(control)
         control_str = f"{control[max(0, l - control_width):]:<{control_width}}"
         stack_str = f"{stack[:stack_width]:>{stack_width}}"
@@ -138,5 +130,7 @@ def element_val(element):
         return f"η_{element.control_structure}[{element.bounded_variable}]"
     elif element.type == "tau":
         return f"tau[{element.value}]"
+    elif element.type == "call":
+        return f"γ[{element.value}]"
     else:
         return element.value 
\ No newline at end of file
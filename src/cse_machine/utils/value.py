@@ -0,0 +1,81 @@
+# Description
+# This module defines the primitive values of the CSE (Compiler, Symbolic, Expression) machine.
+
+# Usage
+# The CSE machine pushes integers, strings, truth values, nil and dummy onto its stack as Values,
+# made with the helpers below so the common ones are shared instead of allocated on every step.
+
+class Value:
+    """
+    A primitive value on the stack of the CSE machine: an integer, string, truth value, nil or dummy.
+
+    Values have the type and value of a ControlStructureElement and nothing else, so they are
+    small and cheap to create. They are never changed once made, which lets the machine share
+    one object for every occurrence of a truth value and of a small integer. Closures, etas,
+    tuples and env markers stay ControlStructureElements.
+
+    Attributes:
+        type (str): The type of the value ("INT", "STR", "bool", "nil" or "dummy").
+        value (any): The value itself.
+    """
+
+    __slots__ = ("type", "value")
+
+    def __init__(self, type, value):
+        self.type = type
+        self.value = value
+
+    def __repr__(self):
+        return f"Value({self.type!r}, {self.value!r})"
+
+
+# Integers in [SMALL_INT_MIN, SMALL_INT_MAX) are made once and shared
+SMALL_INT_MIN = -256
+SMALL_INT_MAX = 1024
+
+SMALL_INTS = [Value("INT", n) for n in range(SMALL_INT_MIN, SMALL_INT_MAX)]
+TRUE = Value("bool", True)
+FALSE = Value("bool", False)
+NIL = Value("nil", None)
+DUMMY = Value("dummy", "dummy")
+
+
+def int_value(n):
+    """
+    Return the value of an integer result, shared for small integers.
+    """
+    # ** gives a float for a negative exponent, which is never shared
+    if SMALL_INT_MIN <= n < SMALL_INT_MAX and n.__class__ is int:
+        return SMALL_INTS[n - SMALL_INT_MIN]
+    return Value("INT", n)
+
+
+def bool_value(b):
+    """
+    Return the value of a truth value result, one of the two shared ones.
+    """
+    return TRUE if b else FALSE
+
+
+def str_value(s):
+    """
+    Return the value of a string result.
+    """
+    return Value("STR", s)
+
+
+def make_value(type, value):
+    """
+    Return the value of a result of the given type, shared where it can be.
+
+    Args:
+        type (str): The type of the result.
+        value (any): The result.
+    """
+    if type == "INT":
+        return int_value(value)
+    if type == "bool":
+        return bool_value(value)
+    if type == "nil":
+        return NIL
+    return Value(type, value)
@@ -5,7 +5,10 @@ like keywords, identifiers, literals, operators, and punctuation.
 """
 
 import re
+import sys
+from array import array
 from enum import Enum
+from functools import partial
 
 
 # === Token Types ===
@@ -42,22 +45,92 @@ token_specification = [
     ('WHITESPACE',   r'[ \t]+'),                    # Spaces and tabs
     ('COMMENT',      r'//.*'),                      # Single-line comments
     ('NEWLINE',      r'\n'),                        # Line breaks
-    ('KEYWORD',      r'\b(let|in|where|fn|rec|aug|or|not|gr|ge|ls|le|eq|ne|true|false|nil|dummy|within|and|isstring|isint|istuple|isfunction|isdummy|istruthvalue|order|null)\b'),  # RPAL keywords
-    ('IDENTIFIER',   r'[A-Za-z_][A-Za-z0-9_]*'),    # Variable/function names
+    ('IDENTIFIER',   r'[A-Za-z_][A-Za-z0-9_]*'),    # Variable/function names, and keywords
     ('INTEGER',      r'\d+'),                       # Whole numbers
-    ('STRING',       r"'([^'\\]|\\[tn\\']|'''')*'"), # String literals with escape sequences
+    ('STRING',       r"'(?:[^'\\]|\\[tn\\']|'''')*'"), # String literals with escape sequences
     ('OPERATOR',     r'[+\-*/<>&.@/:=~|$!#%^_\[\]{}"‘?\';]+'),  # Operators and special characters
     ('PUNCTUATION',  r'[(),;]'),                    # Delimiters
 ]
 
+# RPAL keywords, told apart from identifiers once an identifier is matched
+KEYWORDS = frozenset({
+    'let', 'in', 'where', 'fn', 'rec', 'aug', 'or', 'not', 'gr', 'ge', 'ls', 'le', 'eq', 'ne',
+    'true', 'false', 'nil', 'dummy', 'within', 'and', 'isstring', 'isint', 'istuple',
+    'isfunction', 'isdummy', 'istruthvalue', 'order', 'null',
+})
+
+# All token patterns in one regex, compiled once; a match is classified by the number of its group
+TOKEN_REGEX = re.compile('|'.join(f'(?P<{name}>{pattern})' for name, pattern in token_specification))
+WHITESPACE, COMMENT, NEWLINE, IDENTIFIER, INTEGER, STRING, OPERATOR, PUNCTUATION = range(1, 9)
+
+# Token types by kind, the number a TokenBuffer stores for each token
+TOKEN_KINDS = tuple(TokenType)
+KEYWORD_KIND, IDENTIFIER_KIND, INTEGER_KIND, STRING_KIND, OPERATOR_KIND, PUNCTUATION_KIND, EOF_KIND = range(7)
+
+# Token kind of each group, None for the groups that are skipped
+GROUP_KINDS = (None, None, None, None, IDENTIFIER_KIND, INTEGER_KIND,
+               STRING_KIND, OPERATOR_KIND, PUNCTUATION_KIND)
+
+
+# Number of characters read from a file at a time
+CHUNK_SIZE = 64 * 1024
+
+
+def is_word_character(char):
+    """Return whether a character is a word character, as \\w matches it."""
+    return char.isalnum() or char == '_'
+
+
+# === Token Buffer ===
+class TokenBuffer:
+    """
+    Holds a sequence of tokens as parallel arrays instead of one Token object per token.
+
+    The kind of each token is a byte, its line and column are unsigned ints, and its value is
+    a reference to an int or string, shared by every token with the same identifier, keyword
+    or operator. Indexing gives a Token view of a token, made when it is asked for, so the
+    buffer reads like a list of tokens; the parser reads the arrays directly.
+    """
+
+    def __init__(self):
+        self.kinds = array('B')      # Index in TOKEN_KINDS of the type of each token
+        self.values = []             # Value of each token
+        self.lines = array('I')      # Line number of each token
+        self.columns = array('I')    # Column of each token
+
+    def append(self, kind, value, line, column):
+        """Add a token of the given kind at the end of the buffer."""
+        self.kinds.append(kind)
+        self.values.append(value)
+        self.lines.append(line)
+        self.columns.append(column)
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def __getitem__(self, index):
+        """Return a Token view of the token at the given index, counting from the end for negative indices."""
+        length = len(self.kinds)
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(length))]
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError("token index out of range")
+        return Token(TOKEN_KINDS[self.kinds[index]], self.values[index], self.lines[index], self.columns[index])
+
+    def __iter__(self):
+        for index in range(len(self.kinds)):
+            yield self[index]
+
 
 # === Lexer Class ===
 class Lexer:
     """Converts source code into a sequence of tokens using regular expression matching."""
     
     def __init__(self, source_code):
-        self.source = source_code    # Input source code
-        self.tokens = []             # List of recognized tokens
+        self.source = source_code    # Input source code, or a text file to read it from
+        self.tokens = TokenBuffer()  # Recognized tokens
         self.line = 1                # Current line number
 
     def tokenize(self):
@@ -65,46 +138,123 @@ class Lexer:
         Tokenizes the source code into a sequence of tokens.
         
         Returns:
-            list[Token]: List of tokens representing the source code
+            TokenBuffer: Tokens representing the source code
             
         Raises:
             SyntaxError: If an illegal character is encountered
         """
-        # Compile all token patterns into a single regex
-        tok_regex = '|'.join(f'(?P<{name}>{pattern})' for name, pattern in token_specification)
-        get_token = re.compile(tok_regex).match
-        pos = 0
-
-        while pos < len(self.source):
-            mo = get_token(self.source, pos)
-            if mo is None:
-                raise SyntaxError(f"Illegal character at line {self.line}: {self.source[pos]!r}")
-            
-            # Extract token information
-            kind = mo.lastgroup
-            value = mo.group(kind)
-            column = mo.start() - self.source.rfind('\n', 0, mo.start())
-
-            # Process different token types
-            if kind == 'NEWLINE':
-                self.line += 1
-            elif kind in ('WHITESPACE', 'COMMENT'):
-                pass  # Skip whitespace and comments
-            elif kind == 'KEYWORD':
-                self.tokens.append(Token(TokenType.KEYWORD, value, self.line, column))
-            elif kind == 'IDENTIFIER':
-                self.tokens.append(Token(TokenType.IDENTIFIER, value, self.line, column))
-            elif kind == 'INTEGER':
-                self.tokens.append(Token(TokenType.INTEGER, int(value), self.line, column))
-            elif kind == 'STRING':
-                self.tokens.append(Token(TokenType.STRING, value, self.line, column))
-            elif kind == 'OPERATOR':
-                self.tokens.append(Token(TokenType.OPERATOR, value, self.line, column))
-            elif kind == 'PUNCTUATION':
-                self.tokens.append(Token(TokenType.PUNCTUATION, value, self.line, column))
-
-            pos = mo.end()
+        tokens = self.tokens
+        kinds, values, lines, columns = tokens.kinds, tokens.values, tokens.lines, tokens.columns
+        for kind, value, line, column in self._scan(CHUNK_SIZE):
+            kinds.append(kind)
+            values.append(value)
+            lines.append(line)
+            columns.append(column)
+        return tokens
+
+    def iter_tokens(self, chunk_size=CHUNK_SIZE):
+        """
+        Yields the tokens of the source code one at a time, ending with the EOF token.
+
+        The source is scanned in one pass with the precompiled token regex. A text file is
+        read chunk_size characters at a time, and only the text of the token being scanned is
+        kept between chunks, so a parser pulling tokens from here never has the whole token
+        list, or the whole file, in memory. The column of a token is counted from the offset
+        of the last newline before it, kept as the scan goes, so it costs the same however
+        long the line is.
+
+        Args:
+            chunk_size (int, optional): The number of characters read from a file at a time.
+
+        Yields:
+            Token: The next token of the source code
+
+        Raises:
+            SyntaxError: If an illegal character is encountered
+        """
+        for kind, value, line, column in self._scan(chunk_size):
+            yield Token(TOKEN_KINDS[kind], value, line, column)
+
+    def _scan(self, chunk_size):
+        """
+        Scan the source code, yielding (kind, value, line, column) for each token and the EOF token.
+        """
+        source = self.source
+        if isinstance(source, str):
+            chunks = iter((source,))
+        else:
+            chunks = iter(partial(source.read, chunk_size), '')
+        match = TOKEN_REGEX.match
+        intern = sys.intern
+        buffer = ''
+        base = 0        # Offset in the source of the start of the buffer
+        pos = 0         # Offset in the buffer of the next token
+        newline = -1    # Offset in the source of the last newline before the next token
+        line = self.line
+        at_end = False
+
+        while not at_end:
+            chunk = next(chunks, None)
+            if chunk is None:
+                at_end = True
+            else:
+                # keep the text from the character before the next token, for the keyword check
+                keep = pos - 1 if pos else 0
+                buffer = buffer[keep:] + chunk
+                base += keep
+                pos -= keep
+            end = len(buffer)
+
+            while pos < end:
+                mo = match(buffer, pos)
+                if mo is None:
+                    self.line = line
+                    raise SyntaxError(f"Illegal character at line {line}: {buffer[pos]!r}")
+                kind = mo.lastindex
+                stop = mo.end()
+                if not at_end and (stop >= end or (buffer[pos] == "'" and not self._is_whole_string(buffer, kind, stop))):
+                    break  # the token may go on in the next chunk
+
+                # Process different token types
+                start = pos
+                pos = stop
+                if kind == NEWLINE:
+                    line += 1
+                    newline = base + start
+                    continue
+                token_kind = GROUP_KINDS[kind]
+                if token_kind is None:
+                    continue  # Skip whitespace and comments
+                value = mo.group()
+                if kind == IDENTIFIER:
+                    # a keyword is a whole word, so not one run on from a number as in 3let
+                    if (value in KEYWORDS and not (start and is_word_character(buffer[start - 1]))
+                            and not (stop < end and is_word_character(buffer[stop]))):
+                        token_kind = KEYWORD_KIND
+                    value = intern(value)
+                elif kind == INTEGER:
+                    value = int(value)
+                elif kind != STRING:
+                    value = intern(value)
+                self.line = line
+                yield token_kind, value, line, base + start - newline
+                if kind == STRING:
+                    # a string may span lines; they are not counted, but columns restart after them
+                    last = value.rfind('\n')
+                    if last >= 0:
+                        newline = base + start + last
 
         # Add EOF token at the end
-        self.tokens.append(Token(TokenType.EOF, 'EOF', self.line, pos))
-        return self.tokens
+        self.line = line
+        yield EOF_KIND, 'EOF', line, base + pos
+
+    @staticmethod
+    def _is_whole_string(buffer, kind, stop):
+        """
+        Return whether a token starting with a quote is the same whatever follows the buffer.
+
+        A string only ends at a quote that does not start four quotes, which the string
+        pattern tries to take as an escaped quote first; a quote that is not the start
+        of a string may be one once more of the source is read.
+        """
+        return kind == STRING and stop + 3 <= len(buffer) and buffer[stop - 1:stop + 3] != "''''"
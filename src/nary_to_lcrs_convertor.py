@@ -25,8 +25,8 @@ def nary_to_lcrs(nary_node):
     if nary_node is None:
         return None
 
-    # Create LCRS node with same data as N-ary node
-    lcrs_node = ASTNode(nary_node.data)
+    # Create LCRS node with the label of the N-ary node
+    lcrs_node = ASTNode(nary_node.get_data())
 
     # Convert children if they exist
     if nary_node.children:
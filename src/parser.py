@@ -2,24 +2,136 @@
 Recursive descent parser for RPAL language that implements the grammar rules
 to build an Abstract Syntax Tree (AST). The parser processes tokens according to
 the RPAL grammar and constructs a tree representation of the program structure.
+
+The grammar rules that can nest are generators run on an explicit stack rather than
+Python's call stack, so there is no limit on how deeply a program may nest.
 """
 
-from src.rpal_ast import ASTNode, build_tree
-from src.lexer import Token, TokenType  
+from src.rpal_ast import build_leaf, build_tree
+from src.standerizer.node import LABEL, ID, INT, STR, Node, build_node
+from src.lexer import (Token, TokenType, TokenBuffer, TOKEN_KINDS, KEYWORD_KIND, IDENTIFIER_KIND,
+                       INTEGER_KIND, STRING_KIND, OPERATOR_KIND, PUNCTUATION_KIND)
+
+# Marks the token after the current one as not read from the stream yet
+_UNREAD = object()
+
+# Kind of each token type, for tokens given as Token objects
+_KIND_OF_TYPE = {type_: kind for kind, type_ in enumerate(TOKEN_KINDS)}
+
+# Operators of the B and A layers, by the value of their token. Levels number the layers of the
+# grammar, from 1 for B (or) to 9 for R (application), so a higher level binds more tightly. An
+# operator builds an expression of its level and takes operands of at least the levels given, which
+# also says where a prefix operator may go: not after +, for instance, as At has no unary minus.
+
+# value -> (label, level, level of operand); unary + builds no node
+_PREFIX_OPERATORS = {
+    'not': ('not', 3, 4),
+    '+': (None, 5, 6),
+    '-': ('neg', 5, 6),
+}
+
+# value -> (label, level of left operand, level, level of right operand)
+_INFIX_OPERATORS = {
+    'or': ('or', 1, 1, 2),
+    '&': ('&', 2, 2, 3),
+    **{value: (label, 5, 4, 5) for value, label in (
+        ('gr', 'gr'), ('>', 'gr'), ('ge', 'ge'), ('>=', 'ge'), ('ls', 'ls'), ('<', 'ls'),
+        ('le', 'le'), ('<=', 'le'), ('eq', 'eq'), ('ne', 'ne'))},
+    '+': ('+', 5, 5, 6),
+    '-': ('-', 5, 5, 6),
+    '*': ('*', 6, 6, 7),
+    '/': ('/', 6, 6, 7),
+    '**': ('**', 8, 7, 7),
+    '@': ('@', 8, 8, 9),
+}
 
 class Parser:
-    """Implements a recursive descent parser for RPAL language."""
+    """
+    Implements a recursive descent parser for RPAL language.
+
+    Each grammar rule that can reach a nested expression is a generator: instead of
+    calling the rule for a part, it yields the generator of that rule, and _run pushes
+    it on a stack of the rules in progress, resuming the rule below once it is done.
+    A program nested a hundred thousand levels deep takes a list that long, where the
+    Python call stack would have overflowed long before. Rules that never nest, such as
+    parse_Vl, are plain methods called directly.
+    """
     
-    def __init__(self, tokens):
-        self.tokens = tokens      # List of tokens to parse
+    def __init__(self, tokens, nary=False, arena=None):
+        self.tokens = tokens      # Tokens to parse: a TokenBuffer, a list, or an iterator such as Lexer.iter_tokens()
         self.pos = 0             # Current position in token stream
         self.stack = []          # Stack for building AST nodes
+        self.arena = arena       # NodeArena to build the tree in, if any
+        # The tree is built of LCRS ASTNodes, or with nary of the n-ary Nodes the standardizer
+        # works on, which saves converting it with lcrs_to_nary, or in the rows of an arena.
+        # A leaf is made from its kind and typed value (see NodeKind); only an LCRS ASTNode,
+        # which has nothing but a label, turns them into one
+        if arena is not None:
+            self.make_leaf, self.make_tree = arena.leaf, arena.build
+        elif nary:
+            self.make_leaf, self.make_tree = Node, build_node
+        else:
+            self.make_leaf, self.make_tree = build_leaf, build_tree
+        # The kind and value of the current token, None past the last token; the grammar
+        # rules test these instead of a Token object, so a TokenBuffer is read in place
+        self.kind = None
+        self.value = None
+        if isinstance(tokens, TokenBuffer):
+            self._buffer = tokens
+            self._load()
+        else:
+            # Tokens are pulled from the stream as they are needed, so only the current token
+            # and at most one after it are held; a list is read the same way
+            self._buffer = None
+            self._stream = iter(tokens)
+            self._current = next(self._stream, None)
+            self._next = _UNREAD
+            self._load()
+
+    def _load(self):
+        """Set the kind and value of the current token."""
+        buffer = self._buffer
+        if buffer is not None:
+            pos = self.pos
+            if pos < len(buffer.kinds):
+                self.kind = buffer.kinds[pos]
+                self.value = buffer.values[pos]
+            else:
+                self.kind = self.value = None
+        else:
+            token = self._current
+            if token is not None:
+                self.kind = _KIND_OF_TYPE[token.type]
+                self.value = token.value
+            else:
+                self.kind = self.value = None
 
     def peek(self):
         """Look at the current token without consuming it."""
-        if self.pos < len(self.tokens):
-            return self.tokens[self.pos]
-        return None
+        buffer = self._buffer
+        if buffer is not None:
+            return buffer[self.pos] if self.pos < len(buffer) else None
+        return self._current
+
+    def advance(self):
+        """Consume the current token and move on to the next one."""
+        self.pos += 1
+        if self._buffer is None:
+            if self._next is _UNREAD:
+                self._current = next(self._stream, None)
+            else:
+                self._current = self._next
+                self._next = _UNREAD
+        self._load()
+
+    def peek_next(self):
+        """Look at the token after the current one without consuming anything."""
+        buffer = self._buffer
+        if buffer is not None:
+            return buffer[self.pos + 1] if self.pos + 1 < len(buffer) else None
+        if self._next is _UNREAD:
+            self._next = next(self._stream, None) if self._current is not None else None
+        return self._next
 
     def match(self, expected_type, expected_value=None):
         """
@@ -31,7 +143,7 @@ class Parser:
             raise SyntaxError("Unexpected end of input")
 
         if token.type == expected_type and (expected_value is None or token.value == expected_value):
-            self.pos += 1
+            self.advance()
             return token
         else:
             expected = f"{expected_type.name}"
@@ -40,398 +152,346 @@ class Parser:
             raise SyntaxError(
                 f"Unexpected token {token.value!r} at line {token.line}, column {token.column}. Expected {expected}."
             )
-        
+
+    def expect(self, expected_kind, expected_value=None):
+        """
+        Consume the current token if it is of the expected kind and value, and return its value.
+        Raises the SyntaxError of match otherwise, without making a Token for a token that matches.
+        """
+        value = self.value
+        if self.kind == expected_kind and (expected_value is None or value == expected_value):
+            self.advance()
+            return value
+        self.match(TOKEN_KINDS[expected_kind], expected_value)
+
+    def _run(self, rule):
+        """
+        Run a grammar rule to the end, along with every rule it yields, on an explicit stack.
+
+        Args:
+            rule (generator): The generator of the grammar rule, as returned by parse_E.
+        """
+        stack = []
+        push = stack.append
+        pop = stack.pop
+        while True:
+            part = next(rule, None)
+            if part is not None:
+                push(rule)
+                rule = part
+            elif stack:
+                rule = pop()
+            else:
+                return
+
     def parse_E(self):
         """
         Parse an expression (E) according to grammar rules:
         E -> let D in E | fn Vb+ . E | Ew
         """
-        token = self.peek()
-
-        if token.type == TokenType.KEYWORD and token.value == 'let':
+        if self.kind == KEYWORD_KIND and self.value == 'let':
             # Handle let expression: let D in E
-            self.match(TokenType.KEYWORD, 'let')
-            self.parse_D()
-            self.match(TokenType.KEYWORD, 'in')
-            self.parse_E()
-            build_tree('let', 2, self.stack)
+            self.expect(KEYWORD_KIND, 'let')
+            yield self.parse_D()
+            self.expect(KEYWORD_KIND, 'in')
+            yield self.parse_E()
+            self.make_tree('let', 2, self.stack)
 
-        elif token.type == TokenType.KEYWORD and token.value == 'fn':
+        elif self.kind == KEYWORD_KIND and self.value == 'fn':
             # Handle function definition: fn Vb+ . E
-            self.match(TokenType.KEYWORD, 'fn')
+            self.expect(KEYWORD_KIND, 'fn')
 
             count = 0
-            while self.peek().type in {TokenType.IDENTIFIER, TokenType.PUNCTUATION}:
-                if self.peek().value == '(' or self.peek().value == ')':
+            while self.kind == IDENTIFIER_KIND or self.kind == PUNCTUATION_KIND:
+                if self.value == '(' or self.value == ')':
                     break
                 self.parse_Vb()
                 count += 1
 
-            self.match(TokenType.OPERATOR, '.')
-            self.parse_E()
-            build_tree('lambda', count + 1, self.stack)
+            self.expect(OPERATOR_KIND, '.')
+            yield self.parse_E()
+            self.make_tree('lambda', count + 1, self.stack)
 
         else:
-            self.parse_Ew()
+            yield self.parse_Ew()
 
     def parse_Ew(self):
         """
         Parse where expression: Ew -> T [where Dr]
         """
-        self.parse_T()
+        yield self.parse_T()
 
-        if self.peek().type == TokenType.KEYWORD and self.peek().value == 'where':
-            self.match(TokenType.KEYWORD, 'where')
-            self.parse_Dr()
-            build_tree('where', 2, self.stack)
+        if self.kind == KEYWORD_KIND and self.value == 'where':
+            self.expect(KEYWORD_KIND, 'where')
+            yield self.parse_Dr()
+            self.make_tree('where', 2, self.stack)
 
     def parse_T(self):
         """
         Parse tuple expression: T -> Ta (, Ta)*
         """
-        self.parse_Ta()
+        yield self.parse_Ta()
         count = 1
 
-        while self.peek().type == TokenType.PUNCTUATION and self.peek().value == ',':
-            self.match(TokenType.PUNCTUATION, ',')
-            self.parse_Ta()
+        while self.kind == PUNCTUATION_KIND and self.value == ',':
+            self.expect(PUNCTUATION_KIND, ',')
+            yield self.parse_Ta()
             count += 1
 
         if count > 1:
-            build_tree('tau', count, self.stack)
+            self.make_tree('tau', count, self.stack)
 
     def parse_Ta(self):
         """
         Parse augmented tuple: Ta -> Tc (aug Tc)*
         """
-        self.parse_Tc()
+        yield self.parse_Tc()
 
-        while self.peek().type == TokenType.KEYWORD and self.peek().value == 'aug':
-            self.match(TokenType.KEYWORD, 'aug')
-            self.parse_Tc()
-            build_tree('aug', 2, self.stack)
+        while self.kind == KEYWORD_KIND and self.value == 'aug':
+            self.expect(KEYWORD_KIND, 'aug')
+            yield self.parse_Tc()
+            self.make_tree('aug', 2, self.stack)
 
     def parse_Tc(self):
         """
         Parse conditional expression: Tc -> B (-> Tc | Tc)*
         """
-        self.parse_B()
+        yield self.parse_B()
 
-        if self.peek().type == TokenType.OPERATOR and self.peek().value == '->':
-            self.match(TokenType.OPERATOR, '->')
-            self.parse_Tc()
-            self.match(TokenType.OPERATOR, '|')
-            self.parse_Tc()
-            build_tree('->', 3, self.stack)
+        if self.kind == OPERATOR_KIND and self.value == '->':
+            self.expect(OPERATOR_KIND, '->')
+            yield self.parse_Tc()
+            self.expect(OPERATOR_KIND, '|')
+            yield self.parse_Tc()
+            self.make_tree('->', 3, self.stack)
 
     def parse_B(self):
         """
-        Parse boolean expression: B -> Bt (or Bt)*
-        """
-        self.parse_Bt()
-
-        while self.peek().type == TokenType.KEYWORD and self.peek().value == 'or':
-            self.match(TokenType.KEYWORD, 'or')
-            self.parse_Bt()
-            build_tree('or', 2, self.stack)
-
-    def parse_Bt(self):
-        """
-        Parse boolean term: Bt -> Bs (& Bs)*
-        """
-        self.parse_Bs()
-
-        while self.peek().type == TokenType.OPERATOR and self.peek().value == '&':
-            self.match(TokenType.OPERATOR, '&')
-            self.parse_Bs()
-            build_tree('&', 2, self.stack)
-
-    def parse_Bs(self):
-        """
-        Parse boolean secondary: Bs -> not Bp | Bp
-        """
-        if self.peek().type == TokenType.KEYWORD and self.peek().value == 'not':
-            self.match(TokenType.KEYWORD, 'not')
-            self.parse_Bp()
-            build_tree('not', 1, self.stack)
-        else:
-            self.parse_Bp()
-
-    def parse_Bp(self):
-        """
-        Parse boolean primary: Bp -> A (relop A)?
-        """
-        self.parse_A()
-
-        token = self.peek()
-        if token is None:
-            return
-
-        # Map relational operators to AST labels
-        relational_ops = {
-            'gr': 'gr', '>': 'gr',
-            'ge': 'ge', '>=': 'ge',
-            'ls': 'ls', '<': 'ls',
-            'le': 'le', '<=': 'le',
-            'eq': 'eq',
-            'ne': 'ne'
-        }
-
-        if token.value in relational_ops:
-            op_token = self.match(token.type, token.value)
-            self.parse_A()
-            build_tree(relational_ops[op_token.value], 2, self.stack)
-
-    def parse_A(self):
-        """
-        Parse arithmetic expression: A -> [+-]? At ((+|-) At)*
-        """
-        token = self.peek()
-
-        # Handle unary operators
-        if token.type == TokenType.OPERATOR and token.value in {'+', '-'}:
-            op = self.match(TokenType.OPERATOR).value
-            self.parse_At()
-            if op == '-':
-                build_tree('neg', 1, self.stack)
-        else:
-            self.parse_At()
-
-            # Handle binary operators
-            while self.peek().type == TokenType.OPERATOR and self.peek().value in {'+', '-'}:
-                op = self.match(TokenType.OPERATOR).value
-                self.parse_At()
-                build_tree(op, 2, self.stack)
-
-    def parse_At(self):
-        """
-        Parse arithmetic term: At -> Af ((*|/) Af)*
-        """
-        self.parse_Af()
-
-        while self.peek().type == TokenType.OPERATOR and self.peek().value in {'*', '/'}:
-            op = self.match(TokenType.OPERATOR).value
-            self.parse_Af()
-            build_tree(op, 2, self.stack)
-
-    def parse_Af(self):
-        """
-        Parse arithmetic factor: Af -> Ap (** Af)?
-        """
-        self.parse_Ap()
-
-        if self.peek().type == TokenType.OPERATOR and self.peek().value == '**':
-            self.match(TokenType.OPERATOR, '**')
-            self.parse_Af()
-            build_tree('**', 2, self.stack)
-
-    def parse_Ap(self):
-        """
-        Parse arithmetic primary: Ap -> R (@ <id> R)*
-        """
-        self.parse_R()
-
-        while self.peek().type == TokenType.OPERATOR and self.peek().value == '@':
-            self.match(TokenType.OPERATOR, '@')
-            id_token = self.match(TokenType.IDENTIFIER)
-            self.stack.append(ASTNode(f"<ID:{id_token.value}>"))
-            self.parse_R()
-            build_tree('@', 3, self.stack)
-    
-    def parse_R(self):
-        """
-        Parse R-expression: R -> Rn+
-        """
-        self.parse_Rn()
-
-        while self.is_start_of_Rn():
-            self.parse_Rn()
-            build_tree('gamma', 2, self.stack)
-
-    def is_start_of_Rn(self):
-        """Check if current token can start an Rn expression."""
-        token = self.peek()
-        if token is None:
-            return False
-
-        return (
-            token.type in {TokenType.IDENTIFIER, TokenType.INTEGER, TokenType.STRING} or
-            (token.type == TokenType.KEYWORD and token.value in {'true', 'false', 'nil', 'dummy'}) or
-            (token.type == TokenType.PUNCTUATION and token.value == '(')
-        )
-
-    def parse_Rn(self):
-        """
-        Parse Rn-expression: Rn -> (E) | <id> | <integer> | <string> | true | false | nil | dummy
-        """
-        token = self.peek()
-
-        if token.type == TokenType.PUNCTUATION and token.value == '(':
-            # Handle parenthesized expression
-            self.match(TokenType.PUNCTUATION, '(')
-            self.parse_E()
-            self.match(TokenType.PUNCTUATION, ')')
-
-        elif token.type == TokenType.IDENTIFIER:
-            # Handle identifier
-            token = self.match(TokenType.IDENTIFIER)
-            self.stack.append(ASTNode(f"<ID:{token.value}>"))
-
-        elif token.type == TokenType.INTEGER:
-            # Handle integer literal
-            token = self.match(TokenType.INTEGER)
-            self.stack.append(ASTNode(f"<INT:{token.value}>"))
-
-        elif token.type == TokenType.STRING:
-            # Handle string literal
-            token = self.match(TokenType.STRING)
-            self.stack.append(ASTNode(f"<STR:{token.value}>"))
-
-        elif token.type == TokenType.KEYWORD and token.value in {'true', 'false', 'nil', 'dummy'}:
-            # Handle boolean and special literals
-            token = self.match(TokenType.KEYWORD)
-            label = f"<{token.value}>" if token.value == "nil" else token.value
-            self.stack.append(ASTNode(label))
+        Parse an operator expression, the layers B down to Rn, by precedence:
+        B -> B or Bt | Bt            Bt -> Bt & Bs | Bs        Bs -> not Bp | Bp
+        Bp -> A relop A | A          A -> A (+|-) At | (+|-) At | At
+        At -> At (*|/) Af | Af       Af -> Ap ** Af | Ap       Ap -> Ap @ <id> R | R
+        R -> R Rn | Rn               Rn -> (E) | <id> | <integer> | <string> | true | false | nil | dummy
+
+        Operands are parsed in a loop, and operators wait on a list until an operator
+        that binds less tightly comes, as in _INFIX_OPERATORS, so a primary costs one
+        pass of the loop instead of a call for each layer. Only a parenthesized E is
+        yielded to _run.
+        """
+        stack = self.stack
+        make_leaf = self.make_leaf
+        make_tree = self.make_tree
+        pending = []  # (label, children, level, right level) of the operators waiting for their right operand
+        while True:
+            # Prefix operators, where the layer of the operand allows them
+            required = pending[-1][3] if pending else 1
+            prefix = _PREFIX_OPERATORS.get(self.value)
+            while prefix is not None and prefix[1] >= required:
+                label, level, required = prefix
+                pending.append((label, 1, level, required))
+                self.advance()
+                prefix = _PREFIX_OPERATORS.get(self.value)
+
+            # R -> Rn+, each Rn after the first applied to the ones before it
+            count = 0
+            while True:
+                kind = self.kind
+                value = self.value
+                if kind == IDENTIFIER_KIND:
+                    stack.append(make_leaf(ID, value))
+                    self.advance()
+                elif kind == INTEGER_KIND:
+                    stack.append(make_leaf(INT, int(value)))
+                    self.advance()
+                elif kind == STRING_KIND:
+                    stack.append(make_leaf(STR, value[1:-1]))
+                    self.advance()
+                elif kind == KEYWORD_KIND and value in {'true', 'false', 'nil', 'dummy'}:
+                    stack.append(make_leaf(LABEL, "<nil>" if value == "nil" else value))
+                    self.advance()
+                elif kind == PUNCTUATION_KIND and value == '(':
+                    self.advance()
+                    yield self.parse_E()
+                    self.expect(PUNCTUATION_KIND, ')')
+                elif count:
+                    break
+                else:
+                    raise SyntaxError(f"Unexpected token in Rn: {self.peek()}")
+                if count:
+                    make_tree('gamma', 2, stack)
+                count += 1
 
-        else:
-            raise SyntaxError(f"Unexpected token in Rn: {token}")
+            # Apply the waiting operators that bind more tightly than the next one
+            level = 9
+            infix = _INFIX_OPERATORS.get(self.value)
+            precedence = infix[2] if infix is not None else 0
+            while pending and precedence < pending[-1][3]:
+                label, children, level, _ = pending.pop()
+                if label is not None:
+                    make_tree(label, children, stack)
+            if infix is None or level < infix[1]:
+                # not an operator, or one the layer of its left operand does not allow
+                while pending:
+                    label, children, _, _ = pending.pop()
+                    if label is not None:
+                        make_tree(label, children, stack)
+                return
+
+            label, _, precedence, right = infix
+            self.advance()
+            if label == '@':
+                identifier = self.expect(IDENTIFIER_KIND)
+                stack.append(make_leaf(ID, identifier))
+                pending.append((label, 3, precedence, right))
+            else:
+                pending.append((label, 2, precedence, right))
 
     def parse_D(self):
         """
         Parse definition: D -> Da (within D)?
         """
-        self.parse_Da()
+        yield self.parse_Da()
 
-        if self.peek().type == TokenType.KEYWORD and self.peek().value == 'within':
-            self.match(TokenType.KEYWORD, 'within')
-            self.parse_D()
-            build_tree('within', 2, self.stack)
+        if self.kind == KEYWORD_KIND and self.value == 'within':
+            self.expect(KEYWORD_KIND, 'within')
+            yield self.parse_D()
+            self.make_tree('within', 2, self.stack)
 
     def parse_Da(self):
         """
         Parse and definition: Da -> Dr (and Dr)*
         """
-        self.parse_Dr()
+        yield self.parse_Dr()
         count = 1
 
-        while self.peek().type == TokenType.KEYWORD and self.peek().value == 'and':
-            self.match(TokenType.KEYWORD, 'and')
-            self.parse_Dr()
+        while self.kind == KEYWORD_KIND and self.value == 'and':
+            self.expect(KEYWORD_KIND, 'and')
+            yield self.parse_Dr()
             count += 1
 
         if count > 1:
-            build_tree('and', count, self.stack)
+            self.make_tree('and', count, self.stack)
 
     def parse_Dr(self):
         """
         Parse recursive definition: Dr -> rec Db | Db
         """
-        if self.peek().type == TokenType.KEYWORD and self.peek().value == 'rec':
-            self.match(TokenType.KEYWORD, 'rec')
-            self.parse_Db()
-            build_tree('rec', 1, self.stack)
+        if self.kind == KEYWORD_KIND and self.value == 'rec':
+            self.expect(KEYWORD_KIND, 'rec')
+            yield self.parse_Db()
+            self.make_tree('rec', 1, self.stack)
         else:
-            self.parse_Db()
+            yield self.parse_Db()
 
     def parse_Db(self):
         """
         Parse basic definition: Db -> (D) | Vl = E | <id> Vb+ = E
         """
-        if self.peek().type == TokenType.PUNCTUATION and self.peek().value == '(':
+        if self.kind == PUNCTUATION_KIND and self.value == '(':
             # Handle parenthesized definition
-            self.match(TokenType.PUNCTUATION, '(')
-            self.parse_D()
-            self.match(TokenType.PUNCTUATION, ')')
+            self.expect(PUNCTUATION_KIND, '(')
+            yield self.parse_D()
+            self.expect(PUNCTUATION_KIND, ')')
 
         elif (
-            self.peek().type == TokenType.IDENTIFIER and
+            self.kind == IDENTIFIER_KIND and
             self.lookahead_is_vb_sequence()
         ):
             # Handle function definition
-            id_token = self.match(TokenType.IDENTIFIER)
-            self.stack.append(ASTNode(f"<ID:{id_token.value}>"))
+            identifier = self.expect(IDENTIFIER_KIND)
+            self.stack.append(self.make_leaf(ID, identifier))
 
             count = 1
             while self.is_start_of_Vb():
                 self.parse_Vb()
                 count += 1
 
-            self.match(TokenType.OPERATOR, '=')
-            self.parse_E()
-            build_tree('function_form', count + 1, self.stack)
+            self.expect(OPERATOR_KIND, '=')
+            yield self.parse_E()
+            self.make_tree('function_form', count + 1, self.stack)
 
         else:
             # Handle simple definition
             self.parse_Vl()
-            self.match(TokenType.OPERATOR, '=')
-            self.parse_E()
-            build_tree('=', 2, self.stack)
+            self.expect(OPERATOR_KIND, '=')
+            yield self.parse_E()
+            self.make_tree('=', 2, self.stack)
 
     def is_start_of_Vb(self):
         """Check if current token can start a Vb (variable binding)."""
-        token = self.peek()
         return (
-            token.type == TokenType.IDENTIFIER or
-            (token.type == TokenType.PUNCTUATION and token.value == '(')
+            self.kind == IDENTIFIER_KIND or
+            (self.kind == PUNCTUATION_KIND and self.value == '(')
         )
 
     def lookahead_is_vb_sequence(self):
         """Check if next token is part of a variable binding sequence."""
-        if self.pos + 1 >= len(self.tokens):
-            return False
+        buffer = self._buffer
+        if buffer is not None:
+            pos = self.pos + 1
+            if pos >= len(buffer.kinds):
+                return False
+            kind, value = buffer.kinds[pos], buffer.values[pos]
+        else:
+            next_token = self.peek_next()
+            if next_token is None:
+                return False
+            kind, value = _KIND_OF_TYPE[next_token.type], next_token.value
 
-        next_token = self.tokens[self.pos + 1]
         return (
-            next_token.type == TokenType.IDENTIFIER or
-            (next_token.type == TokenType.PUNCTUATION and next_token.value == '(')
+            kind == IDENTIFIER_KIND or
+            (kind == PUNCTUATION_KIND and value == '(')
         )
 
     def parse_Vb(self):
         """
         Parse variable binding: Vb -> <id> | (<Vl>)
         """
-        if self.peek().type == TokenType.PUNCTUATION and self.peek().value == '(':
-            self.match(TokenType.PUNCTUATION, '(')
+        if self.kind == PUNCTUATION_KIND and self.value == '(':
+            self.expect(PUNCTUATION_KIND, '(')
 
-            if self.peek().type == TokenType.PUNCTUATION and self.peek().value == ')':
-                self.match(TokenType.PUNCTUATION, ')')
-                self.stack.append(ASTNode('()'))  # Empty binding
+            if self.kind == PUNCTUATION_KIND and self.value == ')':
+                self.expect(PUNCTUATION_KIND, ')')
+                self.stack.append(self.make_leaf(LABEL, '()'))  # Empty binding
             else:
                 self.parse_Vl()
-                self.match(TokenType.PUNCTUATION, ')')
+                self.expect(PUNCTUATION_KIND, ')')
 
         else:
-            id_token = self.match(TokenType.IDENTIFIER)
-            self.stack.append(ASTNode(f"<ID:{id_token.value}>"))
+            identifier = self.expect(IDENTIFIER_KIND)
+            self.stack.append(self.make_leaf(ID, identifier))
 
     def parse_Vl(self):
         """
         Parse variable list: Vl -> <id> (, <id>)*
         """
-        id_token = self.match(TokenType.IDENTIFIER)
-        self.stack.append(ASTNode(f"<ID:{id_token.value}>"))
+        identifier = self.expect(IDENTIFIER_KIND)
+        self.stack.append(self.make_leaf(ID, identifier))
         count = 1
 
-        while self.peek().type == TokenType.PUNCTUATION and self.peek().value == ',':
-            self.match(TokenType.PUNCTUATION, ',')
-            id_token = self.match(TokenType.IDENTIFIER)
-            self.stack.append(ASTNode(f"<ID:{id_token.value}>"))
+        while self.kind == PUNCTUATION_KIND and self.value == ',':
+            self.expect(PUNCTUATION_KIND, ',')
+            identifier = self.expect(IDENTIFIER_KIND)
+            self.stack.append(self.make_leaf(ID, identifier))
             count += 1
 
         if count > 1:
-            build_tree(',', count, self.stack)
+            self.make_tree(',', count, self.stack)
 
     def parse(self):
         """
         Parse the entire token stream into an AST.
         
         Returns:
-            ASTNode: Root of the constructed abstract syntax tree
+            ASTNode: Root of the constructed abstract syntax tree, a Node if the parser is nary,
+                or an ArenaCursor if it builds in an arena
             
         Raises:
             SyntaxError: If the input doesn't match the grammar
         """
-        self.parse_E()
-        if self.pos < len(self.tokens) - 1:
+        self._run(self.parse_E())
+        if self.peek() is not None and self.peek_next() is not None:
             raise SyntaxError("Unexpected tokens after end of expression")
+        if self.arena is not None:
+            return self.arena.cursor(self.stack.pop())
         return self.stack.pop()
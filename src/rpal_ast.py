@@ -4,6 +4,8 @@ This representation uses two pointers per node: left for first child and right f
 which allows efficient tree traversal and manipulation.
 """
 
+from src.standerizer.node import node_label
+
 class ASTNode:
     """
     Represents a node in the Abstract Syntax Tree using LCRS representation.
@@ -14,6 +16,16 @@ class ASTNode:
         self.left = None         # Pointer to first child
         self.right = None        # Pointer to next sibling
 
+def build_leaf(kind, value):
+    """
+    Builds a leaf from the kind and value the parser gives it, labelled as -ast prints it.
+
+    Args:
+        kind: NodeKind of the leaf
+        value: Name, int, string or label of the leaf
+    """
+    return ASTNode(node_label(kind, value))
+
 def build_tree(label, n, stack):
     """
     Builds a tree node with n children from the stack.
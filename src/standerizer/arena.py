@@ -0,0 +1,195 @@
+"""
+Arena-backed syntax tree: every node of a tree is a row of a few parallel arrays instead of a Python object.
+"""
+
+from array import array
+
+from src.standerizer.node import LABEL, Node, NodeKind, node_label
+
+
+class NodeArena:
+    """
+    Holds the nodes of syntax trees in parallel arrays, a node being an index into them.
+
+    A node has a kind (NodeKind), one byte; a payload, the index of its label, name, integer
+    or string in values, where each is stored once however many nodes share it; and the
+    indexes of its first child and next sibling, -1 for none, as in the LCRS tree of the
+    parser. That is thirteen bytes a node, plus one copy of each distinct value, against a
+    Node object with its attributes and children list.
+
+    The arena is built by the parser (Parser(tokens, arena=NodeArena())) and read through
+    ArenaCursor, which has the kind, value and children of a Node, so code that reads a Node tree,
+    such as AST.print_ast and Linearizer.preorder_traversal, reads a cursor the same way.
+    The standardizer rewrites a tree in place, so it is given a copy made by to_node.
+    """
+
+    def __init__(self):
+        self.kinds = array('B')          # Kind of each node
+        self.payloads = array('I')       # Index in values of the payload of each node
+        self.first_child = array('i')    # First child of each node, -1 for a leaf
+        self.next_sibling = array('i')   # Next sibling of each node, -1 for the last child
+        self.values = []                 # Labels, names, integers and strings of the nodes
+        self._value_index = ({}, {}, {}, {})  # Index in values of each value, by kind
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def _add(self, kind, value, first_child=-1):
+        value_index = self._value_index[kind]
+        payload = value_index.get(value)
+        if payload is None:
+            payload = value_index[value] = len(self.values)
+            self.values.append(value)
+        index = len(self.kinds)
+        self.kinds.append(kind)
+        self.payloads.append(payload)
+        self.first_child.append(first_child)
+        self.next_sibling.append(-1)
+        return index
+
+    def leaf(self, kind, value):
+        """
+        Add a leaf of the given kind and value, such as (ID, "x") or (LABEL, "<nil>"), and return its index.
+        """
+        return self._add(kind, value)
+
+    def build(self, label, n, stack):
+        """
+        Builds a node with n children from the stack, as build_tree does for the LCRS ASTNodes of the parser.
+        The children are the top n node indexes of the stack, in the order they were pushed.
+
+        Args:
+            label: Label of the new node
+            n: Number of children to attach
+            stack: Stack containing the indexes of the child nodes
+        """
+        children = stack[-n:]
+        del stack[-n:]
+        next_sibling = self.next_sibling
+        for child, sibling in zip(children, children[1:]):
+            next_sibling[child] = sibling
+        stack.append(self._add(LABEL, label, children[0]))
+
+    def value(self, index):
+        """
+        Return the value of a node: its label, name, integer or string.
+        """
+        return self.values[self.payloads[index]]
+
+    def label(self, index):
+        """
+        Return the label of a node, as -ast and -st print it.
+        """
+        return node_label(self.kinds[index], self.values[self.payloads[index]])
+
+    def children(self, index):
+        """
+        Return the indexes of the children of a node.
+        """
+        children = []
+        child = self.first_child[index]
+        next_sibling = self.next_sibling
+        while child >= 0:
+            children.append(child)
+            child = next_sibling[child]
+        return children
+
+    def preorder(self, index):
+        """
+        Yield (node, depth) for a node and every node below it, in preorder, without recursion.
+        """
+        first_child = self.first_child
+        next_sibling = self.next_sibling
+        stack = [(index, 0)]
+        while stack:
+            node, depth = stack.pop()
+            yield node, depth
+            sibling = next_sibling[node]
+            if sibling >= 0 and depth:
+                stack.append((sibling, depth))
+            child = first_child[node]
+            if child >= 0:
+                stack.append((child, depth + 1))
+
+    def add_tree(self, root):
+        """
+        Add a copy of a tree of Nodes, a standardized one for instance, and return the index of its root.
+        """
+        stack = []
+        pending = [(root, False)]
+        while pending:
+            node, built = pending.pop()
+            if node.children and not built:
+                pending.append((node, True))
+                pending.extend((child, False) for child in reversed(node.children))
+            elif node.children:
+                self.build(node.value, len(node.children), stack)
+            else:
+                stack.append(self.leaf(node.kind, node.value))
+        return stack.pop()
+
+    def to_node(self, index):
+        """
+        Return a copy of the tree below a node made of Nodes, for the standardizer, which
+        rewrites the nodes of a tree in place.
+        """
+        root = Node(self.kinds[index], self.value(index))
+        stack = [(index, root)]
+        while stack:
+            index, node = stack.pop()
+            for child in self.children(index):
+                child_node = Node(self.kinds[child], self.value(child))
+                node.children.append(child_node)
+                stack.append((child, child_node))
+        return root
+
+    def cursor(self, index):
+        """
+        Return a cursor on a node.
+        """
+        return ArenaCursor(self, index)
+
+
+class ArenaCursor:
+    """
+    A read-only view of a node of a NodeArena with the interface of a Node: kind, value,
+    children, get_data and get_degree. A cursor is made for a node when it is asked for, so
+    holding a tree costs nothing beyond the arena.
+    """
+
+    __slots__ = ("arena", "index")
+
+    def __init__(self, arena, index):
+        self.arena = arena
+        self.index = index
+
+    @property
+    def kind(self):
+        return NodeKind(self.arena.kinds[self.index])
+
+    @property
+    def value(self):
+        return self.arena.value(self.index)
+
+    @property
+    def children(self):
+        arena = self.arena
+        return [ArenaCursor(arena, child) for child in arena.children(self.index)]
+
+    def get_data(self):
+        return self.arena.label(self.index)
+
+    def get_degree(self):
+        """Returns the number of children of this node."""
+        return len(self.arena.children(self.index))
+
+    def __eq__(self, other):
+        if not isinstance(other, ArenaCursor):
+            return NotImplemented
+        return self.arena is other.arena and self.index == other.index
+
+    def __hash__(self):
+        return hash((id(self.arena), self.index))
+
+    def __repr__(self):
+        return f"ArenaCursor({self.index}, {self.get_data()!r})"
@@ -1,9 +1,12 @@
+from .standardizer import Standardizer
+
 class AST:
     """Abstract Syntax Tree class that represents the hierarchical structure of parsed code."""
     
     def __init__(self, root = None):
         """Initialize AST with an optional root node."""
         self.root = root
+        self.rule_counts = {}  # Number of times each standardization rule was applied
 
     def set_root(self, root):
         """Set the root node of the AST."""
@@ -15,19 +18,24 @@ class AST:
 
     def standardize(self):
         """Standardize the AST by applying standardization rules starting from root."""
+        standardizer = Standardizer()
         if not self.root.is_standardized:
-            self.root.standardize()
+            standardizer.standardize(self.root)
+        self.rule_counts = standardizer.rule_counts
 
     def pre_order_traverse(self, node, i):
         """
         Perform pre-order traversal of the AST.
+        The depth of each node is counted on the way down, from an explicit stack.
         Args:
             node: Current node to process
             i: Current indentation level
         """
-        print("." * i + str(node.get_data()))
-        for child in node.children:
-            self.pre_order_traverse(child, i + 1)
+        stack = [(node, i)]
+        while stack:
+            node, i = stack.pop()
+            print("." * i + str(node.get_data()))
+            stack.extend((child, i + 1) for child in reversed(node.children))
 
     def print_ast(self):
         """Print the AST structure using pre-order traversal with indentation."""
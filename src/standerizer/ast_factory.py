@@ -17,9 +17,8 @@ class ASTFactory:
         Returns:
             AST object with properly structured nodes
         """
-        root = NodeFactory.get_node(data[0], 0)  # Create root node
-        previous_node = root
-        current_depth = 0
+        root = NodeFactory.get_node(data[0])  # Create root node
+        ancestors = [root]  # The last node seen at each depth, from the root down
 
         for s in data[1:]:
             # Calculate node depth by counting leading dots
@@ -29,21 +28,11 @@ class ASTFactory:
                 d += 1
                 i += 1
 
-            current_node = NodeFactory.get_node(s[i:], d)
+            current_node = NodeFactory.get_node(s[i:])
 
-            # Handle node relationships based on depth
-            if current_depth < d:
-                # Add as child if deeper than previous node
-                previous_node.children.append(current_node)
-                current_node.set_parent(previous_node)  
-            else:
-                # Find appropriate parent at same depth
-                while previous_node.get_depth() != d:
-                    previous_node = previous_node.get_parent()
-                previous_node.get_parent().children.append(current_node)  
-                current_node.set_parent(previous_node.get_parent())  
-
-            previous_node = current_node
-            current_depth = d
+            # The parent is the last node seen one level up
+            del ancestors[d:]
+            ancestors[-1].children.append(current_node)
+            ancestors.append(current_node)
 
         return AST(root)  
@@ -1,19 +1,74 @@
+from enum import IntEnum
+
+
+class NodeKind(IntEnum):
+    """
+    The kind of a node, which tells what its value is:
+
+        LABEL   a construct or an operator, such as gamma, lambda or +, named by its label,
+                and the constants true, false, dummy, <nil> and () and the <Y*> of rec
+        ID      an identifier, named by a str
+        INT     an integer, an int
+        STR     a string, a str without its quotes
+    """
+    LABEL = 0
+    ID = 1
+    INT = 2
+    STR = 3
+
+
+LABEL, ID, INT, STR = NodeKind
+
+
+def node_label(kind, value):
+    """
+    Return the label a node is printed with by -ast and -st, such as gamma, <ID:x>, <INT:5> or <STR:'a'>.
+    """
+    if kind == LABEL:
+        return value
+    if kind == ID:
+        return f"<ID:{value}>"
+    if kind == INT:
+        return f"<INT:{value}>"
+    return f"<STR:'{value}'>"
+
+
+def parse_label(label):
+    """
+    Return the kind and value of a node from its printed label, the inverse of node_label, for
+    trees that only have the labels, such as the LCRS ASTNodes of the parser.
+    """
+    if label.startswith("<ID:"):
+        return ID, label[4:-1]
+    if label.startswith("<INT:"):
+        return INT, int(label[5:-1])
+    if label.startswith("<STR:"):
+        return STR, label[6:-2]
+    return LABEL, label
+
+
 class Node:
-    """Represents a node in the Abstract Syntax Tree with data, depth, parent-child relationships, and standardization status."""
-    
-    def __init__(self):
-        self.data = None
-        self.depth = 0
-        self.parent = None
-        self.children = []
-        self.is_standardized = False
+    """
+    Represents a node in the Abstract Syntax Tree with a kind, a value, children, and standardization status.
+
+    The value is typed by the kind (see NodeKind): the name of an identifier, the int of an
+    integer, or the label of a construct, and the label a node is printed with is only made
+    by get_data. A node holds no depth and no parent: the depth of a node is counted by the
+    traversal that prints it, and a tool that has to walk up the tree asks parent_map for the
+    parents. The attributes are slots, so a node has no __dict__.
+    """
 
-    # Basic getters and setters
-    def set_data(self, data):
-        self.data = data
+    __slots__ = ("kind", "value", "children", "is_standardized")
+
+    def __init__(self, kind, value, children=None, is_standardized=False):
+        self.kind = kind
+        self.value = value
+        self.children = [] if children is None else children
+        self.is_standardized = is_standardized
 
     def get_data(self):
-        return self.data
+        """Returns the label of this node, as printed by -ast and -st."""
+        return node_label(self.kind, self.value)
 
     def get_degree(self):
         """Returns the number of children of this node."""
@@ -22,183 +77,15 @@ class Node:
     def get_children(self):
         return self.children
 
-    def set_depth(self, depth):
-        self.depth = depth
-
-    def get_depth(self):
-        return self.depth
-
-    def set_parent(self, parent):
-        self.parent = parent
-
-    def get_parent(self):
-        return self.parent
-
     def standardize(self):
         """
         Standardizes the AST node according to RPAL standardization rules.
         Applies different transformations based on node type (let, where, function_form, etc.).
         Each transformation converts the node into a standardized form using gamma and lambda nodes.
+        The rules are applied by a Standardizer, from a worklist rather than by recursion.
         """
-        if not self.is_standardized:
-            # First standardize all children
-            for child in self.children:
-                child.standardize()
-
-            # Apply standardization rules based on node type
-            if self.data == "let":
-                # LET -> GAMMA transformation
-                # Converts: LET(EQUAL(X,E), P) -> GAMMA(LAMBDA(X,P), E)
-                temp1 = self.children[0].children[1]
-                temp1.set_parent(self)
-                temp1.set_depth(self.depth + 1)
-                temp2 = self.children[1]
-                temp2.set_parent(self.children[0])
-                temp2.set_depth(self.depth + 2)
-                self.children[1] = temp1
-                self.children[0].set_data("lambda")
-                self.children[0].children[1] = temp2
-                self.set_data("gamma")
-
-            elif self.data == "where":
-                # WHERE -> LET transformation
-                # Converts: WHERE(P, EQUAL(X,E)) -> LET(EQUAL(X,E), P)
-                temp = self.children[0]
-                self.children[0] = self.children[1]
-                self.children[1] = temp
-                self.set_data("let")
-                self.standardize()
-
-            elif self.data == "function_form":
-                # FCN_FORM -> EQUAL transformation
-                # Converts: FCN_FORM(P,V+,E) -> EQUAL(P,LAMBDA(V+,E))
-                Ex = self.children[-1]
-                current_lambda = NodeFactory.get_node_with_parent("lambda", self.depth + 1, self, [], True)
-                self.children.insert(1, current_lambda)
-
-                i = 2
-                while self.children[i] != Ex:
-                    V = self.children[i]
-                    self.children.pop(i)
-                    V.set_depth(current_lambda.depth + 1)
-                    V.set_parent(current_lambda)
-                    current_lambda.children.append(V)
-
-                    if len(self.children) > 3:
-                        current_lambda = NodeFactory.get_node_with_parent("lambda", current_lambda.depth + 1, current_lambda, [], True)
-                        current_lambda.get_parent().children.append(current_lambda)
-
-                current_lambda.children.append(Ex)
-                self.children.pop(2)
-                self.set_data("=")
-
-            elif self.data == "lambda":
-                # LAMBDA transformation
-                # Converts: LAMBDA(V++,E) -> LAMBDA(V,LAMBDA(...))
-                if len(self.children) > 2:
-                    Ey = self.children[-1]
-                    current_lambda = NodeFactory.get_node_with_parent("lambda", self.depth + 1, self, [], True)
-                    self.children.insert(1, current_lambda)
-
-                    i = 2
-                    while self.children[i] != Ey:
-                        V = self.children[i]
-                        self.children.pop(i)
-                        V.set_depth(current_lambda.depth + 1)
-                        V.set_parent(current_lambda)
-                        current_lambda.children.append(V)
-
-                        if len(self.children) > 3:
-                            current_lambda = NodeFactory.get_node_with_parent("lambda", current_lambda.depth + 1, current_lambda, [], True)
-                            current_lambda.get_parent().children.append(current_lambda)
-
-                    current_lambda.children.append(Ey)
-                    self.children.pop(2)
-
-            elif self.data == "within":
-                # WITHIN -> EQUAL transformation
-                # Converts: WITHIN(EQUAL(X1,E1), EQUAL(X2,E2)) -> EQUAL(X2,GAMMA(LAMBDA(X1,E2),E1))
-                X1 = self.children[0].children[0]
-                X2 = self.children[1].children[0]
-                E1 = self.children[0].children[1]
-                E2 = self.children[1].children[1]
-                gamma = NodeFactory.get_node_with_parent("gamma", self.depth + 1, self, [], True)
-                lambda_ = NodeFactory.get_node_with_parent("lambda", self.depth + 2, gamma, [], True)
-                X1.set_depth(X1.get_depth() + 1)
-                X1.set_parent(lambda_)
-                X2.set_depth(X1.get_depth() - 1)
-                X2.set_parent(self)
-                E1.set_depth(E1.get_depth())
-                E1.set_parent(gamma)
-                E2.set_depth(E2.get_depth() + 1)
-                E2.set_parent(lambda_)
-                lambda_.children.append(X1)
-                lambda_.children.append(E2)
-                gamma.children.append(lambda_)
-                gamma.children.append(E1)
-                self.children.clear()
-                self.children.append(X2)
-                self.children.append(gamma)
-                self.set_data("=")
-
-            elif self.data == "@":
-                # AT -> GAMMA transformation
-                # Converts: @(E1,N,E2) -> GAMMA(GAMMA(N,E1),E2)
-                gamma1 = NodeFactory.get_node_with_parent("gamma", self.depth + 1, self, [], True)
-                e1 = self.children[0]
-                e1.set_depth(e1.get_depth() + 1)
-                e1.set_parent(gamma1)
-                n = self.children[1]
-                n.set_depth(n.get_depth() + 1)
-                n.set_parent(gamma1)
-                gamma1.children.append(n)
-                gamma1.children.append(e1)
-                self.children.pop(0)
-                self.children.pop(0)
-                self.children.insert(0, gamma1)
-                self.set_data("gamma")
-
-            elif self.data == "and":
-                # AND -> EQUAL transformation
-                # Converts: AND(EQUAL++) -> EQUAL(COMMA(X++), TAU(E++))
-                comma = NodeFactory.get_node_with_parent(",", self.depth + 1, self, [], True)
-                tau = NodeFactory.get_node_with_parent("tau", self.depth + 1, self, [], True)
-
-                for equal in self.children:
-                    equal.children[0].set_parent(comma)
-                    equal.children[1].set_parent(tau)
-                    comma.children.append(equal.children[0])
-                    tau.children.append(equal.children[1])
-
-                self.children.clear()
-                self.children.append(comma)
-                self.children.append(tau)
-                self.set_data("=")
-
-            elif self.data == "rec":
-                # REC -> EQUAL transformation
-                # Converts: REC(EQUAL(X,E)) -> EQUAL(X,GAMMA(YSTAR,LAMBDA(X,E)))
-                X = self.children[0].children[0]
-                E = self.children[0].children[1]
-                F = NodeFactory.get_node_with_parent(X.get_data(), self.depth + 1, self, X.children, True)
-                G = NodeFactory.get_node_with_parent("gamma", self.depth + 1, self, [], True)
-                Y = NodeFactory.get_node_with_parent("<Y*>", self.depth + 2, G, [], True)
-                L = NodeFactory.get_node_with_parent("lambda", self.depth + 2, G, [], True)
-
-                X.set_depth(L.depth + 1)
-                X.set_parent(L)
-                E.set_depth(L.depth + 1)
-                E.set_parent(L)
-                L.children.append(X)
-                L.children.append(E)
-                G.children.append(Y)
-                G.children.append(L)
-                self.children.clear()
-                self.children.append(F)
-                self.children.append(G)
-                self.set_data("=")
-
-            self.is_standardized = True
+        from .standardizer import Standardizer
+        Standardizer().standardize(self)
 
 
 class NodeFactory:
@@ -208,21 +95,45 @@ class NodeFactory:
         pass
 
     @staticmethod
-    def get_node(data, depth):
-        """Creates a basic node with given data and depth."""
-        node = Node()
-        node.set_data(data)
-        node.set_depth(depth)
-        node.children = []
-        return node
+    def get_node(label):
+        """Creates a basic node from its printed label."""
+        kind, value = parse_label(label)
+        return Node(kind, value)
 
     @staticmethod
-    def get_node_with_parent(data, depth, parent, children, is_standardized):
-        """Creates a node with complete configuration including parent, children, and standardization status."""
-        node = Node()
-        node.set_data(data)
-        node.set_depth(depth)
-        node.set_parent(parent)
-        node.children = children
-        node.is_standardized = is_standardized
-        return node
\ No newline at end of file
+    def get_node_with_children(label, children, is_standardized):
+        """Creates a node with complete configuration including children and standardization status."""
+        return Node(LABEL, label, children, is_standardized)
+
+
+def parent_map(root):
+    """
+    Return a dict mapping every node below root to its parent, for a tool that has to walk
+    up the tree; the nodes themselves keep no parent.
+    """
+    parents = {}
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        for child in node.children:
+            parents[child] = node
+            stack.append(child)
+    return parents
+
+
+def build_node(label, n, stack):
+    """
+    Builds a node with n children from the stack, as build_tree does for the LCRS ASTNodes of the parser.
+    The children are the top n nodes of the stack, in the order they were pushed.
+
+    Args:
+        label: Label of the new node
+        n: Number of children to attach
+        stack: Stack containing the child nodes
+    """
+    if n:
+        children = stack[-n:]
+        del stack[-n:]
+        stack.append(Node(LABEL, label, children))
+    else:
+        stack.append(Node(LABEL, label))
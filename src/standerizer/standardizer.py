@@ -0,0 +1,141 @@
+"""
+Table-driven standardizer: rewrites an AST into the standardized tree (ST) the CSE machine runs,
+visiting the nodes in post-order from a worklist instead of by recursion.
+"""
+
+from .node import LABEL, Node
+
+
+class Standardizer:
+    """
+    Applies the RPAL standardization rules to a tree of Nodes, in place.
+
+    The nodes are gathered from an explicit worklist and standardized in reverse, so the
+    children of a node are standardized before it and a tree of any depth is standardized
+    without recursion.
+    The rule of a node is looked up by its label in a table of handlers; a node without a
+    rule, such as a leaf or an operator, is only marked standardized. Every time a rule is
+    applied its counter in rule_counts goes up by one.
+
+    Usage:
+    >>> standardizer = Standardizer()
+    >>> standardizer.standardize(ast_obj.root)
+    >>> standardizer.rule_counts["let"]
+    """
+
+    def __init__(self):
+        self.rules = {
+            "let": self.rule_let,
+            "where": self.rule_where,
+            "function_form": self.rule_function_form,
+            "lambda": self.rule_lambda,
+            "within": self.rule_within,
+            "@": self.rule_at,
+            "and": self.rule_and,
+            "rec": self.rule_rec,
+        }
+        self.rule_counts = dict.fromkeys(self.rules, 0)
+
+    def standardize(self, root):
+        """
+        Standardize the tree below root, leaving the nodes already standardized as they are.
+
+        Args:
+            root (Node): The root of the tree.
+        """
+        # Every node below root that is not yet standardized, each before its children
+        nodes = []
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            if not node.is_standardized:
+                nodes.append(node)
+                stack.extend(node.children)
+
+        # A rule only rewrites the subtree of its node, so the reverse order, in which every node
+        # comes after its children, standardizes the tree as a post-order traversal would
+        rules = self.rules
+        counts = self.rule_counts
+        for node in reversed(nodes):
+            rule = rules.get(node.value) if node.kind == LABEL else None
+            if rule is not None:
+                counts[node.value] += 1
+                rule(node)
+            node.is_standardized = True
+
+    ################################################################################################
+    # rules, each applied to a node whose children are standardized
+    ################################################################################################
+
+    def rule_let(self, node):
+        # LET -> GAMMA transformation
+        # Converts: LET(EQUAL(X,E), P) -> GAMMA(LAMBDA(X,P), E)
+        equal, P = node.children
+        node.children[1] = equal.children[1]
+        equal.children[1] = P
+        equal.value = "lambda"
+        node.value = "gamma"
+
+    def rule_where(self, node):
+        # WHERE -> LET transformation
+        # Converts: WHERE(P, EQUAL(X,E)) -> LET(EQUAL(X,E), P), then applies the let rule
+        node.children.reverse()
+        node.value = "let"
+        self.rule_counts["let"] += 1
+        self.rule_let(node)
+
+    def rule_function_form(self, node):
+        # FCN_FORM -> EQUAL transformation
+        # Converts: FCN_FORM(P,V+,E) -> EQUAL(P,LAMBDA(V+,E))
+        self._nest_lambdas(node)
+        node.value = "="
+
+    def rule_lambda(self, node):
+        # LAMBDA transformation
+        # Converts: LAMBDA(V++,E) -> LAMBDA(V,LAMBDA(...))
+        if len(node.children) > 2:
+            self._nest_lambdas(node)
+
+    def _nest_lambdas(self, node):
+        """
+        Move the variables after the first child of a node into a chain of lambdas, one
+        variable each, ending in the last child, and make the chain the second child of the node.
+        """
+        children = node.children
+        body = children[-1]
+        for V in reversed(children[1:-1]):
+            body = Node(LABEL, "lambda", [V, body], True)
+        del children[1:]
+        children.append(body)
+
+    def rule_within(self, node):
+        # WITHIN -> EQUAL transformation
+        # Converts: WITHIN(EQUAL(X1,E1), EQUAL(X2,E2)) -> EQUAL(X2,GAMMA(LAMBDA(X1,E2),E1))
+        (X1, E1), (X2, E2) = node.children[0].children, node.children[1].children
+        lambda_ = Node(LABEL, "lambda", [X1, E2], True)
+        node.children = [X2, Node(LABEL, "gamma", [lambda_, E1], True)]
+        node.value = "="
+
+    def rule_at(self, node):
+        # AT -> GAMMA transformation
+        # Converts: @(E1,N,E2) -> GAMMA(GAMMA(N,E1),E2)
+        E1, N, E2 = node.children
+        node.children = [Node(LABEL, "gamma", [N, E1], True), E2]
+        node.value = "gamma"
+
+    def rule_and(self, node):
+        # AND -> EQUAL transformation
+        # Converts: AND(EQUAL++) -> EQUAL(COMMA(X++), TAU(E++))
+        comma = Node(LABEL, ",", [equal.children[0] for equal in node.children], True)
+        tau = Node(LABEL, "tau", [equal.children[1] for equal in node.children], True)
+        node.children = [comma, tau]
+        node.value = "="
+
+    def rule_rec(self, node):
+        # REC -> EQUAL transformation
+        # Converts: REC(EQUAL(X,E)) -> EQUAL(X,GAMMA(YSTAR,LAMBDA(X,E)))
+        X, E = node.children[0].children
+        F = Node(X.kind, X.value, X.children, True)
+        L = Node(LABEL, "lambda", [X, E], True)
+        node.children = [F, Node(LABEL, "gamma", [Node(LABEL, "<Y*>", [], True), L], True)]
+        node.value = "="
@@ -0,0 +1,257 @@
+import pytest
+from src.lexer import Lexer
+from src.parser import Parser
+from src.standerizer.ast import AST
+from src.lcrs_to_nary_convertor import lcrs_to_nary
+from src.cse_machine.machine import CSEMachine
+
+def run_program(code, **options):
+    """Helper to run RPAL code and return the machine after execution."""
+    ast_obj = AST(lcrs_to_nary(Parser(Lexer(code).tokenize()).parse()))
+    ast_obj.standardize()
+    cse_machine = CSEMachine(**options)
+    cse_machine.execute(ast_obj.root)
+    return cse_machine
+
+def test_untraced_run_records_nothing():
+    cse_machine = run_program("Print (1 + 2)")
+    assert cse_machine._generate_output() == "3\n"
+    assert len(cse_machine.table_data) == 0
+
+def test_trace_records_every_step():
+    cse_machine = run_program("Print (1 + 2)", trace=True)
+    rules = [row[0] for row in cse_machine.table_data]
+    assert rules == ["1", "1", "6", "7", "5"]
+
+def test_trace_limit_keeps_last_steps():
+    cse_machine = run_program("let rec f n = n eq 0 -> 0 | f (n - 1) in Print (f 20)", trace=True, trace_limit=3)
+    assert cse_machine._generate_output() == "0\n"
+    assert len(cse_machine.table_data) == 3
+    assert cse_machine.table_data[-1][0] == "5"
+
+def test_linearizer_tags_opcodes():
+    from src.cse_machine.utils.opcodes import OP_BINARY, OP_CONSTANT, OP_GAMMA, OP_NAME, OP_UNARY
+    cse_machine = run_program("let x = 2 in Print (x + 1)")
+    ops = [[element.op for element in structure.elements] for structure in cse_machine.control_structures]
+    assert ops[1] == [OP_GAMMA, OP_UNARY, OP_BINARY, OP_NAME, OP_CONSTANT]
+
+def test_closures_of_one_lambda_keep_their_environments():
+    cse_machine = run_program("let add x = fn y. x + y in let a = add 1 in let b = add 2 in Print (a 10, b 10)")
+    assert cse_machine._generate_output() == "(11, 12)\n"
+
+def test_control_frames_snapshot_in_order():
+    from src.cse_machine.data_structures.control import Control
+    control = Control()
+    control.push_structure([1, 2, 3])
+    assert control.pop() == 3
+    control.push_call("e", [4, 5])
+    assert control.whole_stack() == [1, 2, "e", 4, 5]
+    assert [control.pop() for _ in range(4)] == [5, 4, "e", 2]
+    assert control.whole_stack() == [1]
+    assert control.size() == 1
+    assert control.lists == [[1, 2, 3]]
+    cse_machine = run_program("let rec f x = x eq 0 -> 0 | f (x - 1) in Print (f 3)", trace=True)
+    assert cse_machine.control.frames == cse_machine.control.lists == []
+
+def test_returns_restore_caller_environment():
+    cse_machine = run_program("let f x = x + 1 in let g y = (f y, f (f y), y) in Print (g 1, g 5)")
+    assert cse_machine._generate_output() == "((2, 3, 1), (6, 7, 5))\n"
+    assert cse_machine.env_stack == []
+
+def test_names_resolve_to_depth_and_slot():
+    cse_machine = run_program("let x = 1 in let f (a, b) = a + b + x in Print (f (2, 3))")
+    assert cse_machine._generate_output() == "6\n"
+    addresses = {element.value: element.address
+                 for structure in cse_machine.control_structures
+                 for element in structure.elements if element.type == "ID"}
+    assert addresses == {"x": (1, 0), "a": (0, 0), "b": (0, 1), "f": (0, 0)}
+
+def test_unbound_name_fails_before_running():
+    with pytest.raises(Exception, match=r"Variable \[y\] not found"):
+        run_program("let f x = x eq 0 -> 1 | y in Print (f 0)")
+
+def test_deep_recursion_runs_past_ten_thousand_calls():
+    cse_machine = run_program("let rec f n = n eq 0 -> 0 | 1 + f (n - 1) in Print (f 20000)")
+    assert cse_machine._generate_output() == "20000\n"
+
+def test_environments_are_numbered_per_machine():
+    for _ in range(3):
+        cse_machine = run_program("let f x = x in Print (f 1)", trace=True)
+        assert [row[3] for row in cse_machine.table_data][:2] == [0, 0]
+        assert cse_machine.env_count == 3
+
+def test_step_limit_stops_run():
+    with pytest.raises(Exception, match="Step limit exceeded"):
+        run_program("let rec f n = n eq 0 -> 0 | f (n - 1) in Print (f 1000)", max_steps=100)
+    cse_machine = run_program("Print (1 + 2)", max_steps=5)
+    assert cse_machine.steps == 5
+
+def test_depth_limit_stops_runaway_recursion():
+    with pytest.raises(Exception, match="Depth limit exceeded"):
+        run_program("let rec f n = 1 + f (n + 1) in Print (f 0)", max_depth=500)
+
+def peak_sizes(cse_machine):
+    """Largest control and stack of a traced run."""
+    return (max(len(row[1]) for row in cse_machine.table_data),
+            max(len(row[2]) for row in cse_machine.table_data))
+
+@pytest.mark.parametrize("loop", [
+    "let rec loop n acc = n eq 0 -> acc | loop (n - 1) (acc + n) in Print (loop {} 0)",
+    "let rec loop (n, acc) = n eq 0 -> acc | loop (n - 1, acc + n) in Print (loop ({}, 0))",
+])
+def test_tail_calls_run_in_constant_space(loop):
+    short = run_program(loop.format(10), trace=True)
+    long = run_program(loop.format(200), trace=True)
+    assert long._generate_output() == "20100\n"
+    assert peak_sizes(long) == peak_sizes(short)
+    assert run_program(loop.format(5000), max_depth=10)._generate_output() == "12502500\n"
+
+    # no frames are left behind on the control either
+    frames = []
+    cse_machine = CSEMachine()
+    push_call = cse_machine.control.push_call
+    def counting_push_call(env_marker, elements):
+        frames.append(len(cse_machine.control.frames))
+        push_call(env_marker, elements)
+    cse_machine.control.push_call = counting_push_call
+    ast_obj = AST(lcrs_to_nary(Parser(Lexer(loop.format(500)).tokenize()).parse()))
+    ast_obj.standardize()
+    cse_machine.execute(ast_obj.root)
+    assert max(frames) < 10
+
+def test_control_pops_its_last_element():
+    from src.cse_machine.data_structures.control import Control
+    control = Control()
+    control.push("x")
+    assert control.pop() == "x"
+    assert control.frames == [] and control.is_empty()
+    control.push_structure(["a", "b"])
+    control.push("c")
+    assert control.whole_stack() == ["a", "b", "c"]
+    assert [control.pop() for _ in range(3)] == ["c", "b", "a"]
+    assert control.frames == [] and control.whole_stack() == []
+
+def test_linearizer_marks_tail_calls():
+    cse_machine = run_program("let f x = x eq 0 -> 0 | Print (x + 1) in Print (f 1)")
+    tails = [element.tail for structure in cse_machine.control_structures
+             for element in structure.elements if element.type == "gamma"]
+    assert tails.count(True) == 2
+    assert tails.count(False) == 2
+
+def test_aug_shares_tuples_without_changing_them():
+    cse_machine = run_program("let t = (1, 2) in let u = t aug 3 in let v = t aug 4 in Print (u, v, t, Order v, v 3, Istuple u)")
+    assert cse_machine._generate_output() == "((1, 2, 3), (1, 2, 4), (1, 2), 3, 4, true)\n"
+
+def test_aug_builds_long_tuples():
+    cse_machine = run_program("let rec build n t = n eq 0 -> t | build (n - 1) (t aug n) in let t = build 3000 nil in Print (Order t, t 1, t 3000)")
+    assert cse_machine._generate_output() == "(3000, 3000, 1)\n"
+
+def test_operator_fast_paths_match_generic_results():
+    cse_machine = run_program("let t = 1 eq 1 in let f = 1 eq 2 in Print (7 / 2, 2 ** 3, 3 gr 2, 2 eq 2, t or f, t & f, f ne t, -4, not t, ItoS 5, 'a' ls 'b')")
+    assert cse_machine._generate_output() == "(3, 8, true, true, true, false, true, -4, false, 5, true)\n"
+
+def test_small_ints_and_truth_values_are_shared():
+    cse_machine = run_program("let x = 3 + 4 in let y = 10 - 3 in (x, y, x gr 0, y gr 0, 2000 * 2)")
+    values = cse_machine.stack.items[-1].value
+    assert values[0] is values[1]
+    assert values[2] is values[3]
+    assert (values[0].value, values[2].value, values[4].value) == (7, True, 4000)
+
+def test_rec_binds_function_without_eta():
+    cse_machine = run_program("let rec f n = n eq 0 -> 0 | n + f (n - 1) in Print (f 10, Isfunction f)", trace=True)
+    assert cse_machine._generate_output() == "(55, true)\n"
+    rules = [row[0] for row in cse_machine.table_data]
+    assert rules.count("12") == 1
+    assert "13" not in rules
+
+def test_rec_without_lambda_body_uses_eta():
+    cse_machine = run_program("let rec f = (let g x = x + 1 in g) in Print (f 2)", trace=True)
+    assert cse_machine._generate_output() == "3\n"
+    rules = [row[0] for row in cse_machine.table_data]
+    assert "13" in rules
+
+def test_call_binds_tuple_items_without_building_tuple():
+    cse_machine = run_program("let f (a, b, c) = a - b * c in Print (f (10, 2, 3))", trace=True)
+    assert cse_machine._generate_output() == "4\n"
+    rules = [row[0] for row in cse_machine.table_data]
+    assert "9" not in rules
+    assert rules.count("11") == 1
+
+@pytest.mark.parametrize("program, output", [
+    ("let f t = Order t in Print (f (1, 2, 3))", "3\n"),
+    ("let rec f = (let g (a, b) = a - b in g) in Print (f (5, 2))", "3\n"),
+])
+def test_call_falls_back_to_tuple(program, output):
+    assert run_program(program)._generate_output() == output
+
+def test_call_with_wrong_number_of_items_fails():
+    with pytest.raises(Exception, match="Invalid number of arguments"):
+        run_program("let f (a, b) = a - b in Print (f (1, 2, 3))")
+
+def test_standardizer_counts_rules():
+    ast_obj = AST(Parser(Lexer("let rec f x y = x @g y where g a b = a + b within h = 1 in Print (f 1 2)").tokenize(), nary=True).parse())
+    ast_obj.standardize()
+    assert ast_obj.rule_counts == {"let": 2, "where": 1, "function_form": 2, "lambda": 0,
+                                   "within": 1, "@": 1, "and": 0, "rec": 1}
+    assert ast_obj.root.get_data() == "gamma"
+
+def test_standardizer_runs_deep_where_chains():
+    ast_obj = AST(Parser(Lexer("x" + " where x = 1" * 100_000).tokenize(), nary=True).parse())
+    ast_obj.standardize()
+    assert ast_obj.rule_counts["where"] == ast_obj.rule_counts["let"] == 100_000
+
+def test_compiler_matches_standardize_and_linearize():
+    import glob
+    from src.cse_machine.utils.STlinearizer import Linearizer
+    from src.cse_machine.utils.compiler import Compiler
+    from src.cse_machine.utils.program_cache import dumps
+    for path in sorted(glob.glob("test-programs/*")):
+        with open(path) as file:
+            code = file.read()
+        compiled = dumps(Compiler().compile(Parser(Lexer(code).tokenize(), nary=True).parse()))
+        ast_obj = AST(Parser(Lexer(code).tokenize(), nary=True).parse())
+        ast_obj.standardize()
+        assert compiled == dumps(Linearizer().linearize(ast_obj.root)), path
+        assert compiled == dumps(Compiler().compile(ast_obj.root)), path
+
+def test_compiler_runs_deep_where_chains():
+    cse_machine = CSEMachine()
+    cse_machine.execute(Parser(Lexer("Print (x" + " where x = 1" * 50_000 + ")").tokenize(), nary=True).parse())
+    assert cse_machine._generate_output() == "1\n"
+
+def test_folder_folds_constant_expressions():
+    from src.cse_machine.utils.folder import ConstantFolder
+    code = "let x = 2 * 3 + 4 in Print (x, Conc 'a' 'b', ItoS 5, Order nil, 1 gr 2 -> 'y' | 'n')"
+    ast_obj = AST(Parser(Lexer(code).tokenize(), nary=True).parse())
+    ast_obj.standardize()
+    folder = ConstantFolder()
+    folder.fold(ast_obj.root)
+    assert folder.folds == 7
+    assert ast_obj.root.children[1].get_data() == "<INT:10>"
+    cse_machine = CSEMachine(optimize=1)
+    cse_machine.execute(Parser(Lexer(code).tokenize(), nary=True).parse())
+    assert cse_machine._generate_output() == "(10, ab, 5, 0, n)\n"
+
+def test_folder_folds_the_ast_as_the_st():
+    import glob
+    from src.cse_machine.utils.compiler import Compiler
+    from src.cse_machine.utils.folder import ConstantFolder
+    from src.cse_machine.utils.program_cache import dumps
+    sources = ["Print ('a' @Conc 'b', Conc 'c' 'd', 2 ** 3 -> 1 | 0, 1 + 2 gr 2 -> 'y' | 'n')",
+               "let Stem = fn x. x in Print (Stem 'ab', ItoS 12)",
+               "let f Conc = Conc in Print (f 1, 'a' @Conc 'b', Order nil)"]
+    for path in sorted(glob.glob("test-programs/*")):
+        with open(path) as file:
+            sources.append(file.read())
+    for code in sources:
+        ast_root = Parser(Lexer(code).tokenize(), nary=True).parse()
+        ConstantFolder().fold(ast_root)
+        ast_obj = AST(Parser(Lexer(code).tokenize(), nary=True).parse())
+        ast_obj.standardize()
+        ConstantFolder().fold(ast_obj.root)
+        assert dumps(Compiler().compile(ast_root)) == dumps(Compiler().compile(ast_obj.root)), code
+
+def test_folder_leaves_invalid_operands_to_the_machine():
+    for code in ["Print (1 / 0)", "Print (Stem '')", "Print (Order 'ab')", "Print (1 + 'a')"]:
+        with pytest.raises(Exception):
+            CSEMachine(optimize=1).execute(Parser(Lexer(code).tokenize(), nary=True).parse())
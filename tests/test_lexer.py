@@ -52,3 +52,41 @@ def test_function_call_with_punctuation():
     assert tokens[4].type == TokenType.STRING and tokens[4].value == "hello"
     assert tokens[5].type == TokenType.PUNCTUATION and tokens[5].value == ")"
     assert tokens[-1].type == TokenType.EOF
+
+def test_keywords_are_whole_words():
+    tokens = Lexer("let letter = 3let in isint_ in").tokenize()
+    assert [(token.type, token.value) for token in tokens[:-1]] == [
+        (TokenType.KEYWORD, "let"),
+        (TokenType.IDENTIFIER, "letter"),
+        (TokenType.OPERATOR, "="),
+        (TokenType.INTEGER, 3),
+        (TokenType.IDENTIFIER, "let"),
+        (TokenType.KEYWORD, "in"),
+        (TokenType.IDENTIFIER, "isint_"),
+        (TokenType.KEYWORD, "in"),
+    ]
+
+def test_token_positions():
+    tokens = Lexer("let X =\n  'a\nb' in X" + " + X" * 1000).tokenize()
+    assert [(token.line, token.column) for token in tokens[:6]] == [(1, 1), (1, 5), (1, 7), (2, 3), (2, 4), (2, 7)]
+    assert (tokens[-2].value, tokens[-2].column) == ("X", 4007)
+
+def test_iter_tokens_reads_file_in_chunks():
+    import io
+    code = "let f x = x + 10 // comment\nin Print (f 3, 'multi\nline', 'it''''s', isint_) "
+    expected = [(token.type, token.value, token.line, token.column) for token in Lexer(code).tokenize()]
+    for chunk_size in (1, 2, 5, 1000):
+        tokens = Lexer(io.StringIO(code)).iter_tokens(chunk_size)
+        assert [(token.type, token.value, token.line, token.column) for token in tokens] == expected
+
+def test_token_buffer_holds_tokens_in_arrays():
+    from src.lexer import TokenBuffer, KEYWORD_KIND, IDENTIFIER_KIND
+    tokens = Lexer("let abc = 1 in abc").tokenize()
+    assert isinstance(tokens, TokenBuffer) and len(tokens) == 7
+    assert tokens.kinds.typecode == 'B' and tokens.lines.typecode == 'I'
+    assert (tokens.kinds[0], tokens.kinds[1]) == (KEYWORD_KIND, IDENTIFIER_KIND)
+    assert tokens.values[1] is tokens.values[5]  # identifiers are interned
+    assert repr(tokens[-2]) == "<IDENTIFIER @ 1:16 → 'abc'>"
+    assert [token.value for token in tokens] == ["let", "abc", "=", 1, "in", "abc", "EOF"]
+    with pytest.raises(IndexError):
+        tokens[7]
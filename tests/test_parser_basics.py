@@ -33,3 +33,136 @@ def test_parser_token_matching():
 
     token = parser.match(TokenType.EOF)
     assert token.value == 'EOF'
+
+def test_parser_pulls_tokens_lazily(capsys):
+    from src.lexer import Lexer
+    from src.rpal_ast import print_ast
+    code = "let f x y = x + y in Print (f 1 2, (fn a. a) (3, 4)) where g (a, b) = a"
+    pulled = []
+
+    def stream():
+        for token in Lexer(code).iter_tokens():
+            pulled.append(token)
+            yield token
+
+    parser = Parser(stream())
+    assert len(pulled) == 1
+    assert parser.lookahead_is_vb_sequence()  # let, then f
+    assert len(pulled) == 2
+
+    print_ast(parser.parse())
+    streamed = capsys.readouterr().out
+    print_ast(Parser(Lexer(code).tokenize()).parse())
+    assert streamed == capsys.readouterr().out
+
+def test_parser_reports_token_of_buffer():
+    from src.lexer import Lexer
+    with pytest.raises(SyntaxError, match=r"Unexpected token 'in' at line 2, column 3. Expected OPERATOR with value '='."):
+        Parser(Lexer("let x\n  in x").tokenize()).parse()
+
+def count_labels(root, label):
+    """Count the nodes of a tree with the given label, without recursion."""
+    count = 0
+    nodes = [root]
+    while nodes:
+        node = nodes.pop()
+        count += node.label == label
+        for child in (node.left, node.right):
+            if child is not None:
+                nodes.append(child)
+    return count
+
+@pytest.mark.parametrize("code, label, count", [
+    ("(" * 100_000 + "x" + ")" * 100_000, "<ID:x>", 1),
+    ("let x = 1 in " * 100_000 + "x", "let", 100_000),
+    ("x" + " where x = y -> 1 | 2" * 100_000, "where", 100_000),
+    ("let " + "x = 1 within " * 100_000 + "y = 2 in y", "within", 100_000),
+])
+def test_parser_handles_deep_nesting(code, label, count):
+    from src.lexer import Lexer
+    root = Parser(Lexer(code).tokenize()).parse()
+    assert count_labels(root, label) == count
+
+@pytest.mark.parametrize("code, expected", [
+    ("a or b & not -c gr d + e * f ** g ** k @h i j - 1",
+     "or .<ID:a> .& ..<ID:b> ..not ...gr ....neg .....<ID:c> ....- .....+ ......<ID:d> ......* .......<ID:e>"
+     " .......** ........<ID:f> ........** .........<ID:g> .........@ ..........<ID:k> ..........<ID:h>"
+     " ..........gamma ...........<ID:i> ...........<ID:j> .....<INT:1>"),
+    ("-1 + 3", "+ .neg ..<INT:1> .<INT:3>"),
+])
+def test_parser_operator_precedence(capsys, code, expected):
+    from src.lexer import Lexer
+    from src.rpal_ast import print_ast
+    print_ast(Parser(Lexer(code).tokenize()).parse())
+    assert capsys.readouterr().out.split() == expected.split()
+
+def test_parser_relational_operators_do_not_chain():
+    from src.lexer import Lexer
+    with pytest.raises(SyntaxError, match="Unexpected tokens after end of expression"):
+        Parser(Lexer("a gr b gr c").tokenize()).parse()
+
+def test_parser_builds_nary_tree(capsys):
+    import glob
+    from src.lexer import Lexer
+    from src.lcrs_to_nary_convertor import lcrs_to_nary
+    from src.standerizer.ast import AST
+    from src.standerizer.node import parent_map
+    for path in sorted(glob.glob("test-programs/*")):
+        with open(path) as file:
+            code = file.read()
+        root = Parser(Lexer(code).tokenize(), nary=True).parse()
+        AST(root).print_ast()
+        direct = capsys.readouterr().out
+        AST(lcrs_to_nary(Parser(Lexer(code).tokenize()).parse())).print_ast()
+        assert direct == capsys.readouterr().out
+        # the nodes keep no parent; parent_map finds the parents for a tool that needs them
+        parents = parent_map(root)
+        assert root not in parents and not hasattr(root, "__dict__")
+        nodes = [root]
+        while nodes:
+            node = nodes.pop()
+            assert all(parents[child] is node for child in node.children)
+            nodes.extend(node.children)
+
+def test_parser_builds_tree_in_arena(capsys):
+    from src.lexer import Lexer
+    from src.standerizer.arena import NodeArena
+    from src.standerizer.ast import AST
+    from src.cse_machine.utils.STlinearizer import Linearizer
+    from src.cse_machine.utils.program_cache import dumps
+    code = "let rec f n = n eq 0 -> 'done' | f (n - 1) within g (x, y) = x @f y in Print (f 3, g (1, 2), nil)"
+    arena = NodeArena()
+    cursor = Parser(Lexer(code).tokenize(), arena=arena).parse()
+    assert len(arena) == len(arena.kinds) == len(arena.first_child) == len(arena.next_sibling)
+    assert arena.values.count("f") == 1  # every name is stored once
+
+    AST(cursor).print_ast()
+    in_arena = capsys.readouterr().out
+    AST(Parser(Lexer(code).tokenize(), nary=True).parse()).print_ast()
+    assert in_arena == capsys.readouterr().out
+
+    # the standardizer works on a copy made of Nodes, and the linearizer reads a cursor
+    ast_obj = AST(arena.to_node(cursor.index))
+    ast_obj.standardize()
+    standardized = arena.cursor(arena.add_tree(ast_obj.root))
+    assert dumps(Linearizer().linearize(standardized)) == dumps(Linearizer().linearize(ast_obj.root))
+
+def test_parser_builds_typed_leaves(capsys):
+    from src.lexer import Lexer
+    from src.standerizer.ast import AST
+    from src.standerizer.node import NodeKind
+    root = Parser(Lexer("f 'it' 42 nil gamma").tokenize(), nary=True).parse()
+    leaves = []
+    nodes = [root]
+    while nodes:
+        node = nodes.pop()
+        if not node.children:
+            leaves.append((node.kind, node.value))
+        nodes.extend(reversed(node.children))
+    assert leaves == [(NodeKind.ID, "f"), (NodeKind.STR, "it"), (NodeKind.INT, 42),
+                      (NodeKind.LABEL, "<nil>"), (NodeKind.ID, "gamma")]
+
+    # the labels are only made for printing
+    AST(root).print_ast()
+    assert capsys.readouterr().out.split() == ["gamma", ".gamma", "..gamma", "...gamma", "....<ID:f>",
+                                               "....<STR:'it'>", "...<INT:42>", "..<nil>", ".<ID:gamma>"]
@@ -0,0 +1,69 @@
+import os
+
+from src.lexer import Lexer
+from src.parser import Parser
+from src.standerizer.ast import AST
+from src.lcrs_to_nary_convertor import lcrs_to_nary
+from src.cse_machine.machine import CSEMachine
+from src.cse_machine.utils import program_cache
+from src.cse_machine.utils.program_cache import ProgramCache
+
+PROGRAM = "let rec f (n, acc) = n eq 0 -> acc | f (n - 1, acc + n) in Print (f (10, 0), 'done')"
+
+def compile_program(code):
+    """Helper to compile RPAL code to resolved control structures."""
+    ast_obj = AST(lcrs_to_nary(Parser(Lexer(code).tokenize()).parse()))
+    ast_obj.standardize()
+    return CSEMachine().compile(ast_obj.root)
+
+def run(control_structures, **options):
+    """Helper to run compiled control structures and return the machine."""
+    cse_machine = CSEMachine(**options)
+    cse_machine.run(control_structures)
+    return cse_machine
+
+def test_cached_program_runs_the_same(tmp_path):
+    cache = ProgramCache(str(tmp_path))
+    assert cache.load(PROGRAM) is None
+    cache.store(PROGRAM, compile_program(PROGRAM))
+    loaded = cache.load(PROGRAM)
+    fresh = run(compile_program(PROGRAM), trace=True)
+    cached = run(loaded, trace=True)
+    assert cached._generate_output() == fresh._generate_output() == "(55, done)\n"
+    assert [row[0] for row in cached.table_data] == [row[0] for row in fresh.table_data]
+
+def test_other_source_or_version_misses(tmp_path, monkeypatch):
+    cache = ProgramCache(str(tmp_path))
+    cache.store(PROGRAM, compile_program(PROGRAM))
+    assert cache.load(PROGRAM + " ") is None
+    monkeypatch.setattr(program_cache, "INTERPRETER_VERSION", "other")
+    assert cache.load(PROGRAM) is None
+
+def test_unreadable_file_is_dropped(tmp_path):
+    cache = ProgramCache(str(tmp_path))
+    path = cache.path(PROGRAM)
+    with open(path, "wb") as file:
+        file.write(program_cache.MAGIC + bytes([program_cache.FORMAT_VERSION + 1]) + b"...")
+    assert cache.load(PROGRAM) is None
+    assert not os.path.exists(path)
+
+def test_least_recently_used_files_are_evicted(tmp_path):
+    sources = [f"Print {n}" for n in range(3)]
+    cache = ProgramCache(str(tmp_path))
+    for source in sources:
+        cache.store(source, compile_program(source))
+    size = os.path.getsize(cache.path(sources[0]))
+    # stored oldest first, then the oldest is used again
+    for age, source in enumerate(sources):
+        os.utime(cache.path(source), (1000 + age, 1000 + age))
+    cache.load(sources[0])
+    cache.max_bytes = 2 * size
+    cache.evict()
+    assert cache.load(sources[0]) is not None
+    assert cache.load(sources[1]) is None
+    assert cache.load(sources[2]) is not None
+
+def test_other_optimization_level_misses(tmp_path):
+    ProgramCache(str(tmp_path), optimize=0).store(PROGRAM, compile_program(PROGRAM))
+    assert ProgramCache(str(tmp_path), optimize=1).load(PROGRAM) is None
+    assert ProgramCache(str(tmp_path), optimize=0).load(PROGRAM) is not None